@@ -4,15 +4,23 @@ from . import version
 import paynt.utils.timer
 import paynt.utils.version_check
 import paynt.parser.sketch
+import paynt.family.frontier
+import paynt.family.smt
 
 import paynt.quotient.quotient
 import paynt.quotient.pomdp
 import paynt.quotient.decpomdp
 import paynt.quotient.posmg
 import paynt.quotient.storm_pomdp_control
+import paynt.verification.property
+import paynt.verification.result_cache
 
 import paynt.synthesizer.synthesizer
+import paynt.synthesizer.checkpoint
+import paynt.synthesizer.synthesizer_ar
 import paynt.synthesizer.synthesizer_cegis
+import paynt.synthesizer.synthesizer_hybrid
+import paynt.synthesizer.synthesizer_onebyone
 import paynt.synthesizer.policy_tree
 
 import paynt.dt
@@ -63,6 +71,8 @@ def setup_logger(log_path = None):
     help="known optimum bound")
 @click.option("--precision", type=click.FLOAT, default=1e-4,
     help="model checking precision")
+@click.option("--coarse-precision", type=click.FLOAT, default=None,
+    help="in AR and policy tree synthesis, analyze families using this precision first and refine only undecided results")
 @click.option("--exact", is_flag=True, default=False,
     help="use exact synthesis (very limited at the moment)")
 @click.option("--timeout", type=int,
@@ -78,8 +88,30 @@ def setup_logger(log_path = None):
     help="synthesis method"
     )
 
+@click.option("--exploration-order",
+    type=click.Choice(['dfs', 'bfs', 'best-first']),
+    default="dfs", show_default=True,
+    help="order in which undecided families are explored (AR and hybrid)"
+    )
+
+@click.option("--frontier-memory-limit", type=click.IntRange(min=2), default=None,
+    help="maximum number of undecided families kept in memory, the remaining ones are spilled to disk (depth-first exploration only)")
+
+@click.option("--gray-code", is_flag=True, default=False,
+    help="one-by-one: enumerate members in the Gray-code order, re-select only the choices affected by the changed hole and initialize model checking with the values of the previous member")
+
 @click.option("--disable-expected-visits", is_flag=True, default=False,
     help="do not compute expected visits for the splitting heuristic")
+@click.option("--incremental-build", is_flag=True, default=False,
+    help="construct sub-MDPs of subfamilies from the sub-MDP of the parent family instead of the quotient")
+@click.option("--warm-start", is_flag=True, default=False,
+    help="initialize model checking of subfamilies using the results of the parent family")
+@click.option("--assignment-cache-size", type=int, default=1000, show_default=True,
+    help="number of assignments whose DTMC model checking results are cached, 0 disables caching")
+@click.option("--enable-bounded-mc", is_flag=True, default=False,
+    help="in AR, terminate model checking of a family once the property is decided (other values may be imprecise)")
+@click.option("--enable-quotient-graph-analysis", is_flag=True, default=False,
+    help="derive the qualitative analysis of each sub-MDP from the one of the quotient instead of recomputing it")
 
 @click.option("--fsc-synthesis", is_flag=True, default=False,
     help="enable incremental synthesis of FSCs for a (Dec-)POMDP")
@@ -114,8 +146,17 @@ def setup_logger(log_path = None):
 @click.option("--export-synthesis", type=click.Path(), default=None,
     help="base filename to output synthesis result")
 
+@click.option("--checkpoint", type=click.Path(), default=None,
+    help="file to which synthesis progress is periodically saved (AR and hybrid)")
+@click.option("--checkpoint-period", default=300, type=int, show_default=True,
+    help="minimum number of seconds between two checkpoints")
+@click.option("--resume", type=click.Path(exists=True), default=None,
+    help="resume synthesis from the given checkpoint file")
+
 @click.option("--mdp-discard-unreachable-choices", is_flag=True, default=False,
     help="if set, unreachable choices will be discarded from the splitting scheduler")
+@click.option("--policy-tree-processes", default=1, type=int, show_default=True,
+    help="number of processes used to expand policy tree leaves")
 
 @click.option("--tree-depth", default=0, type=int,
     help="decision tree synthesis: tree depth")
@@ -130,26 +171,36 @@ def setup_logger(log_path = None):
     "--constraint-bound", type=click.FLOAT, help="bound for creating constrained POMDP for Cassandra models",
 )
 
+@click.option("--stage-scheduler", type=click.Choice(["ratio", "bandit"]), default="ratio", show_default=True,
+    help="allocation of time to AR and CEGIS in the hybrid synthesizer")
+@click.option("--smt-solver", type=click.Choice(["native", "z3", "cvc5"]), default="z3", show_default=True,
+    help="solver used to enumerate assignments in CEGIS and hybrid; native is a backtracking enumerator without propagation or learning")
 @click.option(
     "--ce-generator", type=click.Choice(["dtmc", "mdp"]), default="dtmc", show_default=True,
     help="counterexample generator",
 )
+@click.option("--conflicts-per-property", default=1, type=int, show_default=True,
+    help="maximum number of diverse conflicts constructed for each violated property (DTMC generator only)")
+@click.option("--cegis-processes", default=1, type=int, show_default=True,
+    help="number of processes analyzing CEGIS candidates in a pipeline")
 @click.option("--profiling", is_flag=True, default=False,
     help="run profiling")
 
 def paynt_run(
-    project, sketch, props, relative_error, optimum_threshold, precision, exact, timeout,
+    project, sketch, props, relative_error, optimum_threshold, precision, coarse_precision, exact, timeout,
     export,
-    method,
-    disable_expected_visits,
+    method, exploration_order, frontier_memory_limit, gray_code,
+    disable_expected_visits, incremental_build, warm_start, assignment_cache_size, enable_bounded_mc,
+    enable_quotient_graph_analysis,
     fsc_synthesis, fsc_memory_size, posterior_aware,
     storm_pomdp, iterative_storm, get_storm_result, storm_options, prune_storm,
     use_storm_cutoffs, unfold_strategy_storm,
     export_synthesis,
-    mdp_discard_unreachable_choices,
+    checkpoint, checkpoint_period, resume,
+    mdp_discard_unreachable_choices, policy_tree_processes,
     tree_depth, tree_enumeration, tree_map_scheduler, add_dont_care_action,
     constraint_bound,
-    ce_generator,
+    stage_scheduler, ce_generator, conflicts_per_property, cegis_processes, smt_solver,
     profiling
 ):
 
@@ -164,8 +215,24 @@ def paynt_run(
 
     # set CLI parameters
     paynt.quotient.quotient.Quotient.disable_expected_visits = disable_expected_visits
+    paynt.quotient.quotient.Quotient.build_incrementally = incremental_build
+    paynt.quotient.quotient.Quotient.share_graph_analysis = enable_quotient_graph_analysis
+    paynt.verification.property.Property.coarse_model_checking_precision = coarse_precision
+    paynt.verification.result_cache.AssignmentResultCache.capacity = assignment_cache_size
+    paynt.synthesizer.synthesizer_ar.SynthesizerAR.warm_start = warm_start
+    paynt.synthesizer.synthesizer_ar.SynthesizerAR.bounded_model_checking = enable_bounded_mc
+    paynt.synthesizer.synthesizer_ar.SynthesizerAR.exploration_order = exploration_order
+    paynt.family.frontier.FrontierSpilling.max_families_in_memory = frontier_memory_limit
+    paynt.synthesizer.synthesizer_onebyone.SynthesizerOneByOne.gray_code_order = gray_code
     paynt.synthesizer.synthesizer.Synthesizer.export_synthesis_filename_base = export_synthesis
+    paynt.synthesizer.checkpoint.Checkpoint.filename = checkpoint
+    paynt.synthesizer.checkpoint.Checkpoint.period_seconds = checkpoint_period
+    paynt.synthesizer.checkpoint.Checkpoint.resume_filename = resume
     paynt.synthesizer.synthesizer_cegis.SynthesizerCEGIS.conflict_generator_type = ce_generator
+    paynt.synthesizer.synthesizer_cegis.SynthesizerCEGIS.num_processes = cegis_processes
+    paynt.synthesizer.conflict_generator.dtmc.ConflictGeneratorDtmc.conflicts_per_property = conflicts_per_property
+    paynt.family.smt.SmtSolver.solver_name = smt_solver
+    paynt.synthesizer.synthesizer_hybrid.StageControl.scheduler = stage_scheduler
     paynt.quotient.pomdp.PomdpQuotient.initial_memory_size = fsc_memory_size
     paynt.quotient.pomdp.PomdpQuotient.posterior_aware = posterior_aware
     paynt.quotient.decpomdp.DecPomdpQuotient.initial_memory_size = fsc_memory_size
@@ -174,6 +241,7 @@ def paynt_run(
     paynt.quotient.mdp_family.MdpFamilyQuotient.initial_memory_size = fsc_memory_size
 
     paynt.synthesizer.policy_tree.SynthesizerPolicyTree.discard_unreachable_choices = mdp_discard_unreachable_choices
+    paynt.synthesizer.policy_tree.SynthesizerPolicyTree.num_processes = policy_tree_processes
 
     paynt.dt.DtSynthesizer.tree_depth = tree_depth
     paynt.dt.DtSynthesizer.tree_enumeration = tree_enumeration
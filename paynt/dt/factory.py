@@ -222,15 +222,12 @@ class DtColoredMdpFactory(paynt.quotient.quotient.Quotient):
         return spec_result
 
     def build(self, family):
-        if family.parent_info is None:
-            choices = self.coloring.selectCompatibleChoices(family.family)
-        else:
-            choices = self.coloring.selectCompatibleChoices(family.family, family.parent_info.selected_choices)
+        choices = self.select_compatible_choices(family)
         assert choices.number_of_set_bits() > 0
 
         # proceed as before
         family.selected_choices = choices
-        family.mdp = self.build_from_choice_mask(choices)
+        family.mdp = self.build_family_mdp(family, choices)
         family.mdp.family = family
 
 
@@ -249,8 +246,7 @@ class DtColoredMdpFactory(paynt.quotient.quotient.Quotient):
         ''' Get parameter options involved in the scheduler selection. '''
         scheduler = result.scheduler
         assert scheduler.memoryless and scheduler.deterministic
-        state_to_choice = self.scheduler_to_state_to_choice(mdp, scheduler)
-        choices = self.state_to_choice_to_choices(state_to_choice)
+        choices = self.scheduler_to_choices(mdp, scheduler)
         if self.specification.is_single_property:
             mdp.family.scheduler_choices = choices
         consistent,parameter_selection = self.are_choices_consistent(choices, mdp.family)
@@ -316,8 +312,11 @@ class DtColoredMdpFactory(paynt.quotient.quotient.Quotient):
 
         # construct corresponding subfamilies
         parent_info = family.collect_parent_info(self.specification)
+        parent_info.splitter = splitter
         parent_info.analysis_result = family.analysis_result
         parent_info.scheduler_choices = family.scheduler_choices
+        if paynt.quotient.quotient.Quotient.build_incrementally:
+            parent_info.mdp = family.mdp
         # parent_info.unsat_core_hint = self.coloring.unsat_core.copy()
         subfamilies = family.split(splitter,suboptions)
         assert family.size == sum([family.size for family in subfamilies])
@@ -70,8 +70,7 @@ class DtSynthesizer(paynt.synthesizer.synthesizer_ar.SynthesizerAR):
     def verify_hole_selection(self, family, hole_selection):
         spec = self.quotient.specification
         assignment = family.assume_options_copy(hole_selection)
-        dtmc = self.quotient.build_assignment(assignment)
-        res = dtmc.check_specification(spec)
+        res,_ = self.quotient.check_assignment(assignment)
         if not res.constraints_result.sat:
             return
         if not spec.has_optimality:
@@ -216,6 +215,7 @@ class DtSynthesizer(paynt.synthesizer.synthesizer_ar.SynthesizerAR):
                 logger.info(self.best_assignment)
 
                 if self.best_assignment is not None and self.best_assignment.size == 1:
+                    # the double-check must not rely on the assignment result cache
                     dtmc = self.quotient.build_assignment(self.best_assignment)
                     result = dtmc.check_specification(self.quotient.specification)
                     logger.info(f"double-checking specification satisfiability: {result}")
@@ -0,0 +1,151 @@
+import math
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class ExploredSpace:
+    '''
+    Union of boxes of explored assignments used to count pruned assignments exactly even if conflicts overlap.
+    A box is a dictionary mapping a hole to a bitmask of its options; holes that are not present in the dictionary can
+    take any option. The union is kept as a list of pairwise disjoint boxes.
+    :note since a conflict constructed within some family excludes only members of this family and explored
+        families are never considered again, boxes contained in an explored family can be forgotten.
+    '''
+
+    # maximum number of boxes stored (or created when subtracting stored boxes from a new one), if exceeded, pruned
+    #   assignments are only estimated
+    max_boxes = 10000
+
+    def __init__(self, family):
+        self.num_holes = family.num_holes
+        self.hole_num_options = [family.hole_num_options_total(hole) for hole in range(self.num_holes)]
+        self.hole_full_mask = [(1 << num_options) - 1 for num_options in self.hole_num_options]
+        self.family_size = family.size
+        self.design_space_size = math.prod(self.hole_num_options)
+        # pairwise disjoint boxes of explored assignments
+        self.boxes = []
+        # number of explored assignments
+        self.explored = 0
+        # False if some box could not be stored and the counting is no longer exact
+        self.exact = True
+
+    def hole_options_mask(self, options):
+        mask = 0
+        for option in options:
+            mask |= 1 << option
+        return mask
+
+    def family_box(self, family):
+        box = {}
+        for hole in range(self.num_holes):
+            if family.hole_num_options(hole) < self.hole_num_options[hole]:
+                box[hole] = self.hole_options_mask(family.hole_options(hole))
+        return box
+
+    def conflict_box(self, family, assignment, conflict):
+        ''' :return box of family members that agree with the assignment on the holes of the conflict '''
+        box = self.family_box(family)
+        for hole in conflict:
+            box[hole] = 1 << assignment.hole_options(hole)[0]
+        return box
+
+    def box_size(self, box):
+        size = self.design_space_size
+        for hole,mask in box.items():
+            size = size // self.hole_num_options[hole] * mask.bit_count()
+        return size
+
+    def intersects(self, box, other):
+        if len(other) < len(box):
+            box,other = other,box
+        return all([other.get(hole, mask) & mask for hole,mask in box.items()])
+
+    def contains(self, box, other):
+        ''' :return True if the box contains the other box '''
+        for hole,mask in box.items():
+            if other.get(hole, self.hole_full_mask[hole]) & ~mask:
+                return False
+        return True
+
+    def subtract(self, box, other):
+        ''' :return a list of pairwise disjoint boxes whose union is the box without the other box '''
+        if not self.intersects(box, other):
+            return [box]
+        pieces = []
+        rest = dict(box)
+        for hole,other_mask in other.items():
+            mask = rest.get(hole, self.hole_full_mask[hole])
+            outside = mask & ~other_mask
+            if outside:
+                piece = dict(rest)
+                piece[hole] = outside
+                pieces.append(piece)
+                rest[hole] = mask & other_mask
+        return pieces
+
+    def count(self, pruned):
+        ''' Make sure that the number of explored assignments never exceeds the size of the design space. '''
+        pruned = min(pruned, self.family_size - self.explored)
+        self.explored += pruned
+        return pruned
+
+    def explore_box(self, box):
+        '''
+        :return the number of assignments of the box that were not explored before, or None if the box could not be
+            stored because there are too many boxes
+        '''
+        parts = [box]
+        for other in self.boxes:
+            parts = [piece for part in parts for piece in self.subtract(part, other)]
+            if not parts:
+                return 0
+            if len(parts) > ExploredSpace.max_boxes:
+                return None
+        if len(self.boxes) + len(parts) > ExploredSpace.max_boxes:
+            return None
+        self.boxes += parts
+        return sum([self.box_size(part) for part in parts])
+
+    def abandon_exact_counting(self):
+        logger.debug("too many boxes of explored assignments, the number of pruned assignments will be estimated")
+        self.exact = False
+        self.boxes = []
+
+    def explore_conflicts(self, family, assignment, conflicts, pruning_estimate):
+        '''
+        :param pruning_estimate an estimate of the assignments pruned by the conflicts, used once exact counting has
+            been abandoned
+        :return the number of assignments newly pruned by the conflicts constructed for the assignment
+        '''
+        if not self.exact:
+            return self.count(pruning_estimate)
+        pruned = 0
+        for conflict in conflicts:
+            box_pruned = self.explore_box(self.conflict_box(family, assignment, conflict))
+            if box_pruned is None:
+                self.abandon_exact_counting()
+                # the estimate covers the conflicts counted exactly so far as well, do not count them twice
+                return self.count(pruned + max(pruning_estimate - pruned, 0))
+            pruned += box_pruned
+        return self.count(pruned)
+
+    def explore_family(self, family):
+        ''' :return the number of assignments of the family that were not explored before '''
+        if not self.exact:
+            return self.count(family.size)
+        box = self.family_box(family)
+        covered = 0
+        boxes = []
+        for other in self.boxes:
+            if self.contains(box, other):
+                # the box is contained in the family and can be forgotten
+                covered += self.box_size(other)
+                continue
+            boxes.append(other)
+            if self.intersects(box, other):
+                covered += self.box_size({**other, **{
+                    hole: mask & other.get(hole, mask) for hole,mask in box.items()
+                }})
+        self.boxes = boxes
+        return self.count(family.size - covered)
@@ -22,6 +22,28 @@ class ParentInfo():
         self.selected_choices = None
         self.constraint_indices = None
         self.refinement_depth = None
+        # hole that was split, the subfamilies differ from the parent family only in the options of this hole
+        self.splitter = None
+        # sub-MDP of the parent family, set only if sub-MDPs are built incrementally
+        self.mdp = None
+        # analysis result of the parent family, set only if model checking of subfamilies is warm-started
+        self.analysis_result = None
+        # number of subfamilies that have not used the parent sub-MDP (analysis result) yet; once all subfamilies have
+        #   used it, it is dropped so that subfamilies waiting in the frontier do not pin it in memory
+        self.mdp_users = 0
+        self.analysis_result_users = 0
+
+    def release_mdp(self):
+        ''' Notify that a subfamily has built its sub-MDP and no longer needs the parent sub-MDP. '''
+        self.mdp_users -= 1
+        if self.mdp_users <= 0:
+            self.mdp = None
+
+    def release_analysis_result(self):
+        ''' Notify that a subfamily has been analyzed and no longer needs the parent analysis result. '''
+        self.analysis_result_users -= 1
+        if self.analysis_result_users <= 0:
+            self.analysis_result = None
 
 
 class Family:
@@ -47,6 +69,8 @@ class Family:
 
     def add_parent_info(self, parent_info):
         self.parent_info = parent_info
+        parent_info.mdp_users += 1
+        parent_info.analysis_result_users += 1
         self.refinement_depth = parent_info.refinement_depth + 1
         self.constraint_indices = parent_info.constraint_indices
 
@@ -125,6 +149,34 @@ class Family:
             subfamily.hole_set_options(hole,options)
         return subfamily
 
+    def options_to_bytes(self):
+        '''
+        Encode hole options as a bitmask: the mask of each hole has one bit per option of this hole in the design
+        space, masks of all holes are concatenated.
+        '''
+        mask = 0
+        offset = 0
+        for hole in range(self.num_holes):
+            for option in self.hole_options(hole):
+                mask |= 1 << (offset+option)
+            offset += self.hole_num_options_total(hole)
+        return mask.to_bytes((offset+7)//8, "little")
+
+    def assume_options_bytes_copy(self, data):
+        '''
+        Create a copy and assume suboptions encoded via options_to_bytes().
+        @note this does not check whether suboptions are actually suboptions of any given hole.
+        '''
+        subfamily = self.copy()
+        mask = int.from_bytes(data, "little")
+        for hole in range(self.num_holes):
+            num_options = self.hole_num_options_total(hole)
+            hole_mask = mask & ((1 << num_options) - 1)
+            options = [option for option in range(num_options) if (hole_mask >> option) & 1]
+            subfamily.hole_set_options(hole,options)
+            mask >>= num_options
+        return subfamily
+
     def split(self, splitter, suboptions):
         return [self.assume_hole_options_copy(splitter,options) for options in suboptions]
 
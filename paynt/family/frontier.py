@@ -0,0 +1,279 @@
+import collections
+import heapq
+import itertools
+import pickle
+import tempfile
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class Frontier:
+    '''
+    A collection of families that remain to be explored. Subclasses decide the order in which families are
+    retrieved.
+    '''
+
+    @staticmethod
+    def choose_frontier(exploration_order, family=None):
+        '''
+        :param family the initial family, required if families are allowed to be spilled to disk
+        '''
+        if FrontierSpilling.max_families_in_memory is not None:
+            if exploration_order == "dfs":
+                return FrontierSpilling(family)
+            logger.warning("spilling families to disk is supported only for the depth-first exploration")
+        if exploration_order == "dfs":
+            return FrontierDfs()
+        if exploration_order == "bfs":
+            return FrontierBfs()
+        if exploration_order == "best-first":
+            return FrontierBestFirst()
+        raise ValueError(f"invalid exploration order {exploration_order}")
+
+    def __len__(self):
+        ''' to be overridden '''
+        pass
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def push(self, family):
+        ''' to be overridden '''
+        pass
+
+    def push_with_priority(self, family, priority):
+        '''
+        Add a family with the given priority (e.g. restored from a checkpoint).
+        :param priority priority computed via FrontierBestFirst.family_priority, or None if not known; ignored by
+            frontiers that do not order families by their priority
+        '''
+        self.push(family)
+
+    def push_subfamilies(self, family, subfamilies):
+        '''
+        Add subfamilies obtained by splitting an analyzed family.
+        :param family the parent family
+        :param subfamilies a list of its subfamilies
+        '''
+        for subfamily in subfamilies:
+            self.push(subfamily)
+
+    def push_subfamilies_with_priority(self, priority, subfamilies):
+        '''
+        Add subfamilies of a family that is not available, e.g. because it was analyzed in a different process.
+        :param priority priority of the subfamilies computed via FrontierBestFirst.family_priority, ignored by
+            frontiers that do not order families by their priority
+        '''
+        self.push_subfamilies(None, subfamilies)
+
+    def pop(self):
+        ''' to be overridden '''
+        pass
+
+    def families(self):
+        ''' to be overridden '''
+        pass
+
+    def family_chunks(self):
+        '''
+        Iterate over the families in chunks (lists). Families that are not stored in memory are provided in their
+        encoded form (option bitmasks) and one chunk at a time.
+        '''
+        yield self.families()
+
+    def family_priority_chunks(self):
+        ''' Same as family_chunks(), but each family is paired with its priority (None if not known). '''
+        for chunk in self.family_chunks():
+            yield [(family,None) for family in chunk]
+
+
+class FrontierDfs(Frontier):
+    ''' Depth-first exploration: the most recently added family is explored first. '''
+
+    def __init__(self):
+        self.stack = []
+
+    def __len__(self):
+        return len(self.stack)
+
+    def push(self, family):
+        self.stack.append(family)
+
+    def push_subfamilies(self, family, subfamilies):
+        self.stack.extend(subfamilies)
+
+    def pop(self):
+        return self.stack.pop()
+
+    def families(self):
+        return list(self.stack)
+
+
+class FrontierBfs(Frontier):
+    ''' Breadth-first exploration: the least recently added family is explored first. '''
+
+    def __init__(self):
+        self.queue = collections.deque()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def push(self, family):
+        self.queue.append(family)
+
+    def push_subfamilies(self, family, subfamilies):
+        self.queue.extend(subfamilies)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def families(self):
+        return list(self.queue)
+
+
+class FrontierBestFirst(Frontier):
+    '''
+    Best-first exploration: subfamilies are ordered by the primary MDP bound of their parent family wrt the
+    undecided property, the family with the most promising bound is explored first. Families with equal bounds are
+    explored in the depth-first order.
+    '''
+
+    def __init__(self):
+        self.heap = []
+        self.counter = itertools.count()
+
+    @staticmethod
+    def family_priority(family):
+        '''
+        :return priority of subfamilies of the analyzed family, lower is better
+        '''
+        if family is None or family.analysis_result is None:
+            return 0
+        result = family.analysis_result.undecided_result()
+        if result.primary is None:
+            return 0
+        value = result.primary.value
+        return value if result.prop.minimizing else -value
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push_with_priority(self, family, priority):
+        if priority is None:
+            priority = FrontierBestFirst.family_priority(None)
+        # negated counter ensures LIFO order among families with equal priority
+        heapq.heappush(self.heap, (priority, -next(self.counter), family))
+
+    def push(self, family):
+        self.push_with_priority(family, FrontierBestFirst.family_priority(None))
+
+    def push_subfamilies(self, family, subfamilies):
+        self.push_subfamilies_with_priority(FrontierBestFirst.family_priority(family), subfamilies)
+
+    def push_subfamilies_with_priority(self, priority, subfamilies):
+        for subfamily in subfamilies:
+            self.push_with_priority(subfamily, priority)
+
+    def pop(self):
+        _,_,family = heapq.heappop(self.heap)
+        return family
+
+    def families(self):
+        return [family for _,_,family in self.heap]
+
+    def family_priority_chunks(self):
+        # families are listed in the order they were pushed in, so that pushing them again preserves the order of ties
+        yield [(family,priority) for priority,_,family in sorted(self.heap, key=lambda entry: -entry[1])]
+
+
+class FrontierSpilling(FrontierDfs):
+    '''
+    Depth-first exploration with a bounded number of families kept in memory. When the stack grows too large, the
+    families at its bottom (the ones to be explored last) are spilled to a temporary file as option bitmasks. Spilled
+    families are read back once all families in memory are explored.
+    :note spilled families lose their parent info, so they will be analyzed without the help of their parent
+    '''
+
+    # maximum number of families kept in memory, None to keep all families in memory
+    max_families_in_memory = None
+
+    def __init__(self, family):
+        super().__init__()
+        # the initial family, spilled families are restored as its subfamilies
+        self.family = family
+        self.spill_file = tempfile.TemporaryFile()
+        # file offsets of spilled chunks of families
+        self.chunk_offsets = []
+        self.num_spilled = 0
+
+    def spill(self, family):
+        ''' Convert family to a picklable record. '''
+        return (family.options_to_bytes(), family.refinement_depth, family.constraint_indices)
+
+    def restore(self, record):
+        ''' Re-construct the family from its record. '''
+        family_bytes,refinement_depth,constraint_indices = record
+        family = self.family.assume_options_bytes_copy(family_bytes)
+        family.refinement_depth = refinement_depth
+        family.constraint_indices = constraint_indices
+        return family
+
+    def restore_chunk(self, records):
+        return [self.restore(record) for record in records]
+
+    def __len__(self):
+        return len(self.stack) + self.num_spilled
+
+    def spill_bottom(self):
+        # spill the bottom half of the stack
+        num_spilled = len(self.stack) // 2
+        records = [self.spill(family) for family in self.stack[:num_spilled]]
+        self.stack = self.stack[num_spilled:]
+        self.spill_file.seek(0,2)
+        self.chunk_offsets.append(self.spill_file.tell())
+        pickle.dump(records, self.spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.num_spilled += num_spilled
+        logger.debug(f"spilled {num_spilled} families to disk, {self.num_spilled} families spilled in total")
+
+    def read_chunk(self, offset):
+        self.spill_file.seek(offset)
+        return pickle.load(self.spill_file)
+
+    def load_last_chunk(self):
+        offset = self.chunk_offsets.pop()
+        records = self.read_chunk(offset)
+        self.spill_file.truncate(offset)
+        self.stack = self.restore_chunk(records)
+        self.num_spilled -= len(records)
+
+    def push(self, family):
+        super().push(family)
+        if len(self.stack) > FrontierSpilling.max_families_in_memory:
+            self.spill_bottom()
+
+    def push_subfamilies(self, family, subfamilies):
+        super().push_subfamilies(family, subfamilies)
+        if len(self.stack) > FrontierSpilling.max_families_in_memory:
+            self.spill_bottom()
+
+    def pop(self):
+        if not self.stack:
+            self.load_last_chunk()
+        return super().pop()
+
+    def record_to_bytes(self, record):
+        ''' Get the option bitmask of the family from its record. '''
+        family_bytes,_,_ = record
+        return family_bytes
+
+    def families(self):
+        spilled = []
+        for offset in self.chunk_offsets:
+            spilled += [self.restore(record) for record in self.read_chunk(offset)]
+        return spilled + list(self.stack)
+
+    def family_chunks(self):
+        for offset in self.chunk_offsets:
+            yield [self.record_to_bytes(record) for record in self.read_chunk(offset)]
+        yield list(self.stack)
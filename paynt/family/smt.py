@@ -1,8 +1,11 @@
+import payntbind
+
 import sys
-import z3
 
-# import pycvc5 if installed
+# import z3 and pycvc5 if installed
 import importlib
+if importlib.util.find_spec('z3') is not None:
+    import z3
 if importlib.util.find_spec('pycvc5') is not None:
     import pycvc5
 
@@ -24,6 +27,11 @@ class FamilyEncoding():
         # set to False as soon as pick_assignment returns None
         self.has_assignments = True
 
+        if smt_solver.use_native:
+            # the native enumerator works with the family directly
+            self.hole_clauses = [family.hole_options(hole) for hole in range(family.num_holes)]
+            return
+
         hole_clauses = []
         for hole in range(family.num_holes):
             all_clauses = smt_solver.solver_clauses[hole]
@@ -58,7 +66,13 @@ class FamilyEncoding():
         if not self.has_assignments:
             return None
         
-        if self.smt_solver.use_python_z3:
+        if self.smt_solver.use_native:
+            hole_to_option = self.smt_solver.solver.pickAssignment(self.family.family)
+            if hole_to_option is None:
+                self.has_assignments = False
+                return None
+            hole_options = [[option] for option in hole_to_option]
+        elif self.smt_solver.use_python_z3:
             solver_result = self.smt_solver.solver.check(self.encoding)
             if solver_result == z3.unsat:
                 self.has_assignments = False
@@ -86,11 +100,17 @@ class FamilyEncoding():
         
 class SmtSolver():
 
+    # solver used to enumerate assignments: "native", "z3" or "cvc5"
+    # the native enumerator is a plain backtracking search (no propagation, no conflict learning, each pick starts
+    #   from scratch), so it is opt-in: it may be faster for small design spaces but does not scale like z3
+    solver_name = "z3"
+
     def __init__(self, family):
 
         # SMT solver containing description of the unexplored design space
         self.solver = None
         # SMT solver choice
+        self.use_native = False
         self.use_python_z3 = False
         self.use_cvc = False
     
@@ -103,17 +123,30 @@ class SmtSolver():
         # current depth of push/pop solving
         self.solver_depth = 0
 
+        # conflicts that do not depend on family restrictions and are thus valid for the whole design space
+        self.global_conflicts = set()
+        # for each such conflict excluded within some scope, a pair [depth,clauses] so that the conflict can be
+        #   re-asserted when its scope is popped
+        self.persistent_conflicts = []
+
         # choose solver
-        if "pycvc5" in sys.modules:
+        if SmtSolver.solver_name == "native":
+            logger.debug("using native enumerator of assignments.")
+            self.use_native = True
+        elif SmtSolver.solver_name == "cvc5" and "pycvc5" in sys.modules:
             logger.debug("using CVC5 for SMT solving.")
             self.use_cvc = True
-        else:
+        elif SmtSolver.solver_name == "z3" and "z3" in sys.modules:
             logger.debug("using Python Z3 for SMT solving.")
             self.use_python_z3 = True
 
         # create solver, solver variables
         self.solver_clauses = []
-        if self.use_python_z3:
+        if self.use_native:
+            self.solver = payntbind.synthesis.AssignmentEnumerator(family.family)
+            self.solver_vars = list(range(family.num_holes))
+            return
+        elif self.use_python_z3:
             self.solver = z3.Solver()
             self.solver_vars = [z3.Int(hole) for hole in range(family.num_holes)]
         elif self.use_cvc:
@@ -128,7 +161,7 @@ class SmtSolver():
             intSort = self.solver.getIntegerSort()
             self.solver_vars = [self.solver.mkConst(intSort, str(hole)) for hole in range(family.num_holes)]
         else:
-            raise RuntimeError("Need to enable at least one SMT solver.")
+            raise RuntimeError(f"SMT solver {SmtSolver.solver_name} is not available.")
 
         # create solver clauses
         self.solver_clauses = []
@@ -196,16 +229,42 @@ class SmtSolver():
 
         pruning_estimate = 1
         counterexample_clauses = []
+        family_restricted = False
         for hole,var in enumerate(self.solver_vars):
             if hole in conflict:
                 option = assignment.hole_options(hole)[0]
-                counterexample_clauses.append(self.solver_clauses[hole][option])
+                if self.use_native:
+                    counterexample_clauses.append((hole,[option]))
+                else:
+                    counterexample_clauses.append(self.solver_clauses[hole][option])
             else:
                 if family.hole_num_options(hole) < family.hole_num_options_total(hole):
-                    counterexample_clauses.append(family.encoding.hole_clauses[hole])
+                    family_restricted = True
+                    if self.use_native:
+                        counterexample_clauses.append((hole,family.encoding.hole_clauses[hole]))
+                    else:
+                        counterexample_clauses.append(family.encoding.hole_clauses[hole])
                 pruning_estimate *= family.hole_num_options(hole)
 
-        if self.use_python_z3:
+        if not family_restricted:
+            # the conflict is valid for the whole design space: keep it when the current scope is popped
+            conflict_key = tuple([(hole,assignment.hole_options(hole)[0]) for hole in sorted(conflict)])
+            if conflict_key in self.global_conflicts:
+                # already excluded
+                return 0
+            self.global_conflicts.add(conflict_key)
+            if self.solver_depth > 0:
+                self.persistent_conflicts.append([self.solver_depth,counterexample_clauses])
+
+        self.exclude_clauses(counterexample_clauses)
+        return pruning_estimate
+
+
+    def exclude_clauses(self, counterexample_clauses):
+        ''' Exclude assignments that satisfy all of the clauses. '''
+        if self.use_native:
+            self.solver.exclude(counterexample_clauses)
+        elif self.use_python_z3:
             if len(counterexample_clauses) == 0:
                 counterexample_encoding = False
             else:
@@ -222,8 +281,6 @@ class SmtSolver():
         else:
             pass
 
-        return pruning_estimate
-
 
     def level(self, refinement_depth):
         ''' Reset solver depth level to correspond to refinement level. '''
@@ -237,6 +294,15 @@ class SmtSolver():
             self.solver.pop()
             self.solver_depth -= 1
 
+        # re-assert conflicts valid for the whole design space that were popped
+        for persistent_conflict in self.persistent_conflicts:
+            depth,counterexample_clauses = persistent_conflict
+            if depth > self.solver_depth:
+                self.exclude_clauses(counterexample_clauses)
+                persistent_conflict[0] = self.solver_depth
+        # conflicts at the root scope are never popped
+        self.persistent_conflicts = [conflict for conflict in self.persistent_conflicts if conflict[0] > 0]
+
         # create new scope
         self.solver.push()
         self.solver_depth += 1
@@ -2,6 +2,7 @@ import stormpy
 
 import paynt.verification.property
 import paynt.verification.property_result
+import paynt.utils.arrays
 
 import payntbind
 
@@ -21,6 +22,8 @@ class Mdp:
         self.model = model
         if len(model.initial_states) > 1:
             logger.warning("WARNING: obtained model with multiple initial states")
+        # model checker sharing preprocessing among properties and optimization directions, created upon first use
+        self.model_checker = None
 
     @property
     def states(self):
@@ -34,11 +37,49 @@ class Mdp:
     def initial_state(self):
         return self.model.initial_states[0]
 
-    def model_check_property(self, prop, alt=False):
+    def shared_model_checker(self):
+        ''' :return model checker sharing preprocessing among the calls, or None if the model is not a (non-exact) MDP '''
+        if self.model_checker is None and self.model.model_type == stormpy.ModelType.MDP and not self.model.is_exact:
+            self.model_checker = payntbind.synthesis.MdpModelChecker(self.model)
+        return self.model_checker
+
+    def model_check_property(self, prop, alt=False, initial_values=None, bound=None, precision=None):
+        '''
+        :param bound if set, a pair (comparison type, threshold): model checking may terminate as soon as the value
+            in the initial state is known to meet this bound
+        :param precision if set, model checking precision used for this call
+        :note the scheduler is not extracted when checking the secondary (alt) direction
+        '''
         formula = prop.formula if not alt else prop.formula_alt
-        result = paynt.verification.property.Property.model_check(self.model,formula)
+        model_checker = self.shared_model_checker()
+        decided_early = False
+        if bound is not None and model_checker is not None:
+            result,decided_early = paynt.verification.property.Property.model_check_with_bound(
+                model_checker, formula, bound, initial_values, extract_scheduler=not alt, precision=precision
+            )
+        else:
+            result = paynt.verification.property.Property.model_check(
+                self.model, formula, initial_values, model_checker=model_checker, extract_scheduler=not alt,
+                precision=precision
+            )
         value = result.at(self.initial_state)
-        return paynt.verification.property_result.PropertyResult(prop, result, value)
+        return paynt.verification.property_result.PropertyResult(prop, result, value, decided_early)
+
+    def model_check_property_refined(self, prop, alt=False, initial_values=None, bound=None):
+        '''
+        Model check the property using the coarse precision first and re-check it using the default precision only
+        if the coarse value is too close to the threshold (or to the optimum) to decide the property. This also applies
+        to results decided early by the bound: their value is approximate as well.
+        '''
+        Property = paynt.verification.property.Property
+        coarse_precision = Property.coarse_model_checking_precision
+        if coarse_precision is None or coarse_precision <= Property.model_checking_precision or self.model.is_exact:
+            return self.model_check_property(prop, alt, initial_values, bound)
+        result = self.model_check_property(prop, alt, initial_values, bound, precision=coarse_precision)
+        if not prop.decision_within_precision(result.value, coarse_precision):
+            return result
+        # refine the result, using the coarse values to initialize the solver
+        return self.model_check_property(prop, alt, paynt.utils.arrays.check_result_values(result.result), bound)
 
     def check_specification(self, spec, constraint_indices=None, short_evaluation=False):
         ''' Assuming this is a DTMC. '''
@@ -61,10 +102,22 @@ class Mdp:
 
 class SubMdp(Mdp):
 
-    def __init__(self, model, quotient_state_map, quotient_choice_map):
+    def __init__(self, model, quotient_state_map, quotient_choice_map, quotient_model_checker=None):
+        '''
+        :param quotient_model_checker if set, model checker of the quotient MDP whose qualitative analysis is used to
+            derive the one of this sub-MDP
+        '''
         super().__init__(model)
         self.quotient_choice_map = quotient_choice_map
         self.quotient_state_map = quotient_state_map
+        self.quotient_model_checker = quotient_model_checker
+
+    def shared_model_checker(self):
+        first_use = self.model_checker is None
+        model_checker = super().shared_model_checker()
+        if first_use and model_checker is not None and self.quotient_model_checker is not None:
+            model_checker.set_quotient_checker(self.quotient_model_checker, self.quotient_state_map)
+        return model_checker
 
 
 class Smg(Mdp):
@@ -72,12 +125,12 @@ class Smg(Mdp):
     def __init__(self, model):
         super().__init__(model)
 
-    def model_check_property(self, prop, alt=False):
+    def model_check_property(self, prop, alt=False, initial_values=None, bound=None, precision=None):
         formula = prop.game_formula if not alt else prop.game_formula_alt
 
         result = payntbind.synthesis.model_check_smg(self.model, formula,
                                                         only_initial_states=False, set_produce_schedulers=True,
-                                                        env=paynt.verification.property.Property.environment)
+                                                        env=paynt.verification.property.Property.get_environment(precision))
 
         value = result.at(self.model.initial_states[0])
         return paynt.verification.property_result.PropertyResult(prop, result, value)
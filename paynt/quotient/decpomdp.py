@@ -111,12 +111,7 @@ class DecPomdpQuotient(paynt.quotient.quotient.Quotient):
         self.coloring = payntbind.synthesis.Coloring(self.family.family, self.quotient_mdp.nondeterministic_choice_indices, choice_to_hole_options)
 
         # to each hole-option pair a list of actions colored by this combination
-        self.hole_option_to_actions = [[] for hole in range(self.family.num_holes)]
-        for hole in range(self.family.num_holes):
-            self.hole_option_to_actions[hole] = [[] for option in self.family.hole_options(hole)]
-        for choice in range(self.quotient_mdp.nr_choices):
-            for hole,option in choice_to_hole_options[choice]:
-                self.hole_option_to_actions[hole][option].append(choice)
+        self.hole_option_to_actions = self.coloring.getHoleOptionToChoices()
 
 
     def create_coloring(self):
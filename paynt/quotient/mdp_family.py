@@ -3,6 +3,7 @@ import payntbind
 import paynt.family.family
 import paynt.quotient.quotient
 import paynt.models.models
+import paynt.utils.arrays
 
 import json
 
@@ -71,12 +72,7 @@ class MdpFamilyQuotient(paynt.quotient.quotient.Quotient):
 
     def scheduler_to_policy(self, scheduler, mdp):
         state_to_choice = self.scheduler_to_state_to_choice(mdp,scheduler)
-        policy = self.empty_policy()
-        for state in range(self.quotient_mdp.nr_states):
-            choice = state_to_choice[state]
-            if choice is not None:
-                policy[state] = self.choice_to_action[choice]
-        return policy
+        return payntbind.synthesis.stateToChoiceToAction(state_to_choice, self.choice_to_action)
 
     def policy_to_state_valuation_actions(self, policy):
         '''
@@ -226,15 +222,10 @@ class MdpFamilyQuotient(paynt.quotient.quotient.Quotient):
         )
         unfolded_mdp = self.memory_unfolder.construct_unfolded_model(MdpFamilyQuotient.initial_memory_size)
 
-        # create new coloring
-        choice_to_hole_options = []
-        original_choice_to_hole_options = coloring.getChoiceToAssignment()
-        choice_map = list(self.memory_unfolder.choice_map)
-        for choice in range(unfolded_mdp.nr_choices):
-            original_choice = choice_map[choice]
-            choice_to_hole_options.append(original_choice_to_hole_options[original_choice])
-     
-        new_coloring = payntbind.synthesis.Coloring(family.family, unfolded_mdp.nondeterministic_choice_indices, choice_to_hole_options)
+        # create new coloring: unfolded choices inherit colors of the original ones
+        choice_map = paynt.utils.arrays.memory_unfolder_choice_map(self.memory_unfolder)
+        new_coloring = payntbind.synthesis.Coloring(
+            family.family, unfolded_mdp.nondeterministic_choice_indices, coloring, choice_map)
 
         logger.info(f"unfolded model has {unfolded_mdp.nr_states} states and {unfolded_mdp.nr_choices} choices.")
 
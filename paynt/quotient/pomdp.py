@@ -28,7 +28,8 @@ class PomdpQuotient(paynt.quotient.quotient.Quotient):
         self.quotient_mdp = None
         self.family = None
         self.coloring = None
-        # to each hole-option pair a list of actions colored by this combination (reverse coloring)
+        # to each hole-option pair a list of actions colored by this combination (reverse coloring), rows are indexed
+        # via Coloring.holeOptionIndex
         self.hole_option_to_actions = None
 
         # attributes associated with a (folded) POMDP
@@ -356,14 +357,12 @@ class PomdpQuotient(paynt.quotient.quotient.Quotient):
         self.coloring = payntbind.synthesis.Coloring(self.family.family, self.quotient_mdp.nondeterministic_choice_indices, choice_to_hole_options)
 
         # to each hole-option pair a list of actions colored by this combination
-        self.hole_option_to_actions = [[] for hole in range(self.family.num_holes)]
-        for hole in range(self.family.num_holes):
-            self.hole_option_to_actions[hole] = [[] for option in self.family.hole_options(hole)]
-        for choice in range(self.quotient_mdp.nr_choices):
-            for hole,option in choice_to_hole_options[choice]:
-                self.hole_option_to_actions[hole][option].append(choice)
+        self.hole_option_to_actions = self.coloring.getHoleOptionToChoices()
 
 
+    def hole_option_actions(self, hole, option):
+        ''' :return a list of actions colored by the hole option '''
+        return self.hole_option_to_actions[self.coloring.holeOptionIndex(hole,option)]
 
 
     def estimate_scheduler_difference(self, mdp, quotient_choice_map, inconsistent_assignments, choice_values, expected_visits):
@@ -391,7 +390,8 @@ class PomdpQuotient(paynt.quotient.quotient.Quotient):
         for hole_index,options in inconsistent_assignments.items():
             difference_sum = 0
             states_affected = 0
-            edges_0 = self.hole_option_to_actions[hole_index][options[0]]
+            option_actions = [self.hole_option_actions(hole_index,option) for option in options]
+            edges_0 = option_actions[0]
             for choice_index,_ in enumerate(edges_0):
 
                 choice_0_global = edges_0[choice_index]
@@ -407,10 +407,10 @@ class PomdpQuotient(paynt.quotient.quotient.Quotient):
                     continue
 
                 state_values = []
-                for option in options:
+                for actions in option_actions:
 
-                    assert len(self.hole_option_to_actions[hole_index][option]) > choice_index
-                    choice_global = self.hole_option_to_actions[hole_index][option][choice_index]
+                    assert len(actions) > choice_index
+                    choice_global = actions[choice_index]
                     choice = quotient_to_restricted_action_map[choice_global]
                     choice_value = choice_values[choice]
                     state_values.append(choice_value)
@@ -103,18 +103,10 @@ class PomdpFamilyQuotient(paynt.quotient.mdp_family.MdpFamilyQuotient):
         # the product inherits the design space
         product_family = self.family.copy()
         
-        # the choices of the product inherit colors of the quotient
-        product_choice_to_hole_options = []
-        quotient_num_choces = self.quotient_mdp.nr_choices
-        choice_to_hole_assignment = self.coloring.getChoiceToAssignment()
-        for product_choice in range(product.nr_choices):
-            choice = product_choice_to_choice[product_choice]
-            if choice == quotient_num_choces:
-                hole_options = []
-            else:
-                hole_options = [(hole,option) for hole,option in choice_to_hole_assignment[choice]]
-            product_choice_to_hole_options.append(hole_options)
-        product_coloring = payntbind.synthesis.Coloring(product_family.family, product.nondeterministic_choice_indices, product_choice_to_hole_options)
+        # the choices of the product inherit colors of the quotient, choices mapped to the number of quotient choices
+        # remain uncolored
+        product_coloring = payntbind.synthesis.Coloring(
+            product_family.family, product.nondeterministic_choice_indices, self.coloring, product_choice_to_choice)
         
         # copy the specification
         product_specification = self.specification.copy()
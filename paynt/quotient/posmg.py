@@ -225,12 +225,7 @@ class PosmgQuotient(paynt.quotient.quotient.Quotient):
         self.coloring = payntbind.synthesis.Coloring(self.family.family, self.quotient_mdp.nondeterministic_choice_indices, choice_to_hole_options)
 
         # to each hole-option pair a list of actions colored by this combination
-        self.hole_option_to_actions = [[] for hole in range(self.family.num_holes)]
-        for hole in range(self.family.num_holes):
-            self.hole_option_to_actions[hole] = [[] for option in self.family.hole_options(hole)]
-        for choice in range(self.quotient_mdp.nr_choices):
-            for hole,option in choice_to_hole_options[choice]:
-                self.hole_option_to_actions[hole][option].append(choice)
+        self.hole_option_to_actions = self.coloring.getHoleOptionToChoices()
 
 
     def create_smg_from_mdp(self, mdp):
@@ -257,7 +252,6 @@ class PosmgQuotient(paynt.quotient.quotient.Quotient):
     def scheduler_selection(self, mdp, scheduler):
         ''' Get hole options involved in the scheduler selection. '''
         assert scheduler.memoryless and scheduler.deterministic
-        state_to_choice = self.scheduler_to_state_to_choice(mdp, scheduler, discard_unreachable_choices=False)
-        choices = self.state_to_choice_to_choices(state_to_choice)
+        choices = self.scheduler_to_choices(mdp, scheduler, discard_unreachable_choices=False)
         hole_selection = self.coloring.collectHoleOptions(choices)
         return hole_selection
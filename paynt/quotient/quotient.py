@@ -3,6 +3,9 @@ import payntbind
 
 import paynt.family.family
 import paynt.models.models
+import paynt.verification.property_result
+import paynt.verification.result_cache
+import paynt.utils.arrays
 
 import math
 import itertools
@@ -15,17 +18,15 @@ class Quotient:
 
     # if True, expected visits will not be computed for hole scoring
     disable_expected_visits = False
+    # if True, sub-MDPs of subfamilies will be constructed from the sub-MDP of the parent family
+    build_incrementally = False
+    # if True, qualitative analysis of sub-MDPs will be derived from the one of the quotient MDP
+    # note: the topological solver still computes the SCC decomposition of each sub-MDP itself
+    share_graph_analysis = False
 
     # label associated with un-labelled choices
     EMPTY_LABEL = "__no_label__"
 
-    @staticmethod
-    def make_vector_defined(vector):
-        vector_noinf = [ value if value != math.inf else 0 for value in vector]
-        default_value = sum(vector_noinf) / len(vector)
-        vector_valid = [ value if value != math.inf else default_value for value in vector]
-        return vector_valid
-
     def __init__(self, quotient_mdp = None, family = None, coloring = None, specification = None, use_exact=False):
 
         # colored qoutient MDP for the super-family
@@ -40,6 +41,13 @@ class Quotient:
         self.subsystem_builder_options.build_state_mapping = True
         self.subsystem_builder_options.build_action_mapping = True
 
+        # model checking results of DTMCs induced by recently checked assignments
+        self.assignment_result_cache = paynt.verification.result_cache.AssignmentResultCache()
+
+        # model checker of the quotient MDP sharing its qualitative analysis with sub-MDPs, created upon first use
+        self.quotient_model_checker = None
+        self.quotient_model_checker_mdp = None
+
         # for each choice of the quotient, a list of its state-destinations
         self.choice_destinations = None
         if self.quotient_mdp is not None:
@@ -68,22 +76,64 @@ class Quotient:
             mdp, all_states, choices, keep_unreachable_states, self.subsystem_builder_options
         )
         model = submodel_construction.model
-        state_map = submodel_construction.new_to_old_state_mapping.copy()
-        choice_map = submodel_construction.new_to_old_action_mapping.copy()
+        state_map,choice_map = paynt.utils.arrays.submodel_mappings(submodel_construction, mdp.is_exact)
         return model,state_map,choice_map
 
     def restrict_quotient(self, choices):
         return self.restrict_mdp(self.quotient_mdp, choices)
 
+    def shared_quotient_model_checker(self):
+        '''
+        :return model checker of the quotient MDP whose qualitative analysis (computed once per quotient) is shared
+            among its sub-MDPs, or None if sharing is disabled or not applicable
+        '''
+        if not Quotient.share_graph_analysis or self.use_exact or self.quotient_mdp.model_type != stormpy.ModelType.MDP:
+            return None
+        if self.quotient_model_checker_mdp is not self.quotient_mdp:
+            # the quotient has changed (e.g. after memory unfolding)
+            self.quotient_model_checker = payntbind.synthesis.MdpModelChecker(self.quotient_mdp)
+            self.quotient_model_checker_mdp = self.quotient_mdp
+        return self.quotient_model_checker
+
     def build_from_choice_mask(self, choices):
         mdp,state_map,choice_map = self.restrict_quotient(choices)
-        return paynt.models.models.SubMdp(mdp, state_map, choice_map)
+        return paynt.models.models.SubMdp(mdp, state_map, choice_map, self.shared_quotient_model_checker())
+
+    def build_from_parent_mdp(self, parent_mdp, choices):
+        '''
+        Restrict the sub-MDP of the parent family (instead of the whole quotient) to the selected actions.
+        :param parent_mdp sub-MDP of the parent family, must contain all selected actions
+        :param choices a bitvector of selected actions of the quotient
+        '''
+        parent_choices = payntbind.synthesis.restrictChoiceMaskToSubmodel(choices, parent_mdp.quotient_choice_map)
+        mdp,state_map,choice_map = self.restrict_mdp(parent_mdp.model, parent_choices)
+        # compose mappings to obtain sub- to full mappings
+        state_map = paynt.utils.arrays.compose(parent_mdp.quotient_state_map, state_map)
+        choice_map = paynt.utils.arrays.compose(parent_mdp.quotient_choice_map, choice_map)
+        return paynt.models.models.SubMdp(mdp, state_map, choice_map, self.shared_quotient_model_checker())
+
+    def build_family_mdp(self, family, choices):
+        ''' Construct the sub-MDP for the family, incrementally if the sub-MDP of the parent family is available. '''
+        if family.parent_info is not None and family.parent_info.mdp is not None:
+            mdp = self.build_from_parent_mdp(family.parent_info.mdp, choices)
+            family.parent_info.release_mdp()
+            return mdp
+        return self.build_from_choice_mask(choices)
+
+    def select_compatible_choices(self, family):
+        ''' Select actions compatible with the family, starting from the selection of the parent family if available. '''
+        if family.parent_info is None or family.parent_info.selected_choices is None:
+            return self.coloring.selectCompatibleChoices(family.family)
+        if family.parent_info.splitter is None:
+            return self.coloring.selectCompatibleChoices(family.family, family.parent_info.selected_choices)
+        return self.coloring.selectCompatibleChoices(
+            family.family, family.parent_info.selected_choices, [family.parent_info.splitter])
 
     def build(self, family):
         ''' Construct the quotient MDP for the family. '''
         # select actions compatible with the family and restrict the quotient
-        choices = self.coloring.selectCompatibleChoices(family.family)
-        family.mdp = self.build_from_choice_mask(choices)
+        choices = self.select_compatible_choices(family)
+        family.mdp = self.build_family_mdp(family, choices)
         family.selected_choices = choices
         family.mdp.family = family
 
@@ -110,56 +160,102 @@ class Quotient:
         model = Quotient.mdp_to_dtmc(mdp)
         return paynt.models.models.SubMdp(model,state_map,choice_map)
 
+    def check_assignment(self, assignment, constraint_indices=None, short_evaluation=False):
+        '''
+        Check the specification on the DTMC induced by the assignment, reusing the results of previous checks of this
+        assignment. The DTMC is built only if some property was not checked before.
+        :return (1) specification result, see Mdp.check_specification
+        :return (2) the DTMC, or None if all results were obtained from the cache
+        '''
+        spec = self.specification
+        cache = self.assignment_result_cache
+        cache.validate(spec, self.coloring)
+        key = assignment.options_to_bytes()
+        property_values = cache.lookup(key)
+        dtmc = None
+
+        def property_result(index, prop):
+            nonlocal dtmc
+            if index in property_values:
+                return paynt.verification.property_result.PropertyResult(prop, None, property_values[index])
+            if dtmc is None:
+                dtmc = self.build_assignment(assignment)
+            result = dtmc.model_check_property(prop)
+            property_values[index] = result.value
+            return result
+
+        if constraint_indices is None:
+            constraint_indices = spec.all_constraint_indices()
+        results = [None for _ in spec.constraints]
+        for index in constraint_indices:
+            result = property_result(index, spec.constraints[index])
+            results[index] = result
+            if short_evaluation and result.sat is False:
+                break
+        spec_result = paynt.verification.property_result.SpecificationResult()
+        spec_result.constraints_result = paynt.verification.property_result.ConstraintsResult(results)
+        if spec.has_optimality and not (short_evaluation and spec_result.constraints_result.sat is False):
+            spec_result.optimality_result = property_result(len(spec.constraints), spec.optimality)
+
+        cache.store(key, property_values, hit=dtmc is None)
+        return spec_result,dtmc
+
     def empty_scheduler(self):
         return [None] * self.quotient_mdp.nr_states
 
     def discard_unreachable_choices(self, state_to_choice):
-        state_to_choice_reachable = self.empty_scheduler()
-        state_visited = [False]*self.quotient_mdp.nr_states
-        initial_state = list(self.quotient_mdp.initial_states)[0]
-        state_visited[initial_state] = True
-        state_queue = [initial_state]
-        while state_queue:
-            state = state_queue.pop()
-            choice = state_to_choice[state]
-            state_to_choice_reachable[state] = choice
-            for dst in self.choice_destinations[choice]:
-                if not state_visited[dst]:
-                    state_visited[dst] = True
-                    state_queue.append(dst)
-        return state_to_choice_reachable
+        ''' :return state-to-choice mapping where states unreachable under the given mapping have no choice '''
+        if self.quotient_mdp.is_exact:
+            return payntbind.synthesis.discardUnreachableChoicesExact(self.quotient_mdp, state_to_choice)
+        return payntbind.synthesis.discardUnreachableChoices(self.quotient_mdp, state_to_choice)
 
     def scheduler_to_state_to_choice(self, submdp, scheduler, discard_unreachable_choices=True):
+        ''' :return state-to-choice mapping of the quotient, where states not in the sub-MDP have no choice '''
         if submdp.model.is_exact:
-            state_to_quotient_choice = payntbind.synthesis.schedulerToStateToGlobalChoiceExact(scheduler, submdp.model, submdp.quotient_choice_map)
+            scheduler_to_state_to_choice = payntbind.synthesis.schedulerToQuotientStateToChoiceExact
         else:
-            state_to_quotient_choice = payntbind.synthesis.schedulerToStateToGlobalChoice(scheduler, submdp.model, submdp.quotient_choice_map)
-        state_to_choice = self.empty_scheduler()
-        for state in range(submdp.model.nr_states):
-            quotient_choice = state_to_quotient_choice[state]
-            quotient_state = submdp.quotient_state_map[state]
-            state_to_choice[quotient_state] = quotient_choice
-        if discard_unreachable_choices:
-            state_to_choice = self.discard_unreachable_choices(state_to_choice)
-        return state_to_choice
+            scheduler_to_state_to_choice = payntbind.synthesis.schedulerToQuotientStateToChoice
+        return scheduler_to_state_to_choice(
+            scheduler, submdp.model, submdp.quotient_choice_map, submdp.quotient_state_map, self.quotient_mdp,
+            discard_unreachable_choices
+        )
 
     def state_to_choice_to_choices(self, state_to_choice):
-        num_choices = self.quotient_mdp.nr_choices
-        choices = stormpy.BitVector(num_choices,False)
-        for choice in state_to_choice:
-            if choice is not None and choice < num_choices:
-                choices.set(choice,True)
-        return choices
+        ''' :return a bitvector of quotient choices selected in the states; states without a valid choice are skipped '''
+        return payntbind.synthesis.stateToChoiceToChoices(state_to_choice, self.quotient_mdp.nr_choices)
+
+    def scheduler_to_choices(self, submdp, scheduler, discard_unreachable_choices=True):
+        ''' :return a bitvector of quotient choices selected by the scheduler of the sub-MDP '''
+        if submdp.model.is_exact:
+            scheduler_to_quotient_choices = payntbind.synthesis.schedulerToQuotientChoicesExact
+        else:
+            scheduler_to_quotient_choices = payntbind.synthesis.schedulerToQuotientChoices
+        return scheduler_to_quotient_choices(
+            scheduler, submdp.model, submdp.quotient_choice_map, self.quotient_mdp.nr_choices,
+            discard_unreachable_choices
+        )
 
     def scheduler_selection(self, mdp, scheduler):
         ''' Get hole options involved in the scheduler selection. '''
         assert scheduler.memoryless and scheduler.deterministic
-        state_to_choice = self.scheduler_to_state_to_choice(mdp, scheduler)
-        choices = self.state_to_choice_to_choices(state_to_choice)
+        choices = self.scheduler_to_choices(mdp, scheduler)
         hole_selection = self.coloring.collectHoleOptions(choices)
         return hole_selection
 
 
+    def map_state_values(self, quotient_state_map, state_values, submdp):
+        '''
+        Map values of states of some sub-MDP onto states of another sub-MDP.
+        :param quotient_state_map sub- to full state mapping of the source sub-MDP
+        :param state_values a vector of values of the states of the source sub-MDP
+        :param submdp the target sub-MDP, its states must be a subset of states of the source sub-MDP
+        :return a vector of values for the states of the target sub-MDP, or None if some value is not defined
+        '''
+        return paynt.utils.arrays.remap_values(
+            state_values, quotient_state_map, submdp.quotient_state_map, self.quotient_mdp.nr_states
+        )
+
+
     def choice_values(self, mdp, prop, state_values):
         '''
         Get choice values after model checking MDP against a property.
@@ -170,52 +266,24 @@ class Quotient:
         - mc(s') is the model checking result in state s'
         '''
 
-        # multiply probability with model checking results
+        reward_name = prop.formula.reward_name if prop.reward else None
         if mdp.is_exact:
-            choice_values = payntbind.synthesis.multiply_with_vector_exact(mdp.transition_matrix, state_values)
-        else:
-            choice_values = payntbind.synthesis.multiply_with_vector(mdp.transition_matrix, state_values)
-        choice_values = Quotient.make_vector_defined(choice_values)
-
-        # if the associated reward model has state-action rewards, then these must be added to choice values
-        if prop.reward:
-            reward_name = prop.formula.reward_name
-            rm = mdp.reward_models.get(reward_name)
-            assert rm.has_state_action_rewards
-            choice_rewards = list(rm.state_action_rewards)
-            assert mdp.nr_choices == len(choice_rewards)
-            for choice in range(mdp.nr_choices):
-                choice_values[choice] += choice_rewards[choice]
-
-        return choice_values
+            return payntbind.synthesis.computeChoiceValuesExact(mdp, state_values, reward_name)
+        return payntbind.synthesis.computeChoiceValues(mdp, state_values, reward_name)
 
 
     def compute_expected_visits(self, mdp, prop, choices):
         '''
-        Compute expected number of visits in the states of DTMC induced by the shoices.
+        Compute expected number of visits in the states of DTMC induced by the choices. Infinite visits are replaced by
+        the average (when minimizing) or by zero (when maximizing). The average is taken over the states reachable in
+        the induced DTMC, i.e. over the states with nonzero visits, unreachable states get zero visits.
         '''
         if Quotient.disable_expected_visits:
             return [1]*self.quotient_mdp.nr_states
-
-        # extract DTMC induced by this MDP-scheduler
-        sub_mdp,state_map,_ = self.restrict_mdp(mdp, choices)
-        dtmc = Quotient.mdp_to_dtmc(sub_mdp)
-        dtmc_visits = paynt.verification.property.Property.compute_expected_visits(dtmc)
-
-        # handle infinity- and zero-visits
-        if prop.minimizing:
-            dtmc_visits = Quotient.make_vector_defined(dtmc_visits)
-        else:
-            dtmc_visits = [ value if value != math.inf else 0 for value in dtmc_visits]
-
-        # map vector of expected visits onto the state space of the quotient MDP
-        expected_visits = [0] * mdp.nr_states
-        for state in range(dtmc.nr_states):
-            mdp_state = state_map[state]
-            visits = dtmc_visits[state]
-            expected_visits[mdp_state] = visits
-
-        return expected_visits
+        environment = paynt.verification.property.Property.environment
+        if mdp.is_exact:
+            return payntbind.synthesis.computeExpectedVisitsExact(environment, mdp, choices, prop.minimizing)
+        return payntbind.synthesis.computeExpectedVisits(environment, mdp, choices, prop.minimizing)
 
 
     def estimate_scheduler_difference(self, mdp, quotient_choice_map, inconsistent_assignments, choice_values, expected_visits):
@@ -315,6 +383,9 @@ class Quotient:
 
         # construct corresponding subfamilies
         parent_info = family.collect_parent_info(self.specification)
+        parent_info.splitter = splitter
+        if Quotient.build_incrementally:
+            parent_info.mdp = family.mdp
         subfamilies = family.split(splitter,suboptions)
         for subfamily in subfamilies:
             subfamily.add_parent_info(parent_info)
@@ -0,0 +1,224 @@
+import paynt.utils.timer
+
+import itertools
+import os
+import pickle
+import weakref
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    '''
+    Periodic snapshot of the synthesis progress: the families that remain to be explored (together with their
+    exploration priorities), the current optimum, the best assignment, the explored space and the statistic counters.
+    Families are stored as option bitmasks.
+
+    The checkpoint file is an append-only log of pickled records:
+    - a header identifying the design space,
+    - ("push", [(family,priority),...]) for families added to the frontier since the previous checkpoint,
+    - ("pop", [family,...]) for families removed from the frontier since the previous checkpoint,
+    - ("state", dict) closing each checkpoint with the remaining progress information.
+    Only the delta of the frontier is appended upon each checkpoint. Once the log contains many more family records
+    than the frontier, it is compacted, i.e. rewritten with the current frontier only. Records following the last
+    complete state record (e.g. of an interrupted checkpoint) are ignored upon resuming.
+    :note only synthesizers that explore a frontier of families (AR and its variants) support checkpoints, see
+        Synthesizer.supports_checkpoints
+    '''
+
+    # file to which checkpoints are periodically written, None to disable checkpointing
+    filename = None
+    # minimum number of seconds between two checkpoints
+    period_seconds = 300
+    # checkpoint file to resume the synthesis from
+    resume_filename = None
+    # the log is compacted once it contains more than this many family records per family of the frontier
+    compaction_factor = 4
+
+    # statistic counters stored in the checkpoint
+    STATISTIC_COUNTERS = [
+        "iterations_dtmc", "acc_size_dtmc", "iterations_mdp", "acc_size_mdp", "iterations_game", "acc_size_game"
+    ]
+
+    def __init__(self, synthesizer):
+        self.synthesizer = synthesizer
+        self.timer = paynt.utils.timer.Timer()
+        self.timer.start()
+        # encodings of families that were already stored, families stay in the frontier across several checkpoints
+        self.family_to_bytes = weakref.WeakKeyDictionary()
+        # encodings of the families of the frontier stored in the log
+        self.logged_families = None
+        # number of family records in the log
+        self.num_log_records = 0
+        # (family,priority) pairs restored from the checkpoint, to be used instead of the initial family
+        self.resumed_families = None
+        # explored space restored from the checkpoint
+        self.resumed_explored_space = None
+
+    def encode_family(self, family):
+        if isinstance(family, bytes):
+            # already encoded
+            return family
+        data = self.family_to_bytes.get(family)
+        if data is None:
+            data = family.options_to_bytes()
+            self.family_to_bytes[family] = data
+        return data
+
+    def design_space_signature(self):
+        family = self.synthesizer.quotient.family
+        return [family.hole_num_options_total(hole) for hole in range(family.num_holes)]
+
+    def update(self, families, pending_families=None):
+        '''
+        Write a checkpoint if checkpointing is enabled and the checkpoint period has elapsed.
+        :param families frontier of families that remain to be explored
+        :param pending_families families that are being analyzed at the moment
+        '''
+        if Checkpoint.filename is None or self.timer.read() < Checkpoint.period_seconds:
+            return
+        chunks = families.family_priority_chunks()
+        if pending_families is not None:
+            chunks = itertools.chain(chunks, [[(family,None) for family in pending_families]])
+        self.write(chunks)
+        self.timer.reset()
+        self.timer.start()
+
+    def state(self):
+        synthesizer = self.synthesizer
+        specification = synthesizer.quotient.specification
+        best_assignment = synthesizer.best_assignment
+        if best_assignment is not None:
+            best_assignment = best_assignment.options_to_bytes()
+        return {
+            "optimum": specification.optimality.optimum if specification.has_optimality else None,
+            "best_assignment": best_assignment,
+            "best_assignment_value": synthesizer.best_assignment_value,
+            "explored": synthesizer.explored,
+            "explored_space": synthesizer.explored_space,
+            "statistic": {counter : getattr(synthesizer.stat,counter) for counter in Checkpoint.STATISTIC_COUNTERS},
+        }
+
+    def write(self, chunks):
+        '''
+        Write the checkpoint: append the changes of the frontier since the previous checkpoint to the log, or rewrite
+        the log if it is too long (or was not written by this run yet).
+        :param chunks an iterable of lists of (family,priority) pairs, where families may be provided in their
+            encoded form
+        '''
+        frontier = {}
+        for chunk in chunks:
+            for family,priority in chunk:
+                frontier[self.encode_family(family)] = priority
+        state = self.state()
+        if self.logged_families is None or self.num_log_records > Checkpoint.compaction_factor * max(len(frontier),1):
+            self.compact(frontier, state)
+            return
+        pushed = [(data,priority) for data,priority in frontier.items() if data not in self.logged_families]
+        popped = [data for data in self.logged_families if data not in frontier]
+        with open(Checkpoint.filename, "ab") as f:
+            if pushed:
+                pickle.dump(("push",pushed), f, protocol=pickle.HIGHEST_PROTOCOL)
+            if popped:
+                pickle.dump(("pop",popped), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(("state",state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.logged_families = set(frontier)
+        self.num_log_records += len(pushed) + len(popped)
+        logger.debug(f"checkpoint appended to {Checkpoint.filename}: {len(pushed)} pushed, {len(popped)} popped")
+
+    def compact(self, frontier, state):
+        ''' Rewrite the log so that it contains the given frontier only. '''
+        # write to a temporary file first so that an interruption does not destroy the previous checkpoint
+        tmp_filename = Checkpoint.filename + ".tmp"
+        with open(tmp_filename, "wb") as f:
+            pickle.dump({"design_space": self.design_space_signature()}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(("push",list(frontier.items())), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(("state",state), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_filename, Checkpoint.filename)
+        self.logged_families = set(frontier)
+        self.num_log_records = len(frontier)
+        logger.debug(f"checkpoint with {len(frontier)} families written to {Checkpoint.filename}")
+
+    @staticmethod
+    def read_records(filename):
+        '''
+        Iterate over the records of the log, a truncated last record (e.g. of an interrupted checkpoint) is skipped.
+        :return a generator of pairs (header, record)
+        '''
+        with open(filename, "rb") as f:
+            header = pickle.load(f)
+            while True:
+                try:
+                    record = pickle.load(f)
+                except (EOFError, pickle.UnpicklingError):
+                    return
+                yield header,record
+
+    def resume_if_requested(self, family):
+        '''
+        Restore the synthesis progress if a checkpoint to resume from was specified. The checkpoint is used only once,
+        subsequent synthesis calls (e.g. iterations of POMDP synthesis) start from scratch.
+        '''
+        if not self.synthesizer.supports_checkpoints:
+            if Checkpoint.filename is not None or Checkpoint.resume_filename is not None:
+                method = self.synthesizer.method_name
+                logger.warning(f"{method} does not support checkpoints, ignoring the checkpoint options")
+                Checkpoint.filename = None
+                Checkpoint.resume_filename = None
+            return
+        if Checkpoint.resume_filename is None or family is not self.synthesizer.quotient.family:
+            return
+        self.resume(family)
+        Checkpoint.resume_filename = None
+
+    def resume(self, family):
+        '''
+        Restore the synthesis progress from the checkpoint file. The log is read twice: first to find the last complete
+        checkpoint and the families popped before it, then to stream the remaining families, so that only their
+        encodings are kept in memory at once.
+        :param family the initial family, restored families will be its subfamilies
+        '''
+        filename = Checkpoint.resume_filename
+        state = None
+        num_records = 0
+        popped = set()
+        popped_before_state = set()
+        for header,(kind,data) in Checkpoint.read_records(filename):
+            if header["design_space"] != self.design_space_signature():
+                raise ValueError(f"checkpoint {filename} does not match the design space of the sketch")
+            num_records += 1
+            if kind == "pop":
+                popped.update(data)
+            elif kind == "state":
+                state = data
+                num_state_records = num_records
+                popped_before_state = set(popped)
+        if state is None:
+            raise ValueError(f"checkpoint {filename} does not contain a complete checkpoint")
+
+        synthesizer = self.synthesizer
+        specification = synthesizer.quotient.specification
+        if state["optimum"] is not None and specification.optimality.improves_optimum(state["optimum"]):
+            specification.optimality.update_optimum(state["optimum"])
+        if state["best_assignment"] is not None:
+            synthesizer.best_assignment = family.assume_options_bytes_copy(state["best_assignment"])
+            synthesizer.best_assignment_value = state["best_assignment_value"]
+        synthesizer.explored = state["explored"]
+        self.resumed_explored_space = state["explored_space"]
+        for counter,value in state["statistic"].items():
+            setattr(synthesizer.stat, counter, value)
+
+        def resumed_families():
+            records = itertools.islice(Checkpoint.read_records(filename), num_state_records)
+            for _,(kind,data) in records:
+                if kind != "push":
+                    continue
+                for family_bytes,priority in data:
+                    if family_bytes in popped_before_state:
+                        continue
+                    subfamily = family.assume_options_bytes_copy(family_bytes)
+                    subfamily.constraint_indices = family.constraint_indices
+                    yield subfamily,priority
+        self.resumed_families = resumed_families()
+        logger.info(f"resuming synthesis from {filename}")
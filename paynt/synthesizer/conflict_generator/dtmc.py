@@ -6,6 +6,9 @@ logger = logging.getLogger(__name__)
 
 class ConflictGeneratorDtmc():
 
+    # maximum number of conflicts constructed for each violated property
+    conflicts_per_property = 1
+
     def __init__(self, quotient):
         self.quotient = quotient
         self.counterexample_generator = None
@@ -45,7 +48,12 @@ class ConflictGeneratorDtmc():
             if family_result is not None:
                 bounds = family_result.primary.result
 
-            conflict = self.counterexample_generator.construct_conflict(index, threshold, bounds, family.mdp.quotient_state_map)
-            conflicts.append(conflict)
+            conflicts += self.construct_property_conflicts(index, threshold, bounds, family.mdp.quotient_state_map)
         
         return conflicts
+
+    def construct_property_conflicts(self, index, threshold, bounds, quotient_state_map):
+        max_conflicts = ConflictGeneratorDtmc.conflicts_per_property
+        if max_conflicts == 1:
+            return [self.counterexample_generator.construct_conflict(index, threshold, bounds, quotient_state_map)]
+        return self.counterexample_generator.construct_conflicts(index, threshold, bounds, quotient_state_map, max_conflicts)
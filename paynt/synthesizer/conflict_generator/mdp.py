@@ -23,3 +23,7 @@ class ConflictGeneratorMdp(paynt.synthesizer.conflict_generator.dtmc.ConflictGen
 
     def prepare_model(self, model):
         self.counterexample_generator.prepare_mdp(model.model, model.quotient_state_map)
+
+    def construct_property_conflicts(self, index, threshold, bounds, quotient_state_map):
+        # the MDP generator constructs a single conflict per property
+        return [self.counterexample_generator.construct_conflict(index, threshold, bounds, quotient_state_map)]
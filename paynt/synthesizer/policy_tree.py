@@ -1,8 +1,14 @@
 import stormpy
 import payntbind
 
+import itertools
+import multiprocessing
+import queue
+
 import paynt.family.family
+import paynt.family.frontier
 import paynt.synthesizer.synthesizer
+import paynt.synthesizer.statistic
 
 import paynt.quotient.quotient
 import paynt.verification.property_result
@@ -166,14 +172,14 @@ class PolicyTreeNode:
 
         # try policy1 for family2
         policy,mdp = quotient.fix_and_apply_policy_to_family(node2.family, policy12)
-        policy_result = mdp.model_check_property(prop, alt=True)
+        policy_result = mdp.model_check_property_refined(prop, alt=True)
         PolicyTreeNode.mdps_model_checked += 1
         if policy_result.sat:
             return policy
 
         # try policy2 for family1
         policy,mdp = quotient.fix_and_apply_policy_to_family(node1.family, policy21)
-        policy_result = mdp.model_check_property(prop, alt=True)
+        policy_result = mdp.model_check_property_refined(prop, alt=True)
         PolicyTreeNode.mdps_model_checked += 2
         if policy_result.sat:
             return policy
@@ -479,12 +485,77 @@ class MdpFamilyResult:
         self.hole_selection = None
         self.splitter = None
 
+class PolicyTreeFrontierSpilling(paynt.family.frontier.FrontierSpilling):
+    '''
+    Spilling frontier of undecided policy tree leaves. The leaves themselves stay in memory as a part of the policy
+    tree, only their families are spilled.
+    '''
+
+    def __init__(self, family):
+        super().__init__(family)
+        self.spilled_nodes = {}
+        self.node_counter = itertools.count()
+
+    def spill(self, node):
+        key = next(self.node_counter)
+        self.spilled_nodes[key] = node
+        record = (key, node.family.options_to_bytes(), node.family.candidate_policy)
+        node.family = None
+        return record
+
+    def restore(self, record):
+        key,family_bytes,candidate_policy = record
+        node = self.spilled_nodes[key]
+        node.family = self.family.assume_options_bytes_copy(family_bytes)
+        node.family.candidate_policy = candidate_policy
+        return node
+
+    def record_to_bytes(self, record):
+        _,family_bytes,_ = record
+        return family_bytes
+
+    def restore_chunk(self, records):
+        nodes = super().restore_chunk(records)
+        for key,_,_ in records:
+            del self.spilled_nodes[key]
+        return nodes
+
+
+# global variables for the process-pool mode
+# when a new process is spawned (forked), it will inherit these variables from the parent
+pool_synthesizer = None
+pool_game_solver = None
+pool_prop = None
+
+def expand_leaf(key, family_bytes, candidate_policy):
+    '''
+    Analyze the family of an undecided leaf of the policy tree and, if necessary, split it.
+    :return a tuple (key,policy,splitter,suboptions,candidate policies of subfamilies,iteration counters)
+    :note errors are not caught here: the pool passes them to the error callback of the main process
+    '''
+    synthesizer = pool_synthesizer
+    # fresh statistic to collect iterations performed by this worker
+    synthesizer.stat = paynt.synthesizer.statistic.Statistic(synthesizer)
+    family = synthesizer.quotient.family.assume_options_bytes_copy(family_bytes)
+    family.candidate_policy = candidate_policy
+    result = synthesizer.verify_family(family,pool_game_solver,pool_prop)
+    if result.policy is not None:
+        return (key, result.policy, None, None, None, synthesizer.stat.iteration_counters())
+    suboptions,subfamilies = synthesizer.split(
+        family, pool_prop, result.hole_selection, result.splitter, result.game_policy
+    )
+    candidate_policies = [subfamily.candidate_policy for subfamily in subfamilies]
+    return (key, None, result.splitter, suboptions, candidate_policies, synthesizer.stat.iteration_counters())
+
+
 class SynthesizerPolicyTree(paynt.synthesizer.synthesizer.Synthesizer):
 
     # if True, tree leaves will be double-checked after synthesis
     double_check_policy_tree_leaves = False
     # if True, unreachable choices will be discarded from the splitting scheduler
     discard_unreachable_choices = False
+    # number of processes used to expand undecided leaves, 1 for sequential expansion
+    num_processes = 1
     
     @property
     def method_name(self):
@@ -496,10 +567,7 @@ class SynthesizerPolicyTree(paynt.synthesizer.synthesizer.Synthesizer):
         if family.size == 1:
             quotient.assert_mdp_is_deterministic(mdp, family)
         DOUBLE_CHECK_PRECISION = 1e-6
-        default_precision = Property.model_checking_precision
-        Property.set_model_checking_precision(DOUBLE_CHECK_PRECISION)
-        policy_result = mdp.model_check_property(prop, alt=True)
-        Property.set_model_checking_precision(default_precision)
+        policy_result = mdp.model_check_property(prop, alt=True, precision=DOUBLE_CHECK_PRECISION)
         if not policy_result.sat:
             logger.warning("policy should be SAT but (most likely due to model checking precision) has value {}".format(policy_result.value))
         return
@@ -507,7 +575,7 @@ class SynthesizerPolicyTree(paynt.synthesizer.synthesizer.Synthesizer):
     
     def verify_policy(self, family, prop, policy):
         _,mdp = self.quotient.fix_and_apply_policy_to_family(family, policy)
-        policy_result = mdp.model_check_property(prop, alt=True)
+        policy_result = mdp.model_check_property_refined(prop, alt=True)
         self.stat.iteration(mdp)
         return policy_result.sat
 
@@ -578,7 +646,7 @@ class SynthesizerPolicyTree(paynt.synthesizer.synthesizer.Synthesizer):
             return mdp_family_result
 
         # solve primary direction for the MDP abstraction
-        mdp_result = family.mdp.model_check_property(prop)
+        mdp_result = family.mdp.model_check_property_refined(prop)
         mdp_value = mdp_result.value
         self.stat.iteration(family.mdp)
         # logger.debug("primary-primary direction solved, value is {}".format(mdp_value))
@@ -669,20 +737,23 @@ class SynthesizerPolicyTree(paynt.synthesizer.synthesizer.Synthesizer):
         return suboptions,subfamilies
 
     
-    def evaluate_all(self, family, prop, keep_value_only=False):
-        assert not prop.reward, "expecting reachability probability propery"
-        game_solver = self.quotient.build_game_abstraction_solver(prop)
-        family.candidate_policy = None
-        policy_tree = PolicyTree(family)
+    def create_frontier(self, policy_tree_node):
+        if paynt.family.frontier.FrontierSpilling.max_families_in_memory is not None:
+            undecided_leaves = PolicyTreeFrontierSpilling(policy_tree_node.family)
+        else:
+            undecided_leaves = paynt.family.frontier.FrontierDfs()
+        undecided_leaves.push(policy_tree_node)
+        return undecided_leaves
 
-        undecided_leaves = [policy_tree.root]
+    def expand_leaves(self, policy_tree, game_solver, prop):
+        undecided_leaves = self.create_frontier(policy_tree.root)
         while undecided_leaves:
 
             # gi = self.stat.iterations_game
             # if gi is not None and gi > 1000:
             #     return None
 
-            policy_tree_node = undecided_leaves.pop(-1)
+            policy_tree_node = undecided_leaves.pop()
             family = policy_tree_node.family
             result = self.verify_family(family,game_solver,prop)
             family.candidate_policy = None
@@ -703,7 +774,90 @@ class SynthesizerPolicyTree(paynt.synthesizer.synthesizer.Synthesizer):
             if policy_tree_node != policy_tree.root:
                 family.mdp = None
             policy_tree_node.split(result.splitter,suboptions,subfamilies)
-            undecided_leaves += policy_tree_node.child_nodes
+            undecided_leaves.push_subfamilies(policy_tree_node, policy_tree_node.child_nodes)
+
+    def expand_leaves_parallel(self, policy_tree, game_solver, prop):
+        '''
+        Expand undecided leaves of the policy tree in a pool of processes. Worker processes analyze and split
+        families, the policy tree is maintained by this process. Since leaves are finished in an arbitrary order,
+        policies are indexed only after all leaves have been expanded, in the order of the sequential expansion.
+        '''
+        global pool_synthesizer, pool_game_solver, pool_prop
+        pool_synthesizer = self
+        pool_game_solver = game_solver
+        pool_prop = prop
+
+        undecided_leaves = self.create_frontier(policy_tree.root)
+        # results are collected by the pool's result handler as soon as some worker finishes
+        results = queue.SimpleQueue()
+        # leaves submitted to the pool that were not processed yet
+        pending_leaves = {}
+        leaf_counter = itertools.count()
+        # policies of SAT leaves, to be indexed once the tree is complete
+        leaf_to_policy = {}
+        with multiprocessing.Pool(processes=SynthesizerPolicyTree.num_processes) as pool:
+            max_pending = 2*SynthesizerPolicyTree.num_processes
+            while undecided_leaves or pending_leaves:
+
+                # keep the workers busy
+                while undecided_leaves and len(pending_leaves) < max_pending:
+                    policy_tree_node = undecided_leaves.pop()
+                    family = policy_tree_node.family
+                    key = next(leaf_counter)
+                    pending_leaves[key] = policy_tree_node
+                    pool.apply_async(
+                        expand_leaf, (key, family.options_to_bytes(), family.candidate_policy),
+                        callback=results.put, error_callback=results.put
+                    )
+
+                result = results.get()
+                if isinstance(result, BaseException):
+                    logger.error("Worker sub-process encountered an error.")
+                    raise result
+                key,policy,splitter,suboptions,candidate_policies,iteration_counters = result
+                self.stat.add_iteration_counters(iteration_counters)
+                policy_tree_node = pending_leaves.pop(key)
+                family = policy_tree_node.family
+                family.candidate_policy = None
+
+                if policy is not None:
+                    self.explore(family)
+                    if policy is False:
+                        policy_tree_node.sat = False
+                    else:
+                        policy_tree_node.sat = True
+                        leaf_to_policy[policy_tree_node] = policy
+                        # the sub-MDP was built by the worker, post-processing needs the choices of the family
+                        family.selected_choices = self.quotient.select_compatible_choices(family)
+                    continue
+
+                # refine
+                subfamilies = family.split(splitter,suboptions)
+                for subfamily,candidate_policy in zip(subfamilies,candidate_policies):
+                    subfamily.candidate_policy = candidate_policy
+                policy_tree_node.split(splitter,suboptions,subfamilies)
+                undecided_leaves.push_subfamilies(policy_tree_node, policy_tree_node.child_nodes)
+
+        # index the policies in the order in which the (depth-first) sequential expansion finds them
+        nodes = [policy_tree.root]
+        while nodes:
+            node = nodes.pop()
+            if node.is_leaf:
+                if node.sat:
+                    node.policy_index = policy_tree.new_policy(leaf_to_policy[node])
+            else:
+                nodes.extend(node.child_nodes)
+
+    def evaluate_all(self, family, prop, keep_value_only=False):
+        assert not prop.reward, "expecting reachability probability propery"
+        game_solver = self.quotient.build_game_abstraction_solver(prop)
+        family.candidate_policy = None
+        policy_tree = PolicyTree(family)
+
+        if SynthesizerPolicyTree.num_processes > 1:
+            self.expand_leaves_parallel(policy_tree, game_solver, prop)
+        else:
+            self.expand_leaves(policy_tree, game_solver, prop)
 
         if SynthesizerPolicyTree.double_check_policy_tree_leaves:
             policy_tree.double_check(self.quotient, prop)
@@ -58,6 +58,10 @@ class Statistic:
         self.num_policies = None
         self.num_policies_merged = None
 
+        # hits and misses of the assignment result cache of the quotient when the synthesis started
+        self.cache_hits_start = 0
+        self.cache_misses_start = 0
+
         self.family_size = None
         self.synthesis_timer = paynt.utils.timer.Timer()
         self.status_horizon = Statistic.status_period_seconds
@@ -66,10 +70,18 @@ class Statistic:
     def start(self, family):
         logger.info("synthesis initiated, design space: {}".format(family.size_or_order))
         self.family_size = family.size
+        cache = self.assignment_result_cache
+        if cache is not None:
+            self.cache_hits_start = cache.hits
+            self.cache_misses_start = cache.misses
         self.synthesis_timer.start()
         if not self.synthesis_timer_total.running:
             self.synthesis_timer_total.start()
     
+    @property
+    def assignment_result_cache(self):
+        return getattr(self.quotient, "assignment_result_cache", None)
+
     def iteration(self, model):
         ''' Identify the type of the model and count corresponding iteration. '''
         if isinstance(model, paynt.models.models.Mdp):
@@ -102,6 +114,27 @@ class Statistic:
         self.acc_size_game += size_game
         self.print_status()
 
+    def iteration_counters(self):
+        ''' :return iteration counters that can be passed to add_iteration_counters() of another statistic '''
+        return (
+            self.iterations_dtmc, self.acc_size_dtmc, self.iterations_mdp, self.acc_size_mdp,
+            self.iterations_game, self.acc_size_game
+        )
+
+    def add_iteration_counters(self, counters):
+        ''' Account for iterations performed elsewhere, e.g. in a worker process. '''
+        iterations_dtmc, acc_size_dtmc, iterations_mdp, acc_size_mdp, iterations_game, acc_size_game = counters
+        if iterations_dtmc is not None:
+            self.iterations_dtmc = (self.iterations_dtmc or 0) + iterations_dtmc
+            self.acc_size_dtmc += acc_size_dtmc
+        if iterations_mdp is not None:
+            self.iterations_mdp = (self.iterations_mdp or 0) + iterations_mdp
+            self.acc_size_mdp += acc_size_mdp
+        if iterations_game is not None:
+            self.iterations_game = (self.iterations_game or 0) + iterations_game
+            self.acc_size_game += acc_size_game
+        self.print_status()
+
     def new_fsc_found(self, value, assignment, size):
         time_elapsed = round(self.synthesis_timer_total.read(),1)
         # print(f'new opt: {value}')
@@ -199,6 +232,14 @@ class Statistic:
             avg_size = round(safe_division(self.acc_size_dtmc, self.iterations_dtmc))
             type_stats = f"DTMC stats: avg DTMC size: {avg_size}, iterations: {self.iterations_dtmc}"
             iterations += f"{type_stats}\n"
+
+        cache = self.assignment_result_cache
+        if cache is not None:
+            hits = cache.hits - self.cache_hits_start
+            misses = cache.misses - self.cache_misses_start
+            if hits + misses > 0:
+                hit_rate = int(round(hits / (hits + misses) * 100, 0))
+                iterations += f"DTMC result cache: hits: {hits}, misses: {misses} ({hit_rate}% hit rate)\n"
         return iterations
 
     def get_summary_synthesis(self):
@@ -1,3 +1,4 @@
+import paynt.synthesizer.checkpoint
 import paynt.synthesizer.statistic
 import paynt.utils.timer
 
@@ -79,14 +80,22 @@ class Synthesizer:
         self.stat = None
         self.synthesis_timer = None
         self.explored = None
+        # union of explored assignments, used to count pruned assignments exactly if conflicts may overlap
+        self.explored_space = None
         self.best_assignment = None
         self.best_assignment_value = None
+        self.checkpoint = None
 
     @property
     def method_name(self):
         ''' to be overridden '''
         pass
 
+    @property
+    def supports_checkpoints(self):
+        ''' True if the synthesizer periodically writes checkpoints and can resume from them. '''
+        return False
+
     def time_limit_reached(self):
         if (self.synthesis_timer is not None and self.synthesis_timer.time_limit_reached()) or \
             paynt.utils.timer.GlobalTimer.time_limit_reached():
@@ -109,7 +118,25 @@ class Synthesizer:
             logger.debug(f"optimality threshold set to {optimum_threshold}")
 
     def explore(self, family):
-        self.explored += family.size
+        ''' :return the number of assignments of the family that were not explored before '''
+        if self.explored_space is not None:
+            pruned = self.explored_space.explore_family(family)
+        else:
+            pruned = family.size
+        self.explored += pruned
+        return pruned
+
+    def explore_conflicts(self, family, assignment, conflicts, pruning_estimate):
+        '''
+        :param pruning_estimate an estimate of pruned assignments used if explored assignments are not tracked
+        :return the number of assignments newly pruned by the conflicts
+        '''
+        if self.explored_space is not None:
+            pruned = self.explored_space.explore_conflicts(family, assignment, conflicts, pruning_estimate)
+        else:
+            pruned = pruning_estimate
+        self.explored += pruned
+        return pruned
 
     def evaluate_all(self, family, prop, keep_value_only=False):
         ''' to be overridden '''
@@ -179,7 +206,10 @@ class Synthesizer:
         self.synthesis_timer.start()
         self.stat = paynt.synthesizer.statistic.Statistic(self)
         self.explored = 0
+        self.explored_space = None
         self.stat.start(family)
+        self.checkpoint = paynt.synthesizer.checkpoint.Checkpoint(self)
+        self.checkpoint.resume_if_requested(family)
         self.synthesize_one(family)
         if self.best_assignment is not None and self.best_assignment.size > 1 and not return_all:
             self.best_assignment = self.best_assignment.pick_any()
@@ -189,6 +219,7 @@ class Synthesizer:
             logger.info(self.best_assignment)
 
         if self.best_assignment is not None and self.best_assignment.size == 1:
+            # the double-check must not rely on the assignment result cache
             dtmc = self.quotient.build_assignment(self.best_assignment)
             result = dtmc.check_specification(self.quotient.specification)
             logger.info(f"double-checking specification satisfiability: {result}")
@@ -1,17 +1,56 @@
+import paynt.family.frontier
 import paynt.quotient.posmg
 import paynt.synthesizer.synthesizer
 import paynt.quotient.pomdp
 import paynt.verification.property_result
+import paynt.utils.arrays
 
 import logging
 logger = logging.getLogger(__name__)
 
 class SynthesizerAR(paynt.synthesizer.synthesizer.Synthesizer):
 
+    # if True, model checking of subfamilies will be initialized using the results of the parent family
+    warm_start = False
+    # order in which undecided families are explored: "dfs", "bfs" or "best-first"
+    exploration_order = "dfs"
+    # if True, model checking of a family may terminate as soon as the value in the initial state decides the
+    #   property; values in other states (used for warm starts and hole scores) and schedulers may then be imprecise
+    bounded_model_checking = False
+
     @property
     def method_name(self):
         return "AR"
 
+    @property
+    def supports_checkpoints(self):
+        return True
+
+    def parent_state_values(self, family, index, alt=False):
+        '''
+        :return state values of the parent family wrt the property with the given index mapped onto the sub-MDP of
+            the family, or None if these are not available
+        :note the sub-MDP has fewer choices than the MDP of the parent family, so parent values are lower bounds
+            on the values of the sub-MDP only when minimizing; solvers such as optimistic value iteration must not
+            be initialized with values above the fixpoint, hence no values are provided when maximizing
+        '''
+        if not SynthesizerAR.warm_start or family.parent_info is None or family.parent_info.analysis_result is None:
+            return None
+        prop = self.quotient.specification.all_properties()[index]
+        minimizing = prop.minimizing if not alt else not prop.minimizing
+        if not minimizing:
+            return None
+        parent_result = family.parent_info.analysis_result
+        result = parent_result.property_result(index)
+        if result is None:
+            return None
+        result = result.primary if not alt else result.secondary
+        if result is None:
+            return None
+        return self.quotient.map_state_values(
+            parent_result.quotient_state_map, paynt.utils.arrays.check_result_values(result.result), family.mdp
+        )
+
     def check_specification(self, family):
         ''' Check specification for mdp or smg based on self.quotient '''
         mdp = family.mdp
@@ -32,8 +71,10 @@ class SynthesizerAR(paynt.synthesizer.synthesizer.Synthesizer):
             result = paynt.verification.property_result.MdpPropertyResult(constraint)
             results[index] = result
 
-            # check primary direction
-            result.primary = model.model_check_property(constraint)
+            # check primary direction; values are not needed if the primary direction is UNSAT
+            initial_values = self.parent_state_values(family, index)
+            bound = constraint.violation_bound() if SynthesizerAR.bounded_model_checking else None
+            result.primary = model.model_check_property_refined(constraint, initial_values=initial_values, bound=bound)
             if result.primary.sat is False:
                 result.sat = False
                 break
@@ -42,14 +83,17 @@ class SynthesizerAR(paynt.synthesizer.synthesizer.Synthesizer):
             result.primary_selection,consistent = self.quotient.scheduler_is_consistent(mdp, constraint, result.primary.result)
             if consistent:
                 assignment = family.assume_options_copy(result.primary_selection)
-                dtmc = self.quotient.build_assignment(assignment)
-                res = dtmc.check_specification(self.quotient.specification)
+                res,_ = self.quotient.check_assignment(assignment)
                 if res.accepting_dtmc(self.quotient.specification):
                     result.sat = True
                     admissible_assignment = assignment
 
             # primary direction is SAT: check secondary direction to see whether all SAT
-            result.secondary = model.model_check_property(constraint, alt=True)
+            initial_values = self.parent_state_values(family, index, alt=True)
+            bound = constraint.satisfaction_bound() if SynthesizerAR.bounded_model_checking else None
+            result.secondary = model.model_check_property_refined(
+                constraint, alt=True, initial_values=initial_values, bound=bound
+            )
             if mdp.is_deterministic and result.primary.value != result.secondary.value:
                 logger.warning("WARNING: model is deterministic but min<max")
             if result.secondary.sat:
@@ -65,7 +109,9 @@ class SynthesizerAR(paynt.synthesizer.synthesizer.Synthesizer):
             result = paynt.verification.property_result.MdpOptimalityResult(opt)
 
             # check primary direction
-            result.primary = model.model_check_property(opt)
+            initial_values = self.parent_state_values(family, len(spec.constraints))
+            bound = opt.violation_bound() if SynthesizerAR.bounded_model_checking else None
+            result.primary = model.model_check_property_refined(opt, initial_values=initial_values, bound=bound)
             if not result.primary.improves_optimum:
                 # OPT <= LB
                 result.can_improve = False
@@ -77,14 +123,14 @@ class SynthesizerAR(paynt.synthesizer.synthesizer.Synthesizer):
                     # LB < OPT and it's tight, double-check the constraints and the value on the DTMC
                     result.can_improve = False
                     assignment = family.assume_options_copy(result.primary_selection)
-                    dtmc = self.quotient.build_assignment(assignment)
-                    res = dtmc.check_specification(self.quotient.specification)
+                    res,_ = self.quotient.check_assignment(assignment)
                     if res.constraints_result.sat and spec.optimality.improves_optimum(res.optimality_result.value):
                         result.improving_assignment = assignment
                         result.improving_value = res.optimality_result.value
             spec_result.optimality_result = result
 
         spec_result.evaluate(family, admissible_assignment)
+        spec_result.quotient_state_map = mdp.quotient_state_map
         family.analysis_result = spec_result
 
     def verify_family(self, family):
@@ -97,6 +143,8 @@ class SynthesizerAR(paynt.synthesizer.synthesizer.Synthesizer):
             self.stat.iteration(family.mdp)
 
         self.check_specification(family)
+        if family.parent_info is not None:
+            family.parent_info.release_analysis_result()
 
     def update_optimum(self, family):
         ia = family.analysis_result.improving_assignment
@@ -115,12 +163,45 @@ class SynthesizerAR(paynt.synthesizer.synthesizer.Synthesizer):
         if isinstance(self.quotient, paynt.quotient.pomdp.PomdpQuotient):
             self.stat.new_fsc_found(family.analysis_result.improving_value, ia, self.quotient.policy_size(ia))
 
+    def split(self, family):
+        subfamilies = self.quotient.split(family)
+        if SynthesizerAR.warm_start:
+            for subfamily in subfamilies:
+                subfamily.parent_info.analysis_result = family.analysis_result
+        return subfamilies
+
+    def initial_families(self, family):
+        '''
+        Families to start the exploration with: either the given family or the families of a resumed checkpoint, in
+        which case the explored space of the checkpoint is restored as well.
+        :return an iterable of pairs (family, priority), where priority is None if not known
+        '''
+        checkpoint = self.checkpoint
+        if checkpoint is None or checkpoint.resumed_families is None:
+            return [(family,None)]
+        families = checkpoint.resumed_families
+        checkpoint.resumed_families = None
+        if checkpoint.resumed_explored_space is not None:
+            self.explored_space = checkpoint.resumed_explored_space
+            checkpoint.resumed_explored_space = None
+        return families
+
+    def choose_frontier(self, family):
+        return paynt.family.frontier.Frontier.choose_frontier(SynthesizerAR.exploration_order, family)
+
+    def create_frontier(self, family):
+        families = self.choose_frontier(family)
+        for initial_family,priority in self.initial_families(family):
+            families.push_with_priority(initial_family, priority)
+        return families
+
     def synthesize_one(self, family):
-        families = [family]
+        families = self.create_frontier(family)
         while families:
             if self.resource_limit_reached():
                 break
-            family = families.pop(-1)
+            self.checkpoint.update(families)
+            family = families.pop()
             self.verify_family(family)
             self.update_optimum(family)
             if not self.quotient.specification.has_optimality and self.best_assignment is not None:
@@ -130,6 +211,6 @@ class SynthesizerAR(paynt.synthesizer.synthesizer.Synthesizer):
                 self.explore(family)
                 continue
             # undecided
-            subfamilies = self.quotient.split(family)
-            families = families + subfamilies
+            subfamilies = self.split(family)
+            families.push_subfamilies(family, subfamilies)
         return self.best_assignment
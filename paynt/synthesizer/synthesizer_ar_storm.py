@@ -32,6 +32,10 @@ class SynthesizerARStorm(paynt.synthesizer.synthesizer_ar.SynthesizerAR):
     def method_name(self):
         return "AR"
 
+    @property
+    def supports_checkpoints(self):
+        return False
+
     # performs splitting in family according to Storm result
     # main families contain only those actions that were considered by best found Storm FSC
     def storm_split(self, families):
@@ -1,16 +1,51 @@
 import paynt.synthesizer.synthesizer
+import paynt.synthesizer.statistic
 import paynt.synthesizer.conflict_generator.dtmc
 import paynt.synthesizer.conflict_generator.mdp
 import paynt.family.smt
+import paynt.family.explored_space
+
+import collections
+import multiprocessing
+import queue
 
 import logging
 logger = logging.getLogger(__name__)
 
 
+# global variables for the pipelined mode
+# when a new process is spawned (forked), it will inherit these variables from the parent
+pipeline_synthesizer = None
+pipeline_family = None
+
+def analyze_assignment(assignment_bytes, optimum):
+    '''
+    Build and model check the DTMC of the assignment and construct conflicts.
+    :param optimum current optimum known to the main process
+    :return a tuple (assignment,conflicts,accepting,optimum,iteration counters)
+    :note errors are not caught here: the pool passes them to the error callback of the main process
+    '''
+    synthesizer = pipeline_synthesizer
+    specification = synthesizer.quotient.specification
+    if optimum is not None and specification.optimality.improves_optimum(optimum):
+        specification.optimality.update_optimum(optimum)
+    # fresh statistic to collect iterations performed by this worker
+    synthesizer.stat = paynt.synthesizer.statistic.Statistic(synthesizer)
+    assignment = pipeline_family.assume_options_bytes_copy(assignment_bytes)
+    conflicts,accepting_assignment = synthesizer.analyze_family_assignment_cegis(pipeline_family, assignment)
+    optimum = specification.optimality.optimum if specification.has_optimality else None
+    accepting = accepting_assignment is not None
+    return (assignment_bytes, conflicts, accepting, optimum, synthesizer.stat.iteration_counters())
+
+
 class SynthesizerCEGIS(paynt.synthesizer.synthesizer.Synthesizer):
 
     # CLI argument selecting conflict generator
     conflict_generator_type = None
+    # number of processes analyzing candidate assignments, 1 for the sequential CEGIS loop
+    num_processes = 1
+    # number of candidate assignments proposed ahead per process
+    candidates_per_process = 2
 
     def __init__(self, quotient):
         super().__init__(quotient)
@@ -66,9 +101,9 @@ class SynthesizerCEGIS(paynt.synthesizer.synthesizer.Synthesizer):
         """
         assert family.mdp is not None, "analyzed family does not have an associated quotient MDP"
 
-        dtmc = self.quotient.build_assignment(assignment)
-        self.stat.iteration(dtmc)
-        result = dtmc.check_specification(self.quotient.specification, family.constraint_indices, short_evaluation=True)
+        result,dtmc = self.quotient.check_assignment(assignment, family.constraint_indices, short_evaluation=True)
+        if dtmc is not None:
+            self.stat.iteration(dtmc)
         # analyze model checking results
         accepting_assignment = None
         accepting,improving_value = result.accepting_dtmc(self.quotient.specification)
@@ -76,15 +111,100 @@ class SynthesizerCEGIS(paynt.synthesizer.synthesizer.Synthesizer):
             accepting_assignment = assignment
         if improving_value is not None:
             self.quotient.specification.optimality.update_optimum(improving_value)
-        if accepting and not self.quotient.specification.can_be_improved():
+        if accepting and not self.quotient.specification.can_be_improved:
             return [], accepting_assignment
 
         conflict_requests = self.collect_conflict_requests(family, result)
+        if dtmc is None:
+            # all results were cached, but the DTMC is needed to construct counterexamples
+            dtmc = self.quotient.build_assignment(assignment)
         conflicts = self.conflict_generator.construct_conflicts(family, assignment, dtmc, conflict_requests)
 
         return conflicts, accepting_assignment
 
 
+    @staticmethod
+    def conflict_excludes(conflict, conflict_assignment, assignment):
+        ''' :return True if the conflict constructed for the first assignment excludes the second one '''
+        return all(
+            [assignment.hole_options(hole)[0] == conflict_assignment.hole_options(hole)[0] for hole in conflict]
+        )
+
+    def synthesize_one_pipelined(self, family, smt_solver):
+        '''
+        CEGIS loop where candidate assignments are analyzed by a pool of processes. While workers build and model
+        check DTMCs and construct conflicts, this process proposes next candidates and excludes conflicts as soon as
+        they arrive. Proposed candidates that are excluded by a newly arrived conflict are dropped.
+        '''
+        global pipeline_synthesizer, pipeline_family
+        pipeline_synthesizer = self
+        pipeline_family = family
+        specification = self.quotient.specification
+        all_holes = list(range(family.num_holes))
+
+        # candidates that were proposed but not yet submitted
+        candidates = collections.deque()
+        # results are collected by the pool's result handler as soon as some worker finishes
+        results = queue.SimpleQueue()
+        num_pending = 0
+        assignments_exhausted = False
+        with multiprocessing.Pool(processes=SynthesizerCEGIS.num_processes) as pool:
+            max_candidates = SynthesizerCEGIS.num_processes * SynthesizerCEGIS.candidates_per_process
+            while True:
+                if self.resource_limit_reached():
+                    break
+
+                # propose next candidates, exclude each candidate right away so that it is not proposed again
+                while not assignments_exhausted and len(candidates) + num_pending < max_candidates:
+                    assignment = smt_solver.pick_assignment(family)
+                    if assignment is None:
+                        assignments_exhausted = True
+                        break
+                    smt_solver.exclude_conflict(family, assignment, all_holes)
+                    candidates.append(assignment)
+
+                # keep the workers busy
+                while candidates and num_pending < SynthesizerCEGIS.num_processes:
+                    optimum = specification.optimality.optimum if specification.has_optimality else None
+                    pool.apply_async(
+                        analyze_assignment, (candidates.popleft().options_to_bytes(), optimum),
+                        callback=results.put, error_callback=results.put
+                    )
+                    num_pending += 1
+                if num_pending == 0:
+                    break
+
+                result = results.get()
+                num_pending -= 1
+                if isinstance(result, BaseException):
+                    logger.error("Worker sub-process encountered an error.")
+                    raise result
+                assignment_bytes,conflicts,accepting,optimum,iteration_counters = result
+                self.stat.add_iteration_counters(iteration_counters)
+                assignment = family.assume_options_bytes_copy(assignment_bytes)
+                if not specification.has_optimality:
+                    if accepting:
+                        self.best_assignment = assignment
+                        break
+                elif optimum is not None and specification.optimality.improves_optimum(optimum):
+                    # the worker was given an older optimum, so its assignment may be accepting only wrt that one
+                    specification.optimality.update_optimum(optimum)
+                    if accepting:
+                        self.best_assignment = assignment
+                        self.best_assignment_value = optimum
+                    if not specification.can_be_improved:
+                        break
+
+                pruned = smt_solver.exclude_conflicts(family, assignment, conflicts)
+                self.explore_conflicts(family, assignment, conflicts, pruned)
+                # drop candidates excluded by the new conflicts
+                candidates = collections.deque([
+                    candidate for candidate in candidates
+                    if not any([self.conflict_excludes(conflict, assignment, candidate) for conflict in conflicts])
+                ])
+
+        return self.best_assignment
+
     def synthesize_one(self, family):
 
         # build the quotient, map mdp states to hole indices
@@ -93,6 +213,11 @@ class SynthesizerCEGIS(paynt.synthesizer.synthesizer.Synthesizer):
 
         # use sketch design space as a SAT baseline (TODO why?)
         smt_solver = paynt.family.smt.SmtSolver(self.quotient.family)
+        # conflicts may overlap: count pruned assignments exactly
+        self.explored_space = paynt.family.explored_space.ExploredSpace(family)
+
+        if SynthesizerCEGIS.num_processes > 1:
+            return self.synthesize_one_pipelined(family, smt_solver)
         
         # CEGIS loop
         assignment = smt_solver.pick_assignment(family)
@@ -101,11 +226,11 @@ class SynthesizerCEGIS(paynt.synthesizer.synthesizer.Synthesizer):
             conflicts, accepting_assignment = self.analyze_family_assignment_cegis(family, assignment)
             if accepting_assignment is not None:
                 self.best_assignment = accepting_assignment
-                if not self.quotient.specification.can_be_improved():
+                if not self.quotient.specification.can_be_improved:
                     return self.best_assignment
 
             pruned = smt_solver.exclude_conflicts(family, assignment, conflicts)
-            self.explored += pruned
+            self.explore_conflicts(family, assignment, conflicts, pruned)
             
             # construct next assignment
             assignment = smt_solver.pick_assignment(family)
@@ -2,9 +2,13 @@ import paynt.synthesizer.synthesizer
 import paynt.synthesizer.synthesizer_ar
 import paynt.synthesizer.synthesizer_cegis
 
+import paynt.family.frontier
 import paynt.family.smt
+import paynt.family.explored_space
 import paynt.utils.timer
 
+import math
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,14 @@ class StageControl:
     only_cegis = False
     # whether adaptive hybrid is enabled
     adaptive_hybrid = True
+    # time allocation strategy: "ratio" or "bandit"
+    scheduler = "ratio"
+
+    @staticmethod
+    def choose_stage_control(family_size):
+        if StageControl.scheduler == "bandit":
+            return StageControlBandit(family_size)
+        return StageControl(family_size)
 
     def __init__(self, family_size):
         # timings
@@ -36,6 +48,10 @@ class StageControl:
         # =1 is fair, >1 favours cegis, <1 favours ar
         self.cegis_efficiency = 1
 
+    def start_family(self, family):
+        ''' Called before the analysis of the family starts. '''
+        pass
+
     def start_ar(self):
         self.timer_cegis.stop()
         self.timer_ar.start()
@@ -85,27 +101,148 @@ class StageControl:
         return False
 
 
+class StageControlBandit(StageControl):
+    '''
+    AR-CEGIS adaptivity where AR and CEGIS are treated as arms of a bandit rewarded by the fraction of the design
+    space pruned per second. Rewards are collected per family and are aggregated wrt. the context of the family (its
+    refinement depth and the binary order of magnitude of its size), older rewards are discounted. For each family, CEGIS time is allocated wrt. the ratio of an
+    optimistic estimate of the CEGIS pruning rate and the estimated AR pruning rate in the context of this family.
+    CEGIS time that was allocated to previous families but not used is carried over (discounted).
+    '''
+
+    # discount factor applied to older rewards
+    discount = 0.9
+    # weight of the exploration bonus of the optimistic estimate
+    exploration = 1
+    # bounds on the ratio of CEGIS time to AR time
+    min_ratio = 0.1
+    max_ratio = 10
+    # families with larger refinement depth share the same context
+    max_context = 8
+    # minimum (discounted) number of rewards in a context, otherwise rewards of all contexts are used
+    min_context_rewards = 2
+
+    ARMS = ["ar","cegis"]
+
+    def __init__(self, family_size):
+        super().__init__(family_size)
+        # for each context and for each arm, discounted sums of pruned fractions, of time and of the number of rewards
+        self.context_rewards = {}
+        self.context = None
+        # pruned fractions and time readings at the start of the current family
+        self.family_pruned = None
+        self.family_time = None
+        # ratio of CEGIS time to AR time for the current family
+        self.cegis_ratio = 1
+        # CEGIS time (in seconds) allocated to previous families but not used
+        self.cegis_credit = 0
+
+    def arm_rewards(self, context, arm):
+        if context not in self.context_rewards:
+            self.context_rewards[context] = {arm: [0,0,0] for arm in StageControlBandit.ARMS}
+        return self.context_rewards[context][arm]
+
+    def add_reward(self, context, arm, pruned, time):
+        rewards = self.arm_rewards(context, arm)
+        for index,value in enumerate([pruned,time,1]):
+            rewards[index] = rewards[index] * StageControlBandit.discount + value
+
+    def finish_family(self):
+        ''' Collect rewards of both arms for the family that was analyzed last. '''
+        if self.context is None:
+            return
+        pruned = {"ar": self.pruned_ar, "cegis": self.pruned_cegis}
+        for arm in StageControlBandit.ARMS:
+            arm_time = self.family_arm_time(arm)
+            if arm_time > 0:
+                self.add_reward(self.context, arm, pruned[arm] - self.family_pruned[arm], arm_time)
+        unused = self.family_arm_time("ar") * self.cegis_ratio - self.family_arm_time("cegis")
+        self.cegis_credit = max(0, self.cegis_credit * StageControlBandit.discount + unused)
+        self.context = None
+
+    def family_arm_time(self, arm):
+        ''' :return time spent by the arm on the current family '''
+        timer = self.timer_ar if arm == "ar" else self.timer_cegis
+        return timer.read() - self.family_time[arm]
+
+    def start_family(self, family):
+        self.finish_family()
+        self.context = (min(family.refinement_depth, StageControlBandit.max_context), family.size.bit_length())
+        self.family_pruned = {"ar": self.pruned_ar, "cegis": self.pruned_cegis}
+        self.family_time = {"ar": self.timer_ar.read(), "cegis": self.timer_cegis.read()}
+        self.cegis_ratio = self.estimate_cegis_ratio()
+
+    def rewards(self):
+        ''' :return rewards of both arms in the current context or, if it has too few rewards, in all contexts '''
+        rewards = {arm: self.arm_rewards(self.context, arm) for arm in StageControlBandit.ARMS}
+        if min([rewards[arm][2] for arm in StageControlBandit.ARMS]) >= StageControlBandit.min_context_rewards:
+            return rewards
+        return {
+            arm: [sum(values) for values in zip(*[arms[arm] for arms in self.context_rewards.values()])]
+            for arm in StageControlBandit.ARMS
+        }
+
+    def estimate_cegis_ratio(self):
+        ''' :return the ratio of CEGIS time to AR time for the current family '''
+        rewards = self.rewards()
+        pruned_ar,time_ar,count_ar = rewards["ar"]
+        pruned_cegis,time_cegis,count_cegis = rewards["cegis"]
+        if count_cegis == 0 or time_cegis == 0:
+            # CEGIS was not tried yet
+            return 1
+        if pruned_ar == 0:
+            return StageControlBandit.max_ratio
+        rate_ar = pruned_ar / time_ar
+        rate_cegis = pruned_cegis / time_cegis
+        # optimistic estimate of the CEGIS rate: the less CEGIS was tried, the larger the bonus
+        bonus = StageControlBandit.exploration * math.sqrt(math.log(count_ar + count_cegis + 1) / count_cegis)
+        ratio = rate_cegis * (1 + bonus) / rate_ar
+        return min(max(ratio, StageControlBandit.min_ratio), StageControlBandit.max_ratio)
+
+    def cegis_has_time(self):
+        if StageControl.only_ar:
+            return False
+        if StageControl.only_cegis:
+            return True
+        if self.family_arm_time("cegis") < self.family_arm_time("ar") * self.cegis_ratio + self.cegis_credit:
+            return True
+        self.timer_cegis.stop()
+        return False
+
+
 class SynthesizerHybrid(paynt.synthesizer.synthesizer_ar.SynthesizerAR, paynt.synthesizer.synthesizer_cegis.SynthesizerCEGIS):
 
     @property
     def method_name(self):
         return "hybrid"
 
+    def choose_frontier(self, family):
+        # SMT solver scopes are reset wrt. the refinement depth of the explored family, which assumes that the family
+        #   is a descendant of the previously explored one or of one of its ancestors
+        exploration_order = paynt.synthesizer.synthesizer_ar.SynthesizerAR.exploration_order
+        if exploration_order != "dfs":
+            logger.warning(f"hybrid synthesis supports only the depth-first exploration, ignoring {exploration_order}")
+        return paynt.family.frontier.Frontier.choose_frontier("dfs", family)
+
     def synthesize_one(self, family):
 
         self.conflict_generator.initialize()
         smt_solver = paynt.family.smt.SmtSolver(self.quotient.family)
+        # CEGIS conflicts overlap with each other and with families pruned by AR: count pruned assignments exactly
+        self.explored_space = paynt.family.explored_space.ExploredSpace(family)
 
         # AR-CEGIS loop
-        families = [family]
-        self.stage_control = StageControl(family.size)
+        families = self.create_frontier(family)
+        self.stage_control = StageControl.choose_stage_control(family.size)
         while families:
 
             # initiate AR analysis
             self.stage_control.start_ar()
+            self.checkpoint.update(families)
             
             # choose family
-            family = families.pop(-1)
+            family = families.pop()
+            self.stage_control.start_family(family)
 
             # reset SMT solver level
             smt_solver.level(family.refinement_depth)
@@ -114,8 +251,8 @@ class SynthesizerHybrid(paynt.synthesizer.synthesizer_ar.SynthesizerAR, paynt.sy
             self.verify_family(family)
             self.update_optimum(family)
             if family.analysis_result.can_improve == False:
-                self.explore(family)
-                self.stage_control.prune_ar(family.size)
+                pruned = self.explore(family)
+                self.stage_control.prune_ar(pruned)
                 continue
 
             # undecided: initiate CEGIS analysis
@@ -144,7 +281,7 @@ class SynthesizerHybrid(paynt.synthesizer.synthesizer_ar.SynthesizerAR, paynt.sy
                 
                 conflicts, accepting_assignment = self.analyze_family_assignment_cegis(family, assignment)
                 pruned = smt_solver.exclude_conflicts(family, assignment, conflicts)
-                self.explored += pruned
+                pruned = self.explore_conflicts(family, assignment, conflicts, pruned)
                 self.stage_control.prune_cegis(pruned)
 
                 if accepting_assignment is not None:
@@ -155,9 +292,11 @@ class SynthesizerHybrid(paynt.synthesizer.synthesizer_ar.SynthesizerAR, paynt.sy
                 # assignment is UNSAT: move on to the next assignment
 
             if family_explored:
+                # all members were pruned by conflicts, the family only needs to be forgotten
+                self.stage_control.prune_cegis(self.explore(family))
                 continue
         
-            subfamilies = self.quotient.split(family)
-            families = families + subfamilies
+            subfamilies = self.split(family)
+            families.push_subfamilies(family, subfamilies)
 
         return self.best_assignment
@@ -1,8 +1,11 @@
 from paynt.synthesizer.synthesizer import Synthesizer
 from paynt.synthesizer.synthesizer_ar import SynthesizerAR
+import paynt.family.frontier
 
 import os
-import time
+import gc
+import math
+import queue
 import multiprocessing
 
 import logging
@@ -13,52 +16,81 @@ import cProfile, pstats
 
 # global variables
 # when a new process is spawned (forked), it will inherit these variables from the parent
-quotient = None
+synthesizer = None
 profiler = None
+# current optimum shared among all processes, NaN if not set
+shared_optimum = None
 
 # helper functions for family serialization
-def family_to_hole_options(family):
-    return [family.hole_options(hole) for hole in range(family.num_holes)]
+def family_to_bytes(family):
+    return family.options_to_bytes()
 
-def hole_options_to_family(hole_options):
-    family = quotient.family.copy()
-    for hole,options in enumerate(hole_options):
-        family.hole_set_options(hole,options)
-    return family
+def bytes_to_family(data):
+    return synthesizer.quotient.family.assume_options_bytes_copy(data)
 
 
-def solve_family(args):
+def synchronize_optimum():
+    ''' Adopt the shared optimum if it improves the optimum known to this process. '''
+    optimality = synthesizer.quotient.specification.optimality
+    with shared_optimum.get_lock():
+        optimum = shared_optimum.value
+    if math.isnan(optimum):
+        return
+    if optimality.improves_optimum(optimum):
+        optimality.update_optimum(optimum)
+
+def publish_optimum(value):
+    ''' Store the value in the shared memory if it improves the shared optimum. '''
+    optimality = synthesizer.quotient.specification.optimality
+    value = float(value)
+    with shared_optimum.get_lock():
+        if math.isnan(shared_optimum.value) or optimality.op(value, shared_optimum.value):
+            shared_optimum.value = value
+
+
+def solve_family(family_bytes):
     '''
     Build the quotient, analyze it and, if necessary, split into subfamilies.
     '''
     try:
 
-        if args is None:
+        if family_bytes is None:
             pstats.Stats(profiler).sort_stats('tottime').print_stats(10)
             return
 
-        hole_options, optimum = args
         # re-construct the family
-        family = hole_options_to_family(hole_options)
+        family = bytes_to_family(family_bytes)
 
-        # synchronize optimum
-        if optimum is not None:
-            quotient.specification.optimality.optimum = optimum
+        quotient = synthesizer.quotient
+        has_optimality = quotient.specification.has_optimality
+        if has_optimality:
+            synchronize_optimum()
 
         quotient.build(family)
-        quotient.check_specification_for_mdp(family)
+        synthesizer.check_specification(family)
         res = family.analysis_result
         improving_value = res.improving_value
         improving_assignment = res.improving_assignment
         if improving_assignment is not None:
-            improving_assignment = family_to_hole_options(improving_assignment)
+            improving_assignment = family_to_bytes(improving_assignment)
+        if has_optimality and improving_value is not None:
+            # let other processes know about the improvement right away
+            publish_optimum(improving_value)
 
         subfamilies = []
+        subfamilies_size = 0
+        # the main process does not have the analyzed family, so it receives the priority of its subfamilies instead
+        priority = None
         if res.can_improve:
+            priority = paynt.family.frontier.FrontierBestFirst.family_priority(family)
             subfamilies = quotient.split(family)
-            subfamilies = [ family_to_hole_options(family) for family in subfamilies ]
+            subfamilies_size = sum([subfamily.size for subfamily in subfamilies])
+            subfamilies = [ family_to_bytes(subfamily) for subfamily in subfamilies ]
 
-        return (family.mdp.states, improving_value, improving_assignment, subfamilies)
+        return (
+            family_bytes, family.mdp.states, family.size, improving_value, improving_assignment,
+            subfamilies, subfamilies_size, priority
+        )
 
     except:
         logger.error("Worker sub-process encountered an error.")
@@ -66,79 +98,120 @@ def solve_family(args):
 
 
 
+class FrontierSpillingEncoded(paynt.family.frontier.FrontierSpilling):
+    ''' Spilling frontier of families that are already encoded as option bitmasks. '''
+
+    def spill(self, family_bytes):
+        return family_bytes
+
+    def restore(self, family_bytes):
+        return family_bytes
+
+    def record_to_bytes(self, family_bytes):
+        return family_bytes
+
+
 class SynthesizerMultiCoreAR(SynthesizerAR):
 
+    # number of families submitted to the pool per process
+    tasks_per_process = 2
+
     @property
     def method_name(self):
         return "AR (multicore)"
 
+    def process_result(self, result, families):
+        '''
+        Process the result of a family analysis and add its subfamilies to the frontier.
+        :return True if synthesis can be terminated
+        '''
+        _, mdp_states, family_size, improving_value, improving_assignment, subfamilies, subfamilies_size, priority = result
+        self.stat.iteration_mdp(mdp_states)
+
+        spec = self.quotient.specification
+        if improving_assignment is not None:
+            if not spec.has_optimality:
+                self.best_assignment = bytes_to_family(improving_assignment)
+                return True
+            if spec.optimality.improves_optimum(improving_value):
+                spec.optimality.update_optimum(improving_value)
+                self.best_assignment = bytes_to_family(improving_assignment)
+                self.best_assignment_value = improving_value
+
+        # subfamilies are kept encoded until they are sent to a worker
+        self.explored += family_size - subfamilies_size
+        families.push_subfamilies_with_priority(priority, subfamilies)
+        return False
+
     def synthesize_one(self, family):
 
-        satisfying_assignment = None
-        families = [family]
+        global synthesizer, shared_optimum
+        synthesizer = self
+        shared_optimum = multiprocessing.Value("d", math.nan)
+        spec = self.quotient.specification
+        if spec.has_optimality and spec.optimality.optimum is not None:
+            shared_optimum.value = float(spec.optimality.optimum)
 
-        global quotient
-        quotient = self.quotient
         profiling = False
         if profiling:
             global profiler
             profiler = cProfile.Profile()
             profiler.enable()
 
+        # families in the frontier are kept encoded
+        families = self.choose_frontier(family)
+        if isinstance(families, paynt.family.frontier.FrontierSpilling):
+            families = FrontierSpillingEncoded(family)
+        for initial_family,priority in self.initial_families(family):
+            families.push_with_priority(family_to_bytes(initial_family), priority)
+        # results are collected by the pool's result handler as soon as some worker finishes
+        results = queue.SimpleQueue()
+        # families submitted to the pool that were not processed yet
+        pending_families = set()
+
+        # the quotient is shared with the workers via copy-on-write: move all objects to the permanent generation so
+        # that garbage collection in the workers does not touch (and therefore copy) the inherited memory pages
+        # note: this only avoids copies caused by the garbage collector; the effect on per-worker RSS was not measured
+        #   and pages touched by reference counting are still copied, so RSS is not guaranteed to stay flat
+        # note: the quotient is not exported into a shared-memory buffer, since workers need stormpy models to
+        #   construct sub-MDPs and to model check them
+        gc.collect()
+        gc.freeze()
+
         # create a pool of processes
         # by default, os.cpu_count() processes will be spawned
         with multiprocessing.Pool(
             # processes=1
         ) as pool:
 
-            while families:
-
-                # get current optimum
-                optimum = None
-                if self.quotient.specification.has_optimality:
-                    optimum = self.quotient.specification.optimality.optimum
-
-                # work with some number of families
-                # print("submitting ", len(families), " families")
-
-                split = os.cpu_count() * 1
-                input_families = families[-split:]
-                input_families_size = sum([family.size for family in input_families])
-                remaining_families = families[:-split]
-                input_families = [family_to_hole_options(family) for family in input_families]
-
-                inputs = zip(input_families, [optimum] * len(input_families))
-
-                results = pool.map(solve_family, inputs)
-                # results = pool.imap_unordered(solve_family, inputs, chunksize=10)
-                # results = pool.map(solve_batch, inputs)
-
-                # process the results
-                new_families = []
-                for r in results:
-                    if r is None:
-                        logger.error("Worker sub-process encountered an error.")
-                        exit()
-                    mdp_states, improving_value, improving_assignment, subfamilies_hole_options = r
-                    self.stat.iteration_mdp(mdp_states)
-
-                    if improving_value is not None:
-                        if self.quotient.specification.optimality.improves_optimum(improving_value):
-                            self.quotient.specification.optimality.update_optimum(improving_value)
-                            improving_assignment = hole_options_to_family(improving_assignment)
-                            satisfying_assignment = improving_assignment
-
-                    subfamilies = [hole_options_to_family(hole_options) for hole_options in subfamilies_hole_options]
-                    new_families += subfamilies
-
-                new_families_size = sum([family.size for family in new_families])
-                self.explored += input_families_size-new_families_size
-
-                families = remaining_families + new_families
+            max_pending = os.cpu_count() * SynthesizerMultiCoreAR.tasks_per_process
+            while families or pending_families:
+                if self.resource_limit_reached():
+                    break
+                self.checkpoint.update(families, pending_families)
+
+                # keep the workers busy
+                while families and len(pending_families) < max_pending:
+                    family_bytes = families.pop()
+                    pending_families.add(family_bytes)
+                    pool.apply_async(
+                        solve_family, (family_bytes,),
+                        callback=results.put, error_callback=lambda error: results.put(None)
+                    )
+
+                # process results one by one as they arrive
+                result = results.get()
+                if result is None:
+                    logger.error("Worker sub-process encountered an error.")
+                    exit()
+                pending_families.remove(result[0])
+                if self.process_result(result, families):
+                    break
 
             if profiling:
                 pool.apply(solve_family, (None,))
+        gc.unfreeze()
 
         if profiling:
             pstats.Stats(profiler).sort_stats('tottime').print_stats(10)
-        return satisfying_assignment
+        return self.best_assignment
@@ -1,18 +1,135 @@
 import paynt.synthesizer.synthesizer
+import paynt.quotient.quotient
+import paynt.verification.property
+
+import payntbind
+
+import math
 
 import logging
 logger = logging.getLogger(__name__)
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
 class SynthesizerOneByOne(paynt.synthesizer.synthesizer.Synthesizer):
-    
+
+    # number of family members model checked natively in one batch
+    native_batch_size = 1000
+    # if True, members will be enumerated in the Gray-code order: only choices of states affected by the changed hole
+    #   are re-selected and model checking is initialized with the state values of the previous member
+    gray_code_order = False
+
     @property
     def method_name(self):
         return "1-by-1"
 
+    def native_enumeration_supported(self):
+        ''' Members of DTMC sketches can be enumerated and model checked natively in payntbind. '''
+        return numpy is not None and type(self.quotient) is paynt.quotient.quotient.Quotient \
+            and not self.quotient.quotient_mdp.is_exact
+
+    @staticmethod
+    def member_combination(family, member):
+        ''' :return the hole combination of the member with the given index in family.all_combinations() '''
+        combination = []
+        for hole in reversed(range(family.num_holes)):
+            options = family.hole_options(hole)
+            member,option_index = divmod(member, len(options))
+            combination.append(options[option_index])
+        return reversed(combination)
+
+    @staticmethod
+    def satisfies_threshold_mask(prop, values):
+        ''' Vectorized version of Property.satisfies_threshold. '''
+        mask = prop.op(values, prop.threshold)
+        if prop.reward:
+            mask &= values != math.inf
+        return mask
+
+    def verify_members_native(self, family, formulae):
+        '''
+        Model check all members of the family natively, in batches.
+        :return a generator of pairs (array of lexicographic indices of members of the batch, members x formulae
+            array of values)
+        '''
+        if SynthesizerOneByOne.gray_code_order:
+            yield from self.verify_members_native_gray_code(family, formulae)
+            return
+        family_size = family.size
+        for first_member in range(0, family_size, SynthesizerOneByOne.native_batch_size):
+            if self.resource_limit_reached():
+                return
+            num_members = min(SynthesizerOneByOne.native_batch_size, family_size-first_member)
+            values,member_states = payntbind.synthesis.verify_family_members(
+                paynt.verification.property.Property.environment, self.quotient.quotient_mdp, self.quotient.coloring,
+                family.family, formulae, first_member, num_members
+            )
+            for states in member_states:
+                self.stat.iteration_dtmc(int(states))
+            self.explored += num_members
+            yield numpy.arange(first_member, first_member+num_members),values
+
+    def verify_members_native_gray_code(self, family, formulae):
+        checker = payntbind.synthesis.GrayCodeMemberChecker(
+            self.quotient.quotient_mdp, self.quotient.coloring, family.family, formulae
+        )
+        while not checker.finished:
+            if self.resource_limit_reached():
+                return
+            values,member_indices,member_states = checker.check_next_members(
+                paynt.verification.property.Property.environment, SynthesizerOneByOne.native_batch_size
+            )
+            for states in member_states:
+                self.stat.iteration_dtmc(int(states))
+            self.explored += len(member_indices)
+            yield member_indices,values
+
+    def synthesize_one_native(self, family):
+        spec = self.quotient.specification
+        formulae = [prop.formula for prop in spec.constraints]
+        if spec.has_optimality:
+            formulae.append(spec.optimality.formula)
+
+        for member_indices,values in self.verify_members_native(family, formulae):
+            accepting = numpy.ones(values.shape[0], dtype=bool)
+            for index,prop in enumerate(spec.constraints):
+                accepting &= SynthesizerOneByOne.satisfies_threshold_mask(prop, values[:,index])
+            accepting_members = numpy.flatnonzero(accepting)
+            if accepting_members.size == 0:
+                continue
+
+            if not spec.has_optimality:
+                member = int(member_indices[accepting_members[0]])
+                self.best_assignment = family.construct_assignment(self.member_combination(family, member))
+                return self.best_assignment
+
+            # the best accepting member of this batch
+            optimality_values = values[accepting_members,-1]
+            if spec.optimality.minimizing:
+                best = accepting_members[numpy.argmin(optimality_values)]
+            else:
+                best = accepting_members[numpy.argmax(optimality_values)]
+            improving_value = float(values[best,-1])
+            if spec.optimality.improves_optimum(improving_value):
+                member = int(member_indices[best])
+                self.best_assignment = family.construct_assignment(self.member_combination(family, member))
+                self.best_assignment_value = improving_value
+                spec.optimality.update_optimum(improving_value)
+                if not spec.can_be_improved:
+                    return self.best_assignment
+
+        return self.best_assignment
+
     def synthesize_one(self, family):
-        
+        if self.native_enumeration_supported():
+            return self.synthesize_one_native(family)
+
         for hole_combination in family.all_combinations():
-            
+
             assignment = family.construct_assignment(hole_combination)
             dtmc = self.quotient.build_assignment(assignment)
             self.stat.iteration(dtmc)
@@ -25,7 +142,7 @@ class SynthesizerOneByOne(paynt.synthesizer.synthesizer.Synthesizer):
             if improving_value is not None:
                 self.quotient.specification.optimality.update_optimum(improving_value)
             if accepting and not self.quotient.specification.can_be_improved:
-                return accepting_assignment
+                return self.best_assignment
 
         return self.best_assignment
 
@@ -35,6 +152,14 @@ class SynthesizerOneByOne(paynt.synthesizer.synthesizer.Synthesizer):
             logger.debug("forcing keep_value_only=True for the one-by-one evaluation")
             keep_value_only = True
 
+        if self.native_enumeration_supported():
+            # values are stored in the order of family.all_combinations(), members not evaluated remain None
+            evaluations = [None] * family.size
+            for member_indices,values in self.verify_members_native(family, [prop.formula]):
+                for member,value in zip(member_indices.tolist(), values[:,0].tolist()):
+                    evaluations[member] = value
+            return evaluations
+
         evaluations = []
         for hole_combination in family.all_combinations():
             assignment = family.construct_assignment(hole_combination)
@@ -0,0 +1,62 @@
+'''
+Read-only NumPy views of vectors owned by stormpy and payntbind objects. NumPy is an optional dependency: if it is not
+available, the vectors are copied into lists instead.
+'''
+import stormpy
+import payntbind
+
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def check_result_values(result):
+    ''' :return state values of the quantitative check result '''
+    if numpy is None or not isinstance(result, stormpy.ExplicitQuantitativeCheckResult):
+        return list(result.get_values())
+    return payntbind.synthesis.checkResultValuesView(result)
+
+def submodel_mappings(submodel_construction, exact=False):
+    ''' :return new-to-old state and action mappings of the submodel construction '''
+    if numpy is None:
+        return submodel_construction.new_to_old_state_mapping, submodel_construction.new_to_old_action_mapping
+    if exact:
+        return payntbind.synthesis.submodelStateMappingViewExact(submodel_construction), \
+            payntbind.synthesis.submodelActionMappingViewExact(submodel_construction)
+    return payntbind.synthesis.submodelStateMappingView(submodel_construction), \
+        payntbind.synthesis.submodelActionMappingView(submodel_construction)
+
+def memory_unfolder_choice_map(memory_unfolder):
+    if numpy is None:
+        return memory_unfolder.choice_map
+    return memory_unfolder.choice_map_view
+
+def compose(outer_map, inner_map):
+    ''' :return the mapping i -> outer_map[inner_map[i]] '''
+    if numpy is None or not isinstance(inner_map, numpy.ndarray):
+        return [outer_map[index] for index in inner_map]
+    return numpy.asarray(outer_map)[inner_map]
+
+def remap_values(values, source_map, target_map, size):
+    '''
+    Map values indexed via the source map onto indices of the target map.
+    :param size size of the common index space of both maps
+    :return the mapped values, or None if some value of the target is not defined or infinite
+    '''
+    if numpy is None or not isinstance(values, numpy.ndarray):
+        mapped_values = [None] * size
+        for index,value in zip(source_map,values):
+            mapped_values[index] = value
+        target_values = [mapped_values[index] for index in target_map]
+        if None in target_values or math.inf in target_values:
+            return None
+        return target_values
+    mapped_values = numpy.full(size, numpy.nan)
+    mapped_values[numpy.asarray(source_map)] = values
+    target_values = mapped_values[numpy.asarray(target_map)]
+    if not numpy.isfinite(target_values).all():
+        return None
+    return target_values
@@ -59,19 +59,24 @@ class Property:
     environment = None
     # model checking precision
     model_checking_precision = 1e-4
+    # if set, families are first analyzed using this (coarser) precision, see Mdp.model_check_property_refined
+    coarse_model_checking_precision = None
+    # whether the environments use exact arithmetic
+    environment_use_exact = False
+    # for each precision other than the default one, a read-only environment that differs only in the precision
+    environment_with_precision = {}
 
-    @classmethod
-    def set_model_checking_precision(cls, precision):
-        cls.model_checking_precision = precision
-        payntbind.synthesis.set_precision_native(cls.environment.solver_environment.native_solver_environment, precision)
-        payntbind.synthesis.set_precision_minmax(cls.environment.solver_environment.minmax_solver_environment, precision)
+    @staticmethod
+    def set_environment_precision(environment, precision):
+        payntbind.synthesis.set_precision_native(environment.solver_environment.native_solver_environment, precision)
+        payntbind.synthesis.set_precision_minmax(environment.solver_environment.minmax_solver_environment, precision)
 
-    @classmethod
-    def initialize(cls, use_exact=False):
-        cls.environment = stormpy.Environment()
-        cls.set_model_checking_precision(cls.model_checking_precision)
+    @staticmethod
+    def create_environment(precision, use_exact=False):
+        environment = stormpy.Environment()
+        Property.set_environment_precision(environment, precision)
 
-        se = cls.environment.solver_environment
+        se = environment.solver_environment
         # se.set_linear_equation_solver_type(stormpy.EquationSolverType.native)
         # se.set_linear_equation_solver_type(stormpy.EquationSolverType.gmmxx)
         # se.set_linear_equation_solver_type(stormpy.EquationSolverType.eigen)
@@ -81,10 +86,71 @@ class Property:
             se.minmax_solver_environment.method = stormpy.MinMaxMethod.policy_iteration
         else:
             se.minmax_solver_environment.method = stormpy.MinMaxMethod.optimistic_value_iteration
+        return environment
+
+    @classmethod
+    def set_model_checking_precision(cls, precision):
+        cls.model_checking_precision = precision
+        cls.set_environment_precision(cls.environment, precision)
+
+    @classmethod
+    def initialize(cls, use_exact=False):
+        cls.environment_use_exact = use_exact
+        cls.environment = cls.create_environment(cls.model_checking_precision, use_exact)
+        cls.environment_with_precision = {}
 
     @classmethod
-    def model_check(cls, model, formula):
-        return stormpy.model_checking(model, formula, extract_scheduler=True, environment=cls.environment)
+    def get_environment(cls, precision=None):
+        '''
+        :param precision if set, an environment with this precision is returned; the shared environment is never
+            modified, so the precision can be chosen per call
+        '''
+        if precision is None or precision == cls.model_checking_precision:
+            return cls.environment
+        environment = cls.environment_with_precision.get(precision)
+        if environment is None:
+            # environments are never modified after creation, so a duplicate created concurrently is harmless
+            environment = cls.create_environment(precision, cls.environment_use_exact)
+            cls.environment_with_precision[precision] = environment
+        return environment
+
+    @classmethod
+    def model_check(
+        cls, model, formula, initial_values=None, model_checker=None, extract_scheduler=True, precision=None
+    ):
+        '''
+        :param initial_values if set, a vector of state values used to initialize the solver (MDPs only)
+        :param model_checker if set, payntbind.synthesis.MdpModelChecker of this model that shares preprocessing
+            among the calls
+        :param extract_scheduler if False, the scheduler might not be extracted
+        :param precision if set, model checking precision used for this call
+        '''
+        environment = cls.get_environment(precision)
+        if model_checker is not None:
+            result_hint = [] if initial_values is None else initial_values
+            return model_checker.check(environment, formula, extract_scheduler, result_hint)
+        if initial_values is None or model.is_exact or model.model_type != stormpy.ModelType.MDP:
+            return stormpy.model_checking(model, formula, extract_scheduler=True, environment=environment)
+        return payntbind.synthesis.verify_mdp(environment, model, formula, True, initial_values)
+
+    @classmethod
+    def model_check_with_bound(
+        cls, model_checker, formula, bound, initial_values=None, extract_scheduler=True, precision=None
+    ):
+        '''
+        Model check the formula using a solver that may terminate as soon as the value in the initial state meets
+        the bound; values in other states might then be imprecise.
+        :param model_checker payntbind.synthesis.MdpModelChecker of the model
+        :param bound a pair (comparison type, threshold)
+        :param precision if set, model checking precision used for this call
+        :return a pair (result,decided), where decided is True only if the environment uses a sound solver and the
+            bound is guaranteed to hold in the initial state
+        '''
+        comparison_type,threshold = bound
+        return model_checker.check_with_bound(
+            cls.get_environment(precision), formula, comparison_type, threshold, extract_scheduler,
+            [] if initial_values is None else initial_values
+        )
 
     @classmethod
     def compute_expected_visits(cls, model):
@@ -201,6 +267,31 @@ class Property:
     def satisfies_threshold_within_precision(self, value):
         return self.result_valid(value) and self.op(value, self.threshold_plus_precision)
 
+    def decision_within_precision(self, value, precision):
+        ''' :return True if a value computed with the given precision might be on the wrong side of the threshold '''
+        # the solver precision is relative by default, hence the band is widened for values greater than 1
+        return self.result_valid(value) and abs(value - self.threshold) <= precision * max(1, abs(value))
+
+    def satisfaction_bound(self):
+        ''' :return a pair (comparison type, threshold) met by values that satisfy the threshold '''
+        comparison_type = {
+            operator.lt: stormpy.ComparisonType.LESS,
+            operator.le: stormpy.ComparisonType.LEQ,
+            operator.gt: stormpy.ComparisonType.GREATER,
+            operator.ge: stormpy.ComparisonType.GEQ
+        }[self.op]
+        return comparison_type,self.threshold
+
+    def violation_bound(self):
+        ''' :return a pair (comparison type, threshold) met by values that violate the threshold '''
+        comparison_type = {
+            operator.lt: stormpy.ComparisonType.GEQ,
+            operator.le: stormpy.ComparisonType.GREATER,
+            operator.gt: stormpy.ComparisonType.LEQ,
+            operator.ge: stormpy.ComparisonType.LESS
+        }[self.op]
+        return comparison_type,self.threshold
+
     @property
     def can_be_improved(self):
         return False
@@ -311,6 +402,28 @@ class OptimalityProperty(Property):
     def satisfies_threshold(self, value):
         return self.result_valid(value) and self.meets_op(value, self.threshold)
 
+    def decision_within_precision(self, value, precision):
+        ''' :return True if a value computed with the given precision might be compared to the optimum incorrectly '''
+        if self.optimum is None or not self.result_valid(value):
+            return False
+        return abs(value - self.optimum) <= precision * max(1, abs(value))
+
+    def satisfaction_bound(self):
+        ''' :return a pair (comparison type, threshold), or None if no optimum has been found yet '''
+        if self.use_exact or self.optimum is None:
+            return None
+        return super().satisfaction_bound()
+
+    def violation_bound(self):
+        '''
+        :return a pair (comparison type, optimum) met by values that do not improve the optimum, or None if no
+            optimum has been found yet
+        '''
+        if self.use_exact or self.optimum is None:
+            return None
+        comparison_type = stormpy.ComparisonType.GEQ if self.minimizing else stormpy.ComparisonType.LEQ
+        return comparison_type,self.optimum
+
     def improves_optimum(self, value):
         return self.result_valid(value) and self.meets_op(value, self.optimum)
 
@@ -424,6 +537,7 @@ class Specification:
         # TODO
         pass
 
+    @property
     def can_be_improved(self):
         return any(prop.can_be_improved for prop in self.all_properties())
 
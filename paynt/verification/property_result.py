@@ -4,9 +4,13 @@ from paynt.verification.property import *
 
 
 class PropertyResult:
-    def __init__(self, prop, result, value):
+    def __init__(self, prop, result, value, decided_early=False):
         self.result = result
         self.value = value
+        # True if the value in the initial state is guaranteed to meet the bound passed to bounded model checking,
+        #   which is reported only by sound solvers; the value itself (and the values in other states) may be imprecise
+        #   since the solver may have terminated early
+        self.decided_early = decided_early
         self.sat = prop.satisfies_threshold(value)
         self.improves_optimum = None if not isinstance(prop,OptimalityProperty) else prop.improves_optimum(value)
 
@@ -108,6 +112,14 @@ class MdpSpecificationResult(SpecificationResult):
 
     def __init__(self):
         super().__init__()
+        # sub- to full state mapping of the analyzed sub-MDP
+        self.quotient_state_map = None
+
+    def property_result(self, index):
+        ''' Get result for the property with the given index, optimality property is indexed after the constraints. '''
+        if index < len(self.constraints_result.results):
+            return self.constraints_result.results[index]
+        return self.optimality_result
 
     def evaluate(self, family=None, admissible_assignment=None):
         self.improving_assignment = None
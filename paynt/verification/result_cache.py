@@ -0,0 +1,56 @@
+import collections
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class AssignmentResultCache:
+    '''
+    LRU cache of model checking results of DTMCs induced by hole assignments. For each assignment, the values of the
+    checked properties are stored (the optimality property is indexed after the constraints); the verdicts are
+    re-evaluated upon each lookup since thresholds and optimum may have changed since.
+    :note the cache is cleared whenever the specification or the coloring of the quotient changes
+    '''
+
+    # maximum number of assignments stored, 0 disables caching
+    capacity = 1000
+
+    def __init__(self):
+        # for each assignment (encoded via options_to_bytes()), a map from property index to its value
+        self.entries = collections.OrderedDict()
+        self.specification = None
+        self.coloring = None
+        self.hits = 0
+        self.misses = 0
+
+    def validate(self, specification, coloring):
+        ''' Clear the cache if it was populated for a different specification or design space. '''
+        if specification is self.specification and coloring is self.coloring:
+            return
+        self.entries.clear()
+        self.specification = specification
+        self.coloring = coloring
+
+    def lookup(self, key):
+        ''' :return a map from property index to its value (empty if the assignment was not checked before) '''
+        property_values = self.entries.get(key)
+        if property_values is None:
+            return {}
+        self.entries.move_to_end(key)
+        return property_values
+
+    def store(self, key, property_values, hit):
+        '''
+        :param property_values values of all properties of the assignment checked so far
+        :param hit True if no property had to be model checked
+        '''
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if AssignmentResultCache.capacity <= 0:
+            return
+        self.entries[key] = property_values
+        self.entries.move_to_end(key)
+        while len(self.entries) > AssignmentResultCache.capacity:
+            self.entries.popitem(last=False)
@@ -0,0 +1,101 @@
+#pragma once
+
+#include <cstdint>
+#include <span>
+#include <utility>
+#include <vector>
+
+namespace synthesis {
+
+/**
+ * Compressed (CSR-style) storage of a list of variable-length rows: entries of all rows are stored contiguously in a
+ * single data vector, row i occupying the range [offsets[i],offsets[i+1]). Compared to a vector of vectors, this
+ * avoids per-row allocations, which dominate the memory footprint when rows are short and numerous (e.g. one row per
+ * choice of a quotient).
+ */
+template<typename T>
+class CompressedRows {
+public:
+
+    CompressedRows() : offsets(1,0) {}
+
+    CompressedRows(std::vector<std::vector<T>> const& rows) : offsets(1,0) {
+        uint64_t num_entries = 0;
+        for(auto const& row: rows) {
+            num_entries += row.size();
+        }
+        offsets.reserve(rows.size()+1);
+        data.reserve(num_entries);
+        for(auto const& row: rows) {
+            data.insert(data.end(), row.begin(), row.end());
+            finishRow();
+        }
+    }
+
+    /**
+     * @param offsets offsets of the rows, the last offset is the number of entries
+     * @param data entries of all rows
+     */
+    CompressedRows(std::vector<uint64_t>&& offsets, std::vector<T>&& data)
+        : offsets(std::move(offsets)), data(std::move(data)) {}
+
+    /** Append an entry to the row that is currently being constructed. */
+    void addEntry(T const& entry) {
+        data.push_back(entry);
+    }
+
+    /** Finish the row that is currently being constructed. */
+    void finishRow() {
+        offsets.push_back(data.size());
+    }
+
+    /** Append a copy of the given row. */
+    void addRow(std::span<const T> row) {
+        data.insert(data.end(), row.begin(), row.end());
+        finishRow();
+    }
+
+    /** Number of rows. */
+    uint64_t size() const {
+        return offsets.size()-1;
+    }
+
+    /** Total number of entries in all rows. */
+    uint64_t numEntries() const {
+        return data.size();
+    }
+
+    std::span<const T> operator[](uint64_t row) const {
+        return std::span<const T>(data.data()+offsets[row], offsets[row+1]-offsets[row]);
+    }
+
+    bool empty(uint64_t row) const {
+        return offsets[row] == offsets[row+1];
+    }
+
+    /** Offsets of the rows, the last offset is the number of entries. */
+    std::vector<uint64_t> const& getOffsets() const {
+        return offsets;
+    }
+
+    /** Entries of all rows. */
+    std::vector<T> const& getData() const {
+        return data;
+    }
+
+    /** Unpack the rows into a vector of vectors. */
+    std::vector<std::vector<T>> toVectors() const {
+        std::vector<std::vector<T>> rows(size());
+        for(uint64_t row = 0; row < size(); ++row) {
+            rows[row].assign((*this)[row].begin(), (*this)[row].end());
+        }
+        return rows;
+    }
+
+protected:
+
+    std::vector<uint64_t> offsets;
+    std::vector<T> data;
+};
+
+}
@@ -0,0 +1,35 @@
+#pragma once
+
+#include "src/common.h"
+
+#include <pybind11/numpy.h>
+
+namespace synthesis {
+
+/**
+ * Create a read-only NumPy array viewing the vector without copying it.
+ * @param owner Python object owning the vector, it is kept alive as long as the array exists
+ */
+template<typename T>
+py::array_t<T> readOnlyView(std::vector<T> const& vector, py::handle owner) {
+    py::array_t<T> array(vector.size(), vector.data(), owner);
+    py::detail::array_proxy(array.ptr())->flags &= ~py::detail::npy_api::NPY_ARRAY_WRITEABLE_;
+    return array;
+}
+
+/**
+ * Create a read-only NumPy array of shape (n,2) viewing the vector of pairs without copying it.
+ * @param owner Python object owning the vector, it is kept alive as long as the array exists
+ */
+template<typename T>
+py::array_t<T> readOnlyPairView(std::vector<std::pair<T,T>> const& vector, py::handle owner) {
+    static_assert(sizeof(std::pair<T,T>) == 2*sizeof(T), "pairs are expected to be stored without padding");
+    py::array_t<T> array(
+        {vector.size(), (size_t)2}, {sizeof(std::pair<T,T>), sizeof(T)},
+        reinterpret_cast<T const*>(vector.data()), owner
+    );
+    py::detail::array_proxy(array.ptr())->flags &= ~py::detail::npy_api::NPY_ARRAY_WRITEABLE_;
+    return array;
+}
+
+}
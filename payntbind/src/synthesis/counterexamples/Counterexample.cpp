@@ -22,6 +22,7 @@
 #include <storm/environment/Environment.h>
 #include <storm/environment/solver/SolverEnvironment.h>
 
+#include <algorithm>
 #include <stack>
 
 namespace synthesis {
@@ -116,14 +117,19 @@ namespace synthesis {
         storm::models::sparse::Dtmc<ValueType> const& dtmc,
         std::vector<uint64_t> const& state_map
         ) {
-        
+        this->dtmc = std::make_shared<storm::models::sparse::Dtmc<ValueType>>(dtmc);
+        this->state_map = state_map;
+        this->prepareWaves(std::vector<bool>(this->hole_count,false));
+    }
+
+    template <typename ValueType, typename StateType>
+    void CounterexampleGenerator<ValueType,StateType>::prepareWaves(std::vector<bool> const& avoided_holes) {
+
         // Clear up previous DTMC metadata
         this->hole_wave.clear();
         this->wave_states.clear();
 
         // Get DTMC info
-        this->dtmc = std::make_shared<storm::models::sparse::Dtmc<ValueType>>(dtmc);
-        this->state_map = state_map;
         uint64_t dtmc_states = this->dtmc->getNumberOfStates();
         StateType initial_state = *(this->dtmc->getInitialStates().begin());
         storm::storage::SparseMatrix<ValueType> const& transition_matrix = this->dtmc->getTransitionMatrix();
@@ -134,10 +140,23 @@ namespace synthesis {
         // Associate states of a DTMC with relevant holes and store their count
         std::vector<std::set<uint64_t>> dtmc_holes(dtmc_states);
         std::vector<uint64_t> unregistered_holes_count(dtmc_states, 0);
+        std::vector<uint64_t> unregistered_avoided_holes_count(dtmc_states, 0);
         for(StateType state = 0; state < dtmc_states; state++) {
-            dtmc_holes[state] = this->mdp_holes[state_map[state]];
+            dtmc_holes[state] = this->mdp_holes[this->state_map[state]];
             unregistered_holes_count[state] = dtmc_holes[state].size();
+            for(uint64_t hole: dtmc_holes[state]) {
+                if(avoided_holes[hole]) {
+                    unregistered_avoided_holes_count[state]++;
+                }
+            }
         }
+        // true if the blocking state is a better blocking candidate than the current one
+        auto better_candidate = [&](StateType state, StateType candidate) {
+            if(unregistered_avoided_holes_count[state] != unregistered_avoided_holes_count[candidate]) {
+                return unregistered_avoided_holes_count[state] < unregistered_avoided_holes_count[candidate];
+            }
+            return unregistered_holes_count[state] < unregistered_holes_count[candidate];
+        };
 
         // Prepare to explore
         // wave increases by one when new holes of a blocking candidate are registered
@@ -188,7 +207,7 @@ namespace synthesis {
                     } else {
                         // blocking
                         state_horizon_blocking.push_back(successor);
-                        if(!blocking_candidate_set || unregistered_holes_count[successor] < unregistered_holes_count[blocking_candidate]) {
+                        if(!blocking_candidate_set || better_candidate(successor, blocking_candidate)) {
                             // new blocking candidate
                             blocking_candidate_set = true;
                             blocking_candidate = successor;
@@ -219,9 +238,13 @@ namespace synthesis {
             // Recompute number of unregistered holes in each state
             for(StateType state = 0; state < dtmc_states; state++) {
                 unregistered_holes_count[state] = 0;
+                unregistered_avoided_holes_count[state] = 0;
                 for(uint64_t hole: dtmc_holes[state]) {
                     if(this->hole_wave[hole] == 0) {
                         unregistered_holes_count[state]++;
+                        if(avoided_holes[hole]) {
+                            unregistered_avoided_holes_count[state]++;
+                        }
                     }
                 }
             }
@@ -236,7 +259,7 @@ namespace synthesis {
                 } else {
                     // still blocking
                     state_horizon_blocking.push_back(state);
-                    if(!blocking_candidate_set || unregistered_holes_count[state] < unregistered_holes_count[blocking_candidate]) {
+                    if(!blocking_candidate_set || better_candidate(state, blocking_candidate)) {
                         // new blocking candidate
                         blocking_candidate_set = true;
                         blocking_candidate = state;
@@ -498,6 +521,59 @@ namespace synthesis {
         return critical_holes;
     }
 
+    template <typename ValueType, typename StateType>
+    std::vector<std::vector<uint64_t>> CounterexampleGenerator<ValueType,StateType>::constructConflicts (
+        uint64_t formula_index,
+        ValueType formula_bound,
+        std::shared_ptr<storm::modelchecker::ExplicitQuantitativeCheckResult<ValueType> const> mdp_bounds,
+        std::vector<StateType> const& mdp_quotient_state_map,
+        uint64_t max_conflicts
+        ) {
+        std::vector<std::vector<uint64_t>> conflicts;
+        conflicts.push_back(this->constructConflict(formula_index, formula_bound, mdp_bounds, mdp_quotient_state_map));
+        if(max_conflicts <= 1) {
+            return conflicts;
+        }
+
+        // Store the default expansion order to be used for other formulae
+        std::vector<uint64_t> hole_wave_default = this->hole_wave;
+        std::vector<std::vector<StateType>> wave_states_default = this->wave_states;
+
+        std::vector<bool> avoided_holes(this->hole_count,false);
+        while(conflicts.size() < max_conflicts) {
+            // Avoid holes of the last conflict
+            bool new_avoided_hole = false;
+            for(uint64_t hole: conflicts.back()) {
+                if(!avoided_holes[hole]) {
+                    avoided_holes[hole] = true;
+                    new_avoided_hole = true;
+                }
+            }
+            if(!new_avoided_hole) {
+                break;
+            }
+            this->prepareWaves(avoided_holes);
+            std::vector<uint64_t> conflict = this->constructConflict(formula_index, formula_bound, mdp_bounds, mdp_quotient_state_map);
+
+            // Conflicts are sorted lists of holes: discard conflicts subsumed by some previous conflict
+            bool subsumed = false;
+            for(auto const& other: conflicts) {
+                if(std::includes(conflict.begin(), conflict.end(), other.begin(), other.end())) {
+                    subsumed = true;
+                    break;
+                }
+            }
+            if(subsumed) {
+                break;
+            }
+            conflicts.push_back(std::move(conflict));
+        }
+
+        this->hole_wave = std::move(hole_wave_default);
+        this->wave_states = std::move(wave_states_default);
+        return conflicts;
+    }
+
     template <typename ValueType, typename StateType>
     void CounterexampleGenerator<ValueType,StateType>::printProfiling() {
         std::cout << "[s] conflict: " << this->timer_conflict << std::endl;
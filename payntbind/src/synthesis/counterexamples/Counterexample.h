@@ -65,6 +65,26 @@ namespace synthesis {
             std::vector<StateType> const& mdp_quotient_state_map
             );
 
+        /*!
+         * Construct up to max_conflicts diverse conflicts to a prepared DTMC and a formula with the given index.
+         * The first conflict is the one constructed by constructConflict. Each next conflict is constructed after
+         * re-ordering the expansion waves so that holes of the previous conflicts are registered as late as
+         * possible. The construction stops when a conflict includes some previous conflict.
+         * @param formula_index Formula index.
+         * @param formula_bound Formula threshold for CE construction.
+         * @param mdp_bounds MDP model checking result in the primary direction (NULL if not used).
+         * @param mdp_quotient_state_mdp A mapping of MDP states to the states of a quotient MDP.
+         * @param max_conflicts Maximum number of conflicts.
+         * @return A list of conflicts, each being a list of holes relevant in the CE.
+         */
+        std::vector<std::vector<uint64_t>> constructConflicts(
+            uint64_t formula_index,
+            ValueType formula_bound,
+            std::shared_ptr<storm::modelchecker::ExplicitQuantitativeCheckResult<ValueType> const> mdp_bounds,
+            std::vector<StateType> const& mdp_quotient_state_map,
+            uint64_t max_conflicts
+            );
+
         /*!
          * TODO
          */
@@ -72,6 +92,14 @@ namespace synthesis {
 
     protected:
 
+        /**
+         * Establish the state expansion order of the prepared DTMC (see prepareDtmc).
+         * @param avoided_holes Holes that should be registered as late as possible: a blocking candidate is a
+         *   state with the least amount of unregistered avoided holes, ties are broken by the amount of all
+         *   unregistered holes.
+         */
+        void prepareWaves(std::vector<bool> const& avoided_holes);
+
         /** Identify states of an MDP having some label. */
         std::shared_ptr<storm::modelchecker::ExplicitQualitativeCheckResult> labelStates(
             storm::models::sparse::Mdp<ValueType> const& mdp,
@@ -19,6 +19,11 @@ void bindings_counterexamples(py::module& m) {
             "construct_conflict", &synthesis::CounterexampleGenerator<>::constructConflict,
             py::arg("formula_index"), py::arg("formula_bound"), py::arg("mdp_bounds"), py::arg("mdp_quotient_state_map")
         )
+        .def(
+            "construct_conflicts", &synthesis::CounterexampleGenerator<>::constructConflicts,
+            py::arg("formula_index"), py::arg("formula_bound"), py::arg("mdp_bounds"), py::arg("mdp_quotient_state_map"),
+            py::arg("max_conflicts")
+        )
         .def("print_profiling", &synthesis::CounterexampleGenerator<>::printProfiling)
         ;
 
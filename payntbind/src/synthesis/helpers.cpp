@@ -1,4 +1,6 @@
 #include "synthesis.h"
+#include "arrays.h"
+#include "CompressedRows.h"
 
 #include <storm/adapters/RationalNumberAdapter.h>
 #include <storm/logic/Formula.h>
@@ -16,6 +18,8 @@
 #include <storm/models/sparse/Model.h>
 
 #include <storm/storage/jani/TemplateEdge.h>
+#include <storm/modelchecker/results/ExplicitQuantitativeCheckResult.h>
+#include <storm/transformer/SubsystemBuilder.h>
 
 namespace synthesis {
 
@@ -55,6 +59,19 @@ void janiTemplateEdgeAddAssignments(storm::jani::TemplateEdge & template_edge, s
     }
 }
 
+template<typename ValueType>
+void bindSubmodelMappingViews(py::module& m, std::string const& vtSuffix) {
+    using SubsystemBuilderReturnType = storm::transformer::SubsystemBuilderReturnType<ValueType>;
+    m.def(("submodelStateMappingView" + vtSuffix).c_str(), [](py::object construction) {
+        auto const& mapping = construction.cast<SubsystemBuilderReturnType const&>().newToOldStateIndexMapping;
+        return readOnlyView<uint64_t>(mapping, construction);
+    }, "Read-only array viewing the new-to-old state mapping of the submodel construction.", py::arg("construction"));
+    m.def(("submodelActionMappingView" + vtSuffix).c_str(), [](py::object construction) {
+        auto const& mapping = construction.cast<SubsystemBuilderReturnType const&>().newToOldActionIndexMapping;
+        return readOnlyView<uint64_t>(mapping, construction);
+    }, "Read-only array viewing the new-to-old action mapping of the submodel construction.", py::arg("construction"));
+}
+
 }
 
 
@@ -85,6 +102,38 @@ void define_helpers(py::module& m) {
         return result;
     }, py::arg("matrix"), py::arg("vector"));
 
+    m.def("checkResultValuesView", [](py::object result) {
+        auto const& values = result.cast<storm::modelchecker::ExplicitQuantitativeCheckResult<double> const&>().getValueVector();
+        return synthesis::readOnlyView<double>(values, result);
+    }, "Read-only array viewing the state values of the check result.", py::arg("result"));
+    synthesis::bindSubmodelMappingViews<double>(m, "");
+    synthesis::bindSubmodelMappingViews<storm::RationalNumber>(m, "Exact");
+
+    using CompressedRows = synthesis::CompressedRows<uint64_t>;
+    py::class_<CompressedRows>(m, "CompressedRows", "Compressed (CSR-style) storage of a list of rows of indices.")
+        .def("__len__", &CompressedRows::size)
+        .def("__getitem__", [](CompressedRows const& rows, uint64_t row) {
+            if(row >= rows.size()) {
+                throw py::index_error();
+            }
+            return std::vector<uint64_t>(rows[row].begin(), rows[row].end());
+        }, py::arg("row"))
+        .def("num_entries", &CompressedRows::numEntries)
+        .def("to_lists", &CompressedRows::toVectors)
+        .def_property_readonly("offsets", &CompressedRows::getOffsets)
+        .def_property_readonly("data", &CompressedRows::getData)
+        .def_property_readonly("offsets_view", [](py::object rows) {
+                return synthesis::readOnlyView<uint64_t>(rows.cast<CompressedRows const&>().getOffsets(), rows);
+            },
+            "Read-only array viewing the offsets of the rows, the last offset is the number of entries."
+        )
+        .def_property_readonly("data_view", [](py::object rows) {
+                return synthesis::readOnlyView<uint64_t>(rows.cast<CompressedRows const&>().getData(), rows);
+            },
+            "Read-only array viewing the entries of all rows."
+        )
+        ;
+
     m.def("janiTemplateEdgeAddAssignments", &synthesis::janiTemplateEdgeAddAssignments, py::arg("template_edge"), py::arg("assignments"));
 }
 
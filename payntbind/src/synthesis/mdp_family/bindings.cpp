@@ -1,5 +1,6 @@
 #include "../synthesis.h"
 
+#include "../arrays.h"
 #include "MemoryUnfolder.h"
 #include <storm/adapters/RationalNumberAdapter.h>
 
@@ -15,6 +16,12 @@ void bindings_mdp_family_vt(py::module& m, std::string const& vtSuffix) {
         .def_property_readonly("state_prototype", [](synthesis::MemoryUnfolder<ValueType>& unfolder) {return unfolder.statePrototype;})
         .def_property_readonly("state_memory", [](synthesis::MemoryUnfolder<ValueType>& unfolder) {return unfolder.stateMemory;})
         .def_property_readonly("choice_map", [](synthesis::MemoryUnfolder<ValueType>& unfolder) {return unfolder.choiceMap;})
+        .def_property_readonly("choice_map_view", [](py::object unfolder) {
+                auto const& choice_map = unfolder.cast<synthesis::MemoryUnfolder<ValueType> const&>().choiceMap;
+                return synthesis::readOnlyView<uint64_t>(choice_map, unfolder);
+            },
+            "Read-only array viewing the choice map."
+        )
         ;
 
 }
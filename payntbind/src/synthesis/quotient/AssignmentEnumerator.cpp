@@ -0,0 +1,126 @@
+#include "AssignmentEnumerator.h"
+
+namespace synthesis {
+
+AssignmentEnumerator::AssignmentEnumerator(Family const& family) : family(family) {
+    hole_to_literals.resize(family.numHoles());
+}
+
+void AssignmentEnumerator::exclude(std::vector<std::pair<uint64_t,std::vector<uint64_t>>> const& conflict) {
+    uint64_t conflict_index = conflicts.size();
+    std::vector<std::pair<uint64_t,BitVector>> literals;
+    for(auto const& [hole,options]: conflict) {
+        BitVector options_mask(family.holeNumOptionsTotal(hole),false);
+        for(uint64_t option: options) {
+            options_mask.set(option);
+        }
+        hole_to_literals[hole].emplace_back(conflict_index,literals.size());
+        literals.emplace_back(hole,std::move(options_mask));
+    }
+    if(literals.empty()) {
+        num_empty_conflicts++;
+    }
+    conflicts.push_back(std::move(literals));
+}
+
+void AssignmentEnumerator::push() {
+    scope_num_conflicts.push_back(conflicts.size());
+}
+
+void AssignmentEnumerator::pop() {
+    uint64_t num_conflicts = scope_num_conflicts.back();
+    scope_num_conflicts.pop_back();
+    while(conflicts.size() > num_conflicts) {
+        // literals of the last conflict are the last literals of their holes
+        auto const& literals = conflicts.back();
+        for(auto const& [hole,options_mask]: literals) {
+            hole_to_literals[hole].pop_back();
+        }
+        if(literals.empty()) {
+            num_empty_conflicts--;
+        }
+        conflicts.pop_back();
+    }
+}
+
+uint64_t AssignmentEnumerator::numConflicts() const {
+    return conflicts.size();
+}
+
+bool AssignmentEnumerator::assign(uint64_t hole, uint64_t option) {
+    bool excluded = false;
+    for(auto const& [conflict,literal]: hole_to_literals[hole]) {
+        if(conflicts[conflict][literal].second.get(option)) {
+            conflict_unsatisfied_literals[conflict]--;
+            if(conflict_unsatisfied_literals[conflict] == 0 and conflict_violated_literals[conflict] == 0) {
+                excluded = true;
+            }
+        } else {
+            conflict_violated_literals[conflict]++;
+        }
+    }
+    if(excluded) {
+        unassign(hole,option);
+        return false;
+    }
+    return true;
+}
+
+void AssignmentEnumerator::unassign(uint64_t hole, uint64_t option) {
+    for(auto const& [conflict,literal]: hole_to_literals[hole]) {
+        if(conflicts[conflict][literal].second.get(option)) {
+            conflict_unsatisfied_literals[conflict]++;
+        } else {
+            conflict_violated_literals[conflict]--;
+        }
+    }
+}
+
+std::optional<std::vector<uint64_t>> AssignmentEnumerator::pickAssignment(Family const& subfamily) {
+    if(num_empty_conflicts > 0) {
+        return std::nullopt;
+    }
+    uint64_t num_holes = family.numHoles();
+    if(num_holes == 0) {
+        return std::vector<uint64_t>();
+    }
+
+    conflict_unsatisfied_literals.resize(conflicts.size());
+    conflict_violated_literals.assign(conflicts.size(),0);
+    for(uint64_t conflict = 0; conflict < conflicts.size(); ++conflict) {
+        conflict_unsatisfied_literals[conflict] = conflicts[conflict].size();
+    }
+
+    // depth-first search over holes, for each hole try its options in turn
+    std::vector<uint64_t> assignment(num_holes);
+    std::vector<uint64_t> next_option_index(num_holes,0);
+    uint64_t hole = 0;
+    while(true) {
+        auto const& options = subfamily.holeOptions(hole);
+        bool assigned = false;
+        while(next_option_index[hole] < options.size()) {
+            uint64_t option = options[next_option_index[hole]++];
+            if(assign(hole,option)) {
+                assignment[hole] = option;
+                assigned = true;
+                break;
+            }
+        }
+        if(assigned) {
+            if(hole+1 == num_holes) {
+                return assignment;
+            }
+            hole++;
+            next_option_index[hole] = 0;
+            continue;
+        }
+        // all options of this hole are excluded: backtrack
+        if(hole == 0) {
+            return std::nullopt;
+        }
+        hole--;
+        unassign(hole,assignment[hole]);
+    }
+}
+
+}
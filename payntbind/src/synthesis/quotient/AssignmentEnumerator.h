@@ -0,0 +1,79 @@
+#pragma once
+
+#include "src/synthesis/quotient/Family.h"
+
+#include <storm/storage/BitVector.h>
+
+#include <cstdint>
+#include <optional>
+#include <utility>
+#include <vector>
+
+namespace synthesis {
+
+using BitVector = storm::storage::BitVector;
+
+/**
+ * Enumerator of hole assignments that avoid excluded conflicts. A conflict is a conjunction of hole literals
+ * "hole takes one of these options" and excludes all assignments satisfying each of its literals. Assignments are
+ * found by a backtracking search over holes: for each conflict, the search maintains the number of its literals
+ * that are not yet satisfied and the number of literals already violated, so that a partial assignment is rejected
+ * as soon as it satisfies all literals of some conflict. Conflicts can be added in nested scopes that can be
+ * discarded later.
+ * @note there is no propagation and no learning of conflicts, and each pick starts the search from scratch, so the
+ *  enumerator is meant as a lightweight alternative to an SMT solver rather than a replacement for it
+ */
+class AssignmentEnumerator {
+public:
+
+    AssignmentEnumerator(Family const& family);
+
+    /**
+     * Pick an assignment of the given family that is not excluded by any conflict.
+     * @return for each hole, its option, or nothing if no such assignment exists
+     */
+    std::optional<std::vector<uint64_t>> pickAssignment(Family const& subfamily);
+
+    /**
+     * Exclude all assignments that satisfy each literal of the conflict.
+     * @param conflict a list of literals, i.e. pairs (hole,options); a conflict without literals excludes everything
+     */
+    void exclude(std::vector<std::pair<uint64_t,std::vector<uint64_t>>> const& conflict);
+
+    /** Open a new scope of conflicts. */
+    void push();
+    /** Discard conflicts added in the last open scope. */
+    void pop();
+
+    /** Number of conflicts currently excluded. */
+    uint64_t numConflicts() const;
+
+protected:
+
+    /** The unrefined family. */
+    Family family;
+
+    /** For each conflict, a list of its literals (hole,options). */
+    std::vector<std::vector<std::pair<uint64_t,BitVector>>> conflicts;
+    /** For each hole, a list of pairs (conflict,literal) of literals over this hole. */
+    std::vector<std::vector<std::pair<uint64_t,uint64_t>>> hole_to_literals;
+    /** For each open scope, the number of conflicts added before it was opened. */
+    std::vector<uint64_t> scope_num_conflicts;
+    /** Number of conflicts without literals. */
+    uint64_t num_empty_conflicts = 0;
+
+    /** For each conflict, the number of its literals not satisfied by the current partial assignment. */
+    std::vector<uint64_t> conflict_unsatisfied_literals;
+    /** For each conflict, the number of its literals violated by the current partial assignment. */
+    std::vector<uint64_t> conflict_violated_literals;
+
+    /**
+     * Extend the partial assignment with the hole option.
+     * @return false if the extended assignment is excluded by some conflict, in which case it is not extended
+     */
+    bool assign(uint64_t hole, uint64_t option);
+    /** Remove the hole option from the partial assignment. */
+    void unassign(uint64_t hole, uint64_t option);
+};
+
+}
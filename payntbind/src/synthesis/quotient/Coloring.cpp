@@ -4,14 +4,32 @@ namespace synthesis {
 
 Coloring::Coloring(
     Family const& family, std::vector<uint64_t> const& row_groups,
-    std::vector<std::vector<std::pair<uint64_t,uint64_t>>> choice_to_assignment
+    std::vector<std::vector<std::pair<uint64_t,uint64_t>>> const& choice_to_assignment
 ) : family(family), choice_to_assignment(choice_to_assignment) {
-    
+    initialize(row_groups);
+}
+
+Coloring::Coloring(
+    Family const& family, std::vector<uint64_t> const& row_groups,
+    Coloring const& base, std::vector<uint64_t> const& choice_to_base_choice
+) : family(family) {
+    auto const& base_choice_to_assignment = base.getChoiceToAssignment();
+    for(auto base_choice: choice_to_base_choice) {
+        if(base_choice < base_choice_to_assignment.size()) {
+            choice_to_assignment.addRow(base_choice_to_assignment[base_choice]);
+        } else {
+            choice_to_assignment.finishRow();
+        }
+    }
+    initialize(row_groups);
+}
+
+void Coloring::initialize(std::vector<uint64_t> const& row_groups) {
     auto num_choices = numChoices();
     colored_choices.resize(num_choices,false);
     uncolored_choices.resize(num_choices,false);
     for(uint64_t choice = 0; choice<num_choices; ++choice) {
-        if(choice_to_assignment[choice].empty()) {
+        if(choice_to_assignment.empty(choice)) {
             uncolored_choices.set(choice,true);
         } else {
             colored_choices.set(choice,true);
@@ -20,33 +38,57 @@ Coloring::Coloring(
 
 
     auto num_holes = family.numHoles();
-    choice_to_holes.resize(num_choices);
-    for(uint64_t choice = 0; choice<num_choices; ++choice) {
-        choice_to_holes[choice] = BitVector(num_holes,false);
-        for(auto const& [hole,option]: choice_to_assignment[choice]) {
-            choice_to_holes[choice].set(hole,true);
-        }
-    }
-
-
     auto num_states = row_groups.size()-1;
     state_to_holes.resize(num_states);
     for(uint64_t state = 0; state<num_states; ++state) {
         state_to_holes[state] = BitVector(num_holes,false);
         for(uint64_t choice = row_groups[state]; choice<row_groups[state+1]; ++choice) {
-            state_to_holes[state] = state_to_holes[state] | choice_to_holes[choice]; 
+            for(auto const& [hole,option]: choice_to_assignment[choice]) {
+                state_to_holes[state].set(hole,true);
+            }
         }
     }
+
+
+    hole_option_offsets.resize(num_holes+1);
+    hole_option_offsets[0] = 0;
+    for(uint64_t hole = 0; hole < num_holes; ++hole) {
+        hole_option_offsets[hole+1] = hole_option_offsets[hole] + family.holeNumOptionsTotal(hole);
+    }
+    // bucket the choices by their hole options, the buckets are filled in the increasing order of choices
+    std::vector<uint64_t> offsets(hole_option_offsets.back()+1,0);
+    for(auto const& [hole,option]: choice_to_assignment.getData()) {
+        offsets[holeOptionIndex(hole,option)+1]++;
+    }
+    for(uint64_t hole_option = 0; hole_option+1 < offsets.size(); ++hole_option) {
+        offsets[hole_option+1] += offsets[hole_option];
+    }
+    std::vector<uint64_t> choices(offsets.back());
+    std::vector<uint64_t> next_position(offsets.begin(),offsets.end()-1);
+    for(uint64_t choice = 0; choice<num_choices; ++choice) {
+        for(auto const& [hole,option]: choice_to_assignment[choice]) {
+            choices[next_position[holeOptionIndex(hole,option)]++] = choice;
+        }
+    }
+    hole_option_to_choices = CompressedRows<uint64_t>(std::move(offsets),std::move(choices));
 }
 
 const uint64_t Coloring::numChoices() const {
     return choice_to_assignment.size();
 }
 
-std::vector<std::vector<std::pair<uint64_t,uint64_t>>> const& Coloring::getChoiceToAssignment() const {
+CompressedRows<std::pair<uint64_t,uint64_t>> const& Coloring::getChoiceToAssignment() const {
     return choice_to_assignment;
 }
 
+CompressedRows<uint64_t> const& Coloring::getHoleOptionToChoices() const {
+    return hole_option_to_choices;
+}
+
+uint64_t Coloring::holeOptionIndex(uint64_t hole, uint64_t option) const {
+    return hole_option_offsets[hole]+option;
+}
+
 std::vector<BitVector> const& Coloring::getStateToHoles() const {
     return state_to_holes;
 }
@@ -61,6 +103,74 @@ BitVector Coloring::selectCompatibleChoices(Family const& subfamily) const {
     return selection;
 }
 
+BitVector Coloring::selectCompatibleChoices(Family const& subfamily, BitVector const& base_choices) const {
+    auto selection = BitVector(base_choices);
+    for(uint64_t hole = 0; hole < family.numHoles(); ++hole) {
+        removeExcludedChoices(subfamily,hole,selection);
+    }
+    return selection;
+}
+
+BitVector Coloring::selectCompatibleChoices(
+    Family const& subfamily, BitVector const& base_choices, std::vector<uint64_t> const& holes
+) const {
+    auto selection = BitVector(base_choices);
+    for(auto hole: holes) {
+        removeExcludedChoices(subfamily,hole,selection);
+    }
+    return selection;
+}
+
+std::vector<BitVector> const* Coloring::holeOptionMasks(uint64_t hole) const {
+    auto cached = hole_option_masks.find(hole);
+    if(cached != hole_option_masks.end()) {
+        hole_option_masks_lru.remove(hole);
+        hole_option_masks_lru.push_front(hole);
+        return &cached->second;
+    }
+    auto num_options = family.holeNumOptionsTotal(hole);
+    uint64_t mask_bits = num_options*numChoices();
+    if(mask_bits > max_mask_bits) {
+        return nullptr;
+    }
+    // drop masks of least recently used holes to stay within the budget
+    while(hole_option_masks_bits + mask_bits > max_mask_bits) {
+        uint64_t evicted = hole_option_masks_lru.back();
+        hole_option_masks_lru.pop_back();
+        hole_option_masks_bits -= family.holeNumOptionsTotal(evicted)*numChoices();
+        hole_option_masks.erase(evicted);
+    }
+    std::vector<BitVector> masks(num_options, BitVector(numChoices(),false));
+    for(uint64_t option = 0; option < num_options; ++option) {
+        for(auto choice: hole_option_to_choices[holeOptionIndex(hole,option)]) {
+            masks[option].set(choice,true);
+        }
+    }
+    hole_option_masks_bits += mask_bits;
+    hole_option_masks_lru.push_front(hole);
+    return &hole_option_masks.emplace(hole, std::move(masks)).first->second;
+}
+
+void Coloring::removeExcludedChoices(Family const& subfamily, uint64_t hole, BitVector & selection) const {
+    auto const& options_mask = subfamily.holeOptionsMask(hole);
+    if(options_mask.full()) {
+        return;
+    }
+    auto const* masks = holeOptionMasks(hole);
+    for(uint64_t option = 0; option < options_mask.size(); ++option) {
+        if(options_mask[option]) {
+            continue;
+        }
+        if(masks != nullptr) {
+            selection &= ~(*masks)[option];
+        } else {
+            for(auto choice: hole_option_to_choices[holeOptionIndex(hole,option)]) {
+                selection.set(choice,false);
+            }
+        }
+    }
+}
+
 
 
 std::vector<BitVector> Coloring::collectHoleOptionsMask(BitVector const& choices) const {
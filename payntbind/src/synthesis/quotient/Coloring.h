@@ -1,12 +1,15 @@
 #pragma once
 
 #include "src/synthesis/quotient/Family.h"
+#include "src/synthesis/CompressedRows.h"
 
 #include <storm/storage/BitVector.h>
 
 #include <cstdint>
-#include <vector>
+#include <list>
 #include <memory>
+#include <unordered_map>
+#include <vector>
 
 namespace synthesis {
 
@@ -18,16 +21,42 @@ public:
     
     Coloring(
         Family const& family, std::vector<uint64_t> const& row_groups,
-        std::vector<std::vector<std::pair<uint64_t,uint64_t>>> choice_to_assignment
+        std::vector<std::vector<std::pair<uint64_t,uint64_t>>> const& choice_to_assignment
+    );
+    /**
+     * Create a coloring of a model whose choices inherit colors of the choices of the base coloring.
+     * @param choice_to_base_choice for each choice, the choice of the base coloring; choices mapped outside of the
+     *  base coloring are left uncolored
+     */
+    Coloring(
+        Family const& family, std::vector<uint64_t> const& row_groups,
+        Coloring const& base, std::vector<uint64_t> const& choice_to_base_choice
     );
 
     /** Get choice-to-assignment mapping. */
-    std::vector<std::vector<std::pair<uint64_t,uint64_t>>> const& getChoiceToAssignment() const;
+    CompressedRows<std::pair<uint64_t,uint64_t>> const& getChoiceToAssignment() const;
+    /** Get a mapping from hole options (indexed via holeOptionIndex) to choices colored by this option. */
+    CompressedRows<uint64_t> const& getHoleOptionToChoices() const;
+    /** Index of the hole option in the hole-option-to-choices mapping. */
+    uint64_t holeOptionIndex(uint64_t hole, uint64_t option) const;
     /** Get a mapping from states to holes involved in its choices. */
     std::vector<BitVector> const& getStateToHoles() const;
     
     /** Get a mask of choices compatible with the family. */
     BitVector selectCompatibleChoices(Family const& subfamily) const;
+    /**
+     * Get a mask of choices compatible with the family, assuming that the family is a subfamily of the family that
+     * selected @p base_choices. Instead of inspecting each choice, choices colored by options excluded from the
+     * subfamily are removed from the base selection.
+     */
+    BitVector selectCompatibleChoices(Family const& subfamily, BitVector const& base_choices) const;
+    /**
+     * Same as above, but only holes in @p holes are inspected: the options of the remaining holes are assumed to be
+     * the same as in the family that selected @p base_choices (e.g. @p holes contains the hole that was split).
+     */
+    BitVector selectCompatibleChoices(
+        Family const& subfamily, BitVector const& base_choices, std::vector<uint64_t> const& holes
+    ) const;
     /** For each hole, collect options (colors) involved in any of the given choices. */
     std::vector<std::vector<uint64_t>> collectHoleOptions(BitVector const& choices) const;
     
@@ -36,21 +65,48 @@ protected:
     /** Reference to the unrefined family. */
     Family family;
     /** For each choice, a list of hole-option pairs (colors). */
-    const std::vector<std::vector<std::pair<uint64_t,uint64_t>>> choice_to_assignment;
+    CompressedRows<std::pair<uint64_t,uint64_t>> choice_to_assignment;
 
     /** Number of choices in the quotient. */
     const uint64_t numChoices() const;
     
-    /** For each state, identification of holes associated with its choices. */
-    std::vector<BitVector> choice_to_holes;
     /** For each state, identification of holes associated with its choices. */
     std::vector<BitVector> state_to_holes;
 
+    /** For each hole, the index of its first option in hole_option_to_choices. */
+    std::vector<uint64_t> hole_option_offsets;
+    /** For each hole option, a sorted list of choices colored by this hole option. */
+    CompressedRows<uint64_t> hole_option_to_choices;
+
+    /**
+     * Cache of masks of choices colored by the options of recently refined holes, used to remove choices colored by
+     * excluded options via bitvector operations. The masks of a hole take #options x #choices bits, and the masks of
+     * all holes share a single budget of max_mask_bits: masks of least recently used holes are dropped to make room
+     * for new ones. Holes whose masks alone exceed the budget are handled via hole_option_to_choices.
+     */
+    mutable std::unordered_map<uint64_t,std::vector<BitVector>> hole_option_masks;
+    /** Holes whose masks are cached, the most recently used first. */
+    mutable std::list<uint64_t> hole_option_masks_lru;
+    /** Number of bits of all cached masks. */
+    mutable uint64_t hole_option_masks_bits = 0;
+    /** Upper bound on the number of bits of all cached masks (16 MB). */
+    static const uint64_t max_mask_bits = 1ull << 27;
+    /**
+     * Get masks of choices colored by the options of the hole, or nullptr if the masks exceed the budget.
+     * @note the masks remain valid only until the next call
+     */
+    std::vector<BitVector> const* holeOptionMasks(uint64_t hole) const;
+    /** Remove from @p selection choices colored by the options of the hole that are excluded from the subfamily. */
+    void removeExcludedChoices(Family const& subfamily, uint64_t hole, BitVector & selection) const;
+
     /** Choices not labeled by any hole. */
     BitVector uncolored_choices;
     /** Choices labeled by some hole. */
     BitVector colored_choices;
 
+    /** Compute the mappings derived from choice_to_assignment. */
+    void initialize(std::vector<uint64_t> const& row_groups);
+
     /** For each hole, collect options (colors) involved in any of the given choices. */
     std::vector<BitVector> collectHoleOptionsMask(BitVector const& choices) const;
 };
@@ -2,6 +2,7 @@
 
 #include "src/synthesis/quotient/Family.h"
 #include "src/synthesis/quotient/TreeNode.h"
+#include "src/synthesis/CompressedRows.h"
 
 #include <storm/models/sparse/NondeterministicModel.h>
 #include <storm/storage/BitVector.h>
@@ -147,8 +148,8 @@ protected:
     bool state_exploration_enabled = false;
     /** The initial state. */
     uint64_t initial_state;
-    /** For each state, a list of target states. */
-    std::vector<std::vector<uint64_t>> choice_destinations;
+    /** For each choice, a list of target states. */
+    CompressedRows<uint64_t> choice_destinations;
 
     /** Check the current SMT formula. */
     bool check();
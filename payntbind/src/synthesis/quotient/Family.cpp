@@ -118,7 +118,7 @@ bool Family::includesAssignment(std::map<uint64_t,uint64_t> const& hole_to_optio
     return true;
 }
 
-bool Family::includesAssignment(std::vector<std::pair<uint64_t,uint64_t>> const& hole_to_option) const {
+bool Family::includesAssignment(std::span<const std::pair<uint64_t,uint64_t>> hole_to_option) const {
     for(auto const& [hole,option]: hole_to_option) {
     if(not hole_options_mask[hole][option]) {
             return false;
@@ -5,6 +5,7 @@
 #include <cstdint>
 #include <vector>
 #include <map>
+#include <span>
 
 namespace synthesis {
 
@@ -37,7 +38,7 @@ public:
     bool isSubsetOf(Family const& other) const;
     bool includesAssignment(std::vector<uint64_t> const& hole_to_option) const;
     bool includesAssignment(std::map<uint64_t,uint64_t> const& hole_to_option) const;
-    bool includesAssignment(std::vector<std::pair<uint64_t,uint64_t>> const& hole_to_option) const;
+    bool includesAssignment(std::span<const std::pair<uint64_t,uint64_t>> hole_to_option) const;
 
     // iterator over hole options
     std::vector<BitVector>::const_iterator begin() const;
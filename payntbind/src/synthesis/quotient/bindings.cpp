@@ -1,9 +1,11 @@
 #include "../synthesis.h"
+#include "../arrays.h"
 
 #include "JaniChoices.h"
 #include "Family.h"
 #include "Coloring.h"
 #include "ColoringSmt.h"
+#include "AssignmentEnumerator.h"
 #include "src/synthesis/translation/componentTranslations.h"
 
 #include <storm/storage/expressions/ExpressionManager.h>
@@ -18,11 +20,19 @@
 #include <storm/storage/sparse/JaniChoiceOrigins.h>
 
 #include <storm/storage/Scheduler.h>
+#include <storm/storage/SparseMatrix.h>
+#include <storm/environment/Environment.h>
+#include <storm/modelchecker/helper/infinitehorizon/SparseDeterministicVisitingTimesHelper.h>
+#include <storm/exceptions/InvalidArgumentException.h>
+#include <storm/utility/constants.h>
 
 #include <storm/adapters/RationalNumberAdapter.h>
 
 #include <z3++.h>
 
+#include <optional>
+#include <stack>
+
 namespace synthesis {
 
 template<typename ValueType>
@@ -114,6 +124,127 @@ std::vector<uint64_t> schedulerToStateToGlobalChoice(
     return state_to_choice;
 }
 
+template<typename ValueType>
+storm::storage::BitVector schedulerToQuotientChoices(
+    storm::storage::Scheduler<ValueType> const& scheduler, storm::models::sparse::Mdp<ValueType> const& sub_mdp,
+    std::vector<uint64_t> const& choice_to_global_choice, uint64_t num_global_choices,
+    bool discard_unreachable_choices
+) {
+    storm::storage::BitVector global_choices(num_global_choices,false);
+    uint64_t num_states = sub_mdp.getNumberOfStates();
+    auto const& nci = sub_mdp.getNondeterministicChoiceIndices();
+    auto state_to_choice = [&](uint64_t state) {
+        return nci[state] + scheduler.getChoice(state).getDeterministicChoice();
+    };
+    if(not discard_unreachable_choices) {
+        for(uint64_t state=0; state<num_states; ++state) {
+            global_choices.set(choice_to_global_choice[state_to_choice(state)]);
+        }
+        return global_choices;
+    }
+    // collect choices in states reachable from the initial state in the DTMC induced by the scheduler
+    auto const& transition_matrix = sub_mdp.getTransitionMatrix();
+    storm::storage::BitVector state_visited(num_states,false);
+    std::stack<uint64_t> state_stack;
+    for(auto state: sub_mdp.getInitialStates()) {
+        state_visited.set(state);
+        state_stack.push(state);
+    }
+    while(not state_stack.empty()) {
+        uint64_t state = state_stack.top();
+        state_stack.pop();
+        uint64_t choice = state_to_choice(state);
+        global_choices.set(choice_to_global_choice[choice]);
+        for(auto const& entry: transition_matrix.getRow(choice)) {
+            uint64_t dst = entry.getColumn();
+            if(not state_visited[dst]) {
+                state_visited.set(dst);
+                state_stack.push(dst);
+            }
+        }
+    }
+    return global_choices;
+}
+
+template<typename ValueType>
+std::vector<std::optional<uint64_t>> discardUnreachableChoices(
+    storm::models::sparse::Mdp<ValueType> const& quotient, std::vector<std::optional<uint64_t>> const& state_to_choice
+) {
+    uint64_t num_states = quotient.getNumberOfStates();
+    STORM_LOG_THROW(state_to_choice.size() == num_states, storm::exceptions::InvalidArgumentException,
+        "state-to-choice mapping has " << state_to_choice.size() << " entries, expected " << num_states);
+    auto const& nci = quotient.getNondeterministicChoiceIndices();
+    auto const& transition_matrix = quotient.getTransitionMatrix();
+    std::vector<std::optional<uint64_t>> state_to_choice_reachable(num_states);
+    storm::storage::BitVector state_visited(num_states,false);
+    std::stack<uint64_t> state_stack;
+    for(auto state: quotient.getInitialStates()) {
+        state_visited.set(state);
+        state_stack.push(state);
+    }
+    while(not state_stack.empty()) {
+        uint64_t state = state_stack.top();
+        state_stack.pop();
+        STORM_LOG_THROW(state_to_choice[state].has_value(), storm::exceptions::InvalidArgumentException,
+            "no choice is selected in a reachable state " << state);
+        uint64_t choice = *state_to_choice[state];
+        STORM_LOG_THROW(nci[state] <= choice and choice < nci[state+1], storm::exceptions::InvalidArgumentException,
+            "choice " << choice << " selected in a reachable state " << state << " is not a choice of this state");
+        state_to_choice_reachable[state] = choice;
+        for(auto const& entry: transition_matrix.getRow(choice)) {
+            uint64_t dst = entry.getColumn();
+            if(not state_visited[dst]) {
+                state_visited.set(dst);
+                state_stack.push(dst);
+            }
+        }
+    }
+    return state_to_choice_reachable;
+}
+
+template<typename ValueType>
+std::vector<std::optional<uint64_t>> schedulerToQuotientStateToChoice(
+    storm::storage::Scheduler<ValueType> const& scheduler, storm::models::sparse::Mdp<ValueType> const& sub_mdp,
+    std::vector<uint64_t> const& choice_to_global_choice, std::vector<uint64_t> const& state_to_global_state,
+    storm::models::sparse::Mdp<ValueType> const& quotient, bool discard_unreachable_choices
+) {
+    std::vector<std::optional<uint64_t>> state_to_choice(quotient.getNumberOfStates());
+    auto const& nci = sub_mdp.getNondeterministicChoiceIndices();
+    for(uint64_t state=0; state<sub_mdp.getNumberOfStates(); ++state) {
+        uint64_t choice = nci[state] + scheduler.getChoice(state).getDeterministicChoice();
+        state_to_choice[state_to_global_state[state]] = choice_to_global_choice[choice];
+    }
+    if(discard_unreachable_choices) {
+        state_to_choice = discardUnreachableChoices<ValueType>(quotient, state_to_choice);
+    }
+    return state_to_choice;
+}
+
+storm::storage::BitVector stateToChoiceToChoices(
+    std::vector<std::optional<uint64_t>> const& state_to_choice, uint64_t num_choices
+) {
+    storm::storage::BitVector choices(num_choices,false);
+    for(auto const& choice: state_to_choice) {
+        // states without a choice, or with an invalid one (e.g. irrelevant states of a game), are skipped
+        if(choice.has_value() and *choice < num_choices) {
+            choices.set(*choice);
+        }
+    }
+    return choices;
+}
+
+std::vector<std::optional<uint64_t>> stateToChoiceToAction(
+    std::vector<std::optional<uint64_t>> const& state_to_choice, std::vector<uint64_t> const& choice_to_action
+) {
+    std::vector<std::optional<uint64_t>> state_to_action(state_to_choice.size());
+    for(uint64_t state=0; state<state_to_choice.size(); ++state) {
+        if(state_to_choice[state].has_value()) {
+            state_to_action[state] = choice_to_action[*state_to_choice[state]];
+        }
+    }
+    return state_to_action;
+}
+
 std::map<uint64_t,double> computeInconsistentHoleVariance(
     Family const& family,
     std::vector<uint64_t> const& row_groups, std::vector<uint64_t> const& choice_to_global_choice,
@@ -191,6 +322,98 @@ std::map<uint64_t,double> computeInconsistentHoleVariance(
 }
 
 
+template<typename ValueType>
+std::vector<ValueType> computeChoiceValues(
+    storm::models::sparse::Mdp<ValueType> const& mdp, std::vector<ValueType> const& state_values,
+    std::optional<std::string> const& reward_name
+) {
+    std::vector<ValueType> choice_values(mdp.getNumberOfChoices());
+    mdp.getTransitionMatrix().multiplyWithVector(state_values, choice_values);
+
+    if constexpr (std::is_same_v<ValueType,double>) {
+        // replace infinite values by the sum of finite values divided by the number of all values
+        double finite_sum = 0;
+        bool has_infinity = false;
+        for(double value: choice_values) {
+            if(storm::utility::isInfinity(value)) {
+                has_infinity = true;
+            } else {
+                finite_sum += value;
+            }
+        }
+        if(has_infinity) {
+            double default_value = finite_sum / choice_values.size();
+            for(double & value: choice_values) {
+                if(storm::utility::isInfinity(value)) {
+                    value = default_value;
+                }
+            }
+        }
+    }
+
+    if(reward_name) {
+        auto const& reward_model = mdp.getRewardModel(*reward_name);
+        STORM_LOG_THROW(reward_model.hasStateActionRewards(), storm::exceptions::InvalidArgumentException,
+            "reward model " << *reward_name << " has no state-action rewards");
+        auto const& choice_rewards = reward_model.getStateActionRewardVector();
+        for(uint64_t choice = 0; choice < choice_values.size(); ++choice) {
+            choice_values[choice] += choice_rewards[choice];
+        }
+    }
+    return choice_values;
+}
+
+template<typename ValueType>
+std::vector<ValueType> computeExpectedVisits(
+    storm::Environment const& env, storm::models::sparse::Mdp<ValueType> const& mdp,
+    storm::storage::BitVector const& choices, bool replace_infinity_by_average
+) {
+    // construct the transition matrix of the DTMC induced by the selected choices
+    uint64_t num_states = mdp.getNumberOfStates();
+    auto const& transition_matrix = mdp.getTransitionMatrix();
+    auto const& row_groups = transition_matrix.getRowGroupIndices();
+    storm::storage::SparseMatrixBuilder<ValueType> builder(num_states, num_states);
+    for(uint64_t state = 0; state < num_states; ++state) {
+        uint64_t choice = choices.getNextSetIndex(row_groups[state]);
+        if(choice >= row_groups[state+1]) {
+            // no choice is selected: such states are unreachable, make them absorbing
+            builder.addNextValue(state, state, storm::utility::one<ValueType>());
+            continue;
+        }
+        for(auto const& entry: transition_matrix.getRow(choice)) {
+            builder.addNextValue(state, entry.getColumn(), entry.getValue());
+        }
+    }
+    storm::modelchecker::helper::SparseDeterministicVisitingTimesHelper<ValueType> helper(builder.build());
+    std::vector<ValueType> expected_visits = helper.computeExpectedVisitingTimes(env, mdp.getInitialStates());
+
+    if constexpr (std::is_same_v<ValueType,double>) {
+        // replace infinite visits either by zero or by the average number of visits of the reachable states
+        double default_value = 0;
+        if(replace_infinity_by_average) {
+            double finite_sum = 0;
+            uint64_t num_reachable = 0;
+            for(double visits: expected_visits) {
+                if(visits == 0) {
+                    continue;
+                }
+                num_reachable++;
+                if(not storm::utility::isInfinity(visits)) {
+                    finite_sum += visits;
+                }
+            }
+            default_value = num_reachable > 0 ? finite_sum / num_reachable : 0;
+        }
+        for(double & visits: expected_visits) {
+            if(storm::utility::isInfinity(visits)) {
+                visits = default_value;
+            }
+        }
+    }
+    return expected_visits;
+}
+
+
 /*storm::storage::BitVector keepReachableChoices(
     storm::storage::BitVector enabled_choices, uint64_t initial_state,
     std::vector<uint64_t> const& row_groups, std::vector<std::vector<uint64_t>> const& choice_destinations
@@ -236,6 +459,20 @@ storm::storage::BitVector policyToChoicesForFamily(
     return choices & family_choices;
 }
 
+storm::storage::BitVector restrictChoiceMaskToSubmodel(
+    storm::storage::BitVector const& choices,
+    std::vector<uint64_t> const& choice_to_global_choice
+) {
+    uint64_t num_choices = choice_to_global_choice.size();
+    storm::storage::BitVector submodel_choices(num_choices,false);
+    for(uint64_t choice = 0; choice < num_choices; ++choice) {
+        if(choices[choice_to_global_choice[choice]]) {
+            submodel_choices.set(choice,true);
+        }
+    }
+    return submodel_choices;
+}
+
 
 /*std::pair<std::vector<uint64_t>,storm::storage::BitVector> fixPolicyForFamily(
     std::vector<uint64_t> const& policy, uint64_t invalid_action,
@@ -293,6 +530,32 @@ void bindings_coloring_vt(py::module& m, std::string const& vtSuffix) {
     m.def(("addChoiceLabelsFromJani" + vtSuffix).c_str(), &synthesis::addChoiceLabelsFromJani<ValueType>);
 
     m.def(("schedulerToStateToGlobalChoice" + vtSuffix).c_str(), &synthesis::schedulerToStateToGlobalChoice<ValueType>);
+    m.def(("schedulerToQuotientChoices" + vtSuffix).c_str(), &synthesis::schedulerToQuotientChoices<ValueType>,
+        "Collect quotient choices selected by the scheduler of the sub-MDP, optionally only in the states reachable "
+        "under this scheduler.",
+        py::arg("scheduler"), py::arg("sub_mdp"), py::arg("choice_to_global_choice"), py::arg("num_global_choices"),
+        py::arg("discard_unreachable_choices")
+    );
+    m.def(("discardUnreachableChoices" + vtSuffix).c_str(), &synthesis::discardUnreachableChoices<ValueType>,
+        "Keep only choices of states of the quotient that are reachable under the given state-to-choice mapping.",
+        py::arg("quotient"), py::arg("state_to_choice")
+    );
+    m.def(("schedulerToQuotientStateToChoice" + vtSuffix).c_str(), &synthesis::schedulerToQuotientStateToChoice<ValueType>,
+        "Map states of the quotient to quotient choices selected by the scheduler of the sub-MDP, optionally only in "
+        "the states reachable under this scheduler. Other states have no choice.",
+        py::arg("scheduler"), py::arg("sub_mdp"), py::arg("choice_to_global_choice"), py::arg("state_to_global_state"),
+        py::arg("quotient"), py::arg("discard_unreachable_choices")
+    );
+    m.def(("computeChoiceValues" + vtSuffix).c_str(), &synthesis::computeChoiceValues<ValueType>,
+        "Compute the values of the choices of the MDP wrt. the given state values. Infinite values are replaced by "
+        "the average value. If the reward name is set, state-action rewards are added to the choice values.",
+        py::arg("mdp"), py::arg("state_values"), py::arg("reward_name")
+    );
+    m.def(("computeExpectedVisits" + vtSuffix).c_str(), &synthesis::computeExpectedVisits<ValueType>,
+        "Compute the expected number of visits of the states of the MDP in the DTMC induced by the selected choices. "
+        "Infinite visits are replaced either by the average of reachable states or by zero.",
+        py::arg("env"), py::arg("mdp"), py::arg("choices"), py::arg("replace_infinity_by_average")
+    );
 }
 
 void bindings_coloring(py::module& m) {
@@ -302,6 +565,15 @@ void bindings_coloring(py::module& m) {
     m.def("computeInconsistentHoleVariance", &synthesis::computeInconsistentHoleVariance);
 
     m.def("policyToChoicesForFamily", &synthesis::policyToChoicesForFamily);
+    m.def("restrictChoiceMaskToSubmodel", &synthesis::restrictChoiceMaskToSubmodel);
+    m.def("stateToChoiceToChoices", &synthesis::stateToChoiceToChoices,
+        "Collect choices selected in the states; states without a valid choice are skipped.",
+        py::arg("state_to_choice"), py::arg("num_choices")
+    );
+    m.def("stateToChoiceToAction", &synthesis::stateToChoiceToAction,
+        "Map the choice selected in each state to its action.",
+        py::arg("state_to_choice"), py::arg("choice_to_action")
+    );
 
     py::class_<synthesis::Family>(m, "Family")
         .def(py::init<>())
@@ -318,15 +590,48 @@ void bindings_coloring(py::module& m) {
         .def("holeContains", &synthesis::Family::holeContains)
         ;
 
+    py::class_<synthesis::AssignmentEnumerator>(m, "AssignmentEnumerator")
+        .def(py::init<synthesis::Family const&>())
+        .def("pickAssignment", &synthesis::AssignmentEnumerator::pickAssignment)
+        .def("exclude", &synthesis::AssignmentEnumerator::exclude)
+        .def("push", &synthesis::AssignmentEnumerator::push)
+        .def("pop", &synthesis::AssignmentEnumerator::pop)
+        .def("numConflicts", &synthesis::AssignmentEnumerator::numConflicts)
+        ;
+
     py::class_<synthesis::Coloring>(m, "Coloring")
         .def(py::init<
             synthesis::Family const&,
             std::vector<uint64_t> const&,
-            std::vector<std::vector<std::pair<uint64_t,uint64_t>>>
+            std::vector<std::vector<std::pair<uint64_t,uint64_t>>> const&
         >())
-        .def("getChoiceToAssignment", &synthesis::Coloring::getChoiceToAssignment)
+        .def(py::init<
+            synthesis::Family const&,
+            std::vector<uint64_t> const&,
+            synthesis::Coloring const&,
+            std::vector<uint64_t> const&
+        >(), py::arg("family"), py::arg("row_groups"), py::arg("base"), py::arg("choice_to_base_choice"))
+        .def("getChoiceToAssignment", [](synthesis::Coloring const& coloring) {
+            return coloring.getChoiceToAssignment().toVectors();
+        })
+        .def_property_readonly("choice_to_assignment_offsets_view", [](py::object coloring) {
+                auto const& choice_to_assignment = coloring.cast<synthesis::Coloring const&>().getChoiceToAssignment();
+                return synthesis::readOnlyView<uint64_t>(choice_to_assignment.getOffsets(), coloring);
+            },
+            "Read-only array viewing the offsets of the hole assignments of choices."
+        )
+        .def_property_readonly("choice_to_assignment_view", [](py::object coloring) {
+                auto const& choice_to_assignment = coloring.cast<synthesis::Coloring const&>().getChoiceToAssignment();
+                return synthesis::readOnlyPairView<uint64_t>(choice_to_assignment.getData(), coloring);
+            },
+            "Read-only (n,2)-array viewing the (hole,option) pairs of all choices."
+        )
+        .def("getHoleOptionToChoices", &synthesis::Coloring::getHoleOptionToChoices, py::return_value_policy::reference_internal)
+        .def("holeOptionIndex", &synthesis::Coloring::holeOptionIndex, py::arg("hole"), py::arg("option"))
         .def("getStateToHoles", &synthesis::Coloring::getStateToHoles)
-        .def("selectCompatibleChoices", &synthesis::Coloring::selectCompatibleChoices)
+        .def("selectCompatibleChoices", py::overload_cast<synthesis::Family const&>(&synthesis::Coloring::selectCompatibleChoices, py::const_))
+        .def("selectCompatibleChoices", py::overload_cast<synthesis::Family const&, storm::storage::BitVector const&>(&synthesis::Coloring::selectCompatibleChoices, py::const_))
+        .def("selectCompatibleChoices", py::overload_cast<synthesis::Family const&, storm::storage::BitVector const&, std::vector<uint64_t> const&>(&synthesis::Coloring::selectCompatibleChoices, py::const_), py::arg("subfamily"), py::arg("base_choices"), py::arg("holes"))
         .def("collectHoleOptions", &synthesis::Coloring::collectHoleOptions)
         ;
 
@@ -346,6 +651,10 @@ void bindings_coloring(py::module& m) {
         .def("getFamilyInfo", &synthesis::ColoringSmt<>::getFamilyInfo)
         .def("selectCompatibleChoices", py::overload_cast<synthesis::Family const&>(&synthesis::ColoringSmt<>::selectCompatibleChoices))
         .def("selectCompatibleChoices", py::overload_cast<synthesis::Family const&, storm::storage::BitVector const&>(&synthesis::ColoringSmt<>::selectCompatibleChoices))
+        // the SMT coloring explores the states anew, so the hint about the refined holes is not used
+        .def("selectCompatibleChoices", [](synthesis::ColoringSmt<>& coloring, synthesis::Family const& subfamily, storm::storage::BitVector const& base_choices, std::vector<uint64_t> const&) {
+            return coloring.selectCompatibleChoices(subfamily,base_choices);
+        }, py::arg("subfamily"), py::arg("base_choices"), py::arg("holes"))
         .def("areChoicesConsistent", &synthesis::ColoringSmt<>::areChoicesConsistent)
         // .def_property_readonly("unsat_core", [](synthesis::ColoringSmt<>& coloring) {return coloring.unsat_core;})
         // .def("getProfilingInfo", &synthesis::ColoringSmt<>::getProfilingInfo)
@@ -16,15 +16,19 @@
 namespace synthesis {
 
 template<typename ValueType>
-std::vector<std::vector<uint64_t>> computeChoiceDestinations(storm::models::sparse::Model<ValueType> const& model) {
-    uint64_t num_choices = model.getNumberOfChoices();
-    std::vector<std::vector<uint64_t>> choice_destinations(num_choices);
-    for(uint64_t choice = 0; choice < num_choices; ++choice) {
-        for(auto const& entry: model.getTransitionMatrix().getRow(choice)) {
-            choice_destinations[choice].push_back(entry.getColumn());
+CompressedRows<uint64_t> computeChoiceDestinations(storm::models::sparse::Model<ValueType> const& model) {
+    auto const& matrix = model.getTransitionMatrix();
+    std::vector<uint64_t> offsets(matrix.getRowCount()+1);
+    std::vector<uint64_t> destinations;
+    destinations.reserve(matrix.getEntryCount());
+    for(uint64_t choice = 0; choice < matrix.getRowCount(); ++choice) {
+        offsets[choice] = destinations.size();
+        for(auto const& entry: matrix.getRow(choice)) {
+            destinations.push_back(entry.getColumn());
         }
     }
-    return choice_destinations;
+    offsets.back() = destinations.size();
+    return CompressedRows<uint64_t>(std::move(offsets),std::move(destinations));
 }
 
 template<typename ValueType>
@@ -603,7 +607,7 @@ std::shared_ptr<storm::models::sparse::Model<ValueType>> createModelUnion(
 }
 
 
-template std::vector<std::vector<uint64_t>> computeChoiceDestinations<double>(
+template CompressedRows<uint64_t> computeChoiceDestinations<double>(
     storm::models::sparse::Model<double> const& model);
 template std::pair<std::vector<std::string>,std::vector<uint64_t>> extractActionLabels<double>(
     storm::models::sparse::Model<double> const& model);
@@ -630,7 +634,7 @@ template std::shared_ptr<storm::models::sparse::Model<double>> createModelUnion(
     std::vector<std::shared_ptr<storm::models::sparse::Model<double>>> const&
 );
 
-template std::vector<std::vector<uint64_t>> computeChoiceDestinations<storm::RationalNumber>(
+template CompressedRows<uint64_t> computeChoiceDestinations<storm::RationalNumber>(
     storm::models::sparse::Model<storm::RationalNumber> const& model);
 template std::pair<std::vector<std::string>,std::vector<uint64_t>> extractActionLabels<storm::RationalNumber>(
     storm::models::sparse::Model<storm::RationalNumber> const& model);
@@ -1,5 +1,7 @@
 #pragma once
 
+#include "src/synthesis/CompressedRows.h"
+
 #include <storm/storage/BitVector.h>
 #include <storm/adapters/RationalNumberAdapter.h>
 #include <storm/models/sparse/Model.h>
@@ -16,10 +18,10 @@ const std::string NO_ACTION_LABEL = "__no_label__";
 const std::string DONT_CARE_ACTION_LABEL = "__random__";
 
 /**
- * Return for each state a list of its state destinations.
+ * Return for each choice a list of its state destinations.
  */
 template<typename ValueType>
-std::vector<std::vector<uint64_t>> computeChoiceDestinations(storm::models::sparse::Model<ValueType> const& model);
+CompressedRows<uint64_t> computeChoiceDestinations(storm::models::sparse::Model<ValueType> const& model);
 
 /**
  * Add \p NO_ACTION_LABEL label to any choice that does not have any.
@@ -0,0 +1,310 @@
+#include "FamilyMembers.h"
+
+#include "storm/models/sparse/Dtmc.h"
+#include "storm/storage/sparse/ModelComponents.h"
+#include "storm/modelchecker/prctl/SparseDtmcPrctlModelChecker.h"
+#include "storm/modelchecker/results/ExplicitQuantitativeCheckResult.h"
+#include "storm/modelchecker/hints/ExplicitModelCheckerHint.h"
+#include "storm/models/sparse/StandardRewardModel.h"
+#include "storm/storage/SparseMatrix.h"
+#include "storm/utility/constants.h"
+#include "storm/exceptions/NotSupportedException.h"
+#include "storm/exceptions/UnexpectedException.h"
+
+namespace synthesis {
+
+    template<typename ValueType>
+    InducedDtmcBuilder<ValueType>::InducedDtmcBuilder(storm::models::sparse::Mdp<ValueType> const& quotient)
+        : quotient(quotient) {
+        for(auto const& [name,reward_model]: quotient.getRewardModels()) {
+            STORM_LOG_THROW(!reward_model.hasTransitionRewards(), storm::exceptions::NotSupportedException,
+                "transition rewards are currently not supported.");
+        }
+        uint64_t num_states = quotient.getNumberOfStates();
+        reachable_states = BitVector(num_states,false);
+        state_to_dtmc_state.resize(num_states);
+    }
+
+    template<typename ValueType>
+    storm::models::sparse::Dtmc<ValueType> InducedDtmcBuilder<ValueType>::build(
+        std::vector<uint64_t> const& state_to_choice
+    ) {
+        auto const& quotient_matrix = quotient.getTransitionMatrix();
+        auto const& row_groups = quotient_matrix.getRowGroupIndices();
+
+        // explore the states reachable via the selected choices
+        reachable_states.clear();
+        state_stack.clear();
+        for(auto state: quotient.getInitialStates()) {
+            reachable_states.set(state,true);
+            state_stack.push_back(state);
+        }
+        uint64_t num_entries = 0;
+        while(not state_stack.empty()) {
+            uint64_t state = state_stack.back();
+            state_stack.pop_back();
+            uint64_t choice = state_to_choice[state];
+            STORM_LOG_THROW(row_groups[state] <= choice and choice < row_groups[state+1],
+                storm::exceptions::UnexpectedException, "no choice is selected in a reachable state.");
+            num_entries += quotient_matrix.getRow(choice).getNumberOfEntries();
+            for(auto const& entry: quotient_matrix.getRow(choice)) {
+                uint64_t successor = entry.getColumn();
+                if(not reachable_states[successor]) {
+                    reachable_states.set(successor,true);
+                    state_stack.push_back(successor);
+                }
+            }
+        }
+        // states of the DTMC preserve the order of the states of the quotient, so that the columns stay sorted
+        states.clear();
+        for(auto state: reachable_states) {
+            state_to_dtmc_state[state] = states.size();
+            states.push_back(state);
+        }
+
+        uint64_t num_dtmc_states = states.size();
+        storm::storage::SparseMatrixBuilder<ValueType> builder(num_dtmc_states,num_dtmc_states,num_entries);
+        for(uint64_t dtmc_state = 0; dtmc_state < num_dtmc_states; ++dtmc_state) {
+            for(auto const& entry: quotient_matrix.getRow(state_to_choice[states[dtmc_state]])) {
+                builder.addNextValue(dtmc_state, state_to_dtmc_state[entry.getColumn()], entry.getValue());
+            }
+        }
+        storm::storage::sparse::ModelComponents<ValueType> components(
+            builder.build(), quotient.getStateLabeling().getSubLabeling(reachable_states)
+        );
+        for(auto const& [name,reward_model]: quotient.getRewardModels()) {
+            std::optional<std::vector<ValueType>> state_rewards, action_rewards;
+            if(reward_model.hasStateRewards()) {
+                state_rewards = std::vector<ValueType>(num_dtmc_states);
+                for(uint64_t dtmc_state = 0; dtmc_state < num_dtmc_states; ++dtmc_state) {
+                    (*state_rewards)[dtmc_state] = reward_model.getStateReward(states[dtmc_state]);
+                }
+            }
+            if(reward_model.hasStateActionRewards()) {
+                action_rewards = std::vector<ValueType>(num_dtmc_states);
+                for(uint64_t dtmc_state = 0; dtmc_state < num_dtmc_states; ++dtmc_state) {
+                    (*action_rewards)[dtmc_state] = reward_model.getStateActionReward(
+                        state_to_choice[states[dtmc_state]]
+                    );
+                }
+            }
+            components.rewardModels.emplace(
+                name, storm::models::sparse::StandardRewardModel<ValueType>(std::move(state_rewards), std::move(action_rewards))
+            );
+        }
+        return storm::models::sparse::Dtmc<ValueType>(std::move(components));
+    }
+
+    template<typename ValueType>
+    std::vector<uint64_t> const& InducedDtmcBuilder<ValueType>::getStates() const {
+        return states;
+    }
+
+    template class InducedDtmcBuilder<double>;
+
+
+    template<typename ValueType>
+    std::pair<std::vector<ValueType>,std::vector<uint64_t>> verifyFamilyMembers(
+        storm::Environment const& env,
+        std::shared_ptr<storm::models::sparse::Mdp<ValueType>> const& quotient,
+        Coloring const& coloring,
+        Family const& family,
+        std::vector<std::shared_ptr<storm::logic::Formula>> const& formulae,
+        uint64_t first_member,
+        uint64_t num_members
+    ) {
+        uint64_t num_holes = family.numHoles();
+        std::vector<ValueType> values;
+        values.reserve(num_members*formulae.size());
+        std::vector<uint64_t> member_states;
+        member_states.reserve(num_members);
+
+        // decode the index of the first member, the last hole is the least significant digit
+        std::vector<uint64_t> member_option_index(num_holes,0);
+        uint64_t member_index = first_member;
+        for(uint64_t hole = num_holes; hole-- > 0;) {
+            uint64_t num_options = family.holeNumOptions(hole);
+            member_option_index[hole] = member_index % num_options;
+            member_index /= num_options;
+        }
+        // the member is maintained in a single family that is updated in place
+        Family member(family);
+        for(uint64_t hole = 0; hole < num_holes; ++hole) {
+            member.holeSetOption(hole, family.holeOptions(hole)[member_option_index[hole]]);
+        }
+
+        InducedDtmcBuilder<ValueType> dtmc_builder(*quotient);
+        auto const& row_groups = quotient->getTransitionMatrix().getRowGroupIndices();
+        uint64_t num_states = quotient->getNumberOfStates();
+        std::vector<uint64_t> state_to_choice(num_states);
+        for(uint64_t member_count = 0; member_count < num_members; ++member_count) {
+            // build the DTMC induced by the member, states without a compatible choice get an invalid choice
+            BitVector choices = coloring.selectCompatibleChoices(member);
+            for(uint64_t state = 0; state < num_states; ++state) {
+                state_to_choice[state] = choices.getNextSetIndex(row_groups[state]);
+            }
+            storm::models::sparse::Dtmc<ValueType> dtmc = dtmc_builder.build(state_to_choice);
+            uint64_t initial_state = *dtmc.getInitialStates().begin();
+            member_states.push_back(dtmc.getNumberOfStates());
+
+            storm::modelchecker::SparseDtmcPrctlModelChecker<storm::models::sparse::Dtmc<ValueType>> modelchecker(dtmc);
+            for(auto const& formula: formulae) {
+                storm::modelchecker::CheckTask<storm::logic::Formula, ValueType> task(*formula, true);
+                auto result = modelchecker.check(env, task);
+                values.push_back(result->template asExplicitQuantitativeCheckResult<ValueType>()[initial_state]);
+            }
+
+            // advance to the next member
+            for(uint64_t hole = num_holes; hole-- > 0;) {
+                member_option_index[hole]++;
+                if(member_option_index[hole] < family.holeNumOptions(hole)) {
+                    member.holeSetOption(hole, family.holeOptions(hole)[member_option_index[hole]]);
+                    break;
+                }
+                member_option_index[hole] = 0;
+                member.holeSetOption(hole, family.holeOptions(hole)[0]);
+            }
+        }
+        return std::make_pair(values,member_states);
+    }
+
+    template std::pair<std::vector<double>,std::vector<uint64_t>> verifyFamilyMembers<double>(
+        storm::Environment const& env,
+        std::shared_ptr<storm::models::sparse::Mdp<double>> const& quotient,
+        Coloring const& coloring,
+        Family const& family,
+        std::vector<std::shared_ptr<storm::logic::Formula>> const& formulae,
+        uint64_t first_member,
+        uint64_t num_members
+    );
+
+
+    template<typename ValueType>
+    GrayCodeMemberChecker<ValueType>::GrayCodeMemberChecker(
+        std::shared_ptr<storm::models::sparse::Mdp<ValueType>> const& quotient,
+        Coloring const& coloring,
+        Family const& family,
+        std::vector<std::shared_ptr<storm::logic::Formula>> const& formulae
+    ) : quotient(quotient), coloring(coloring), family(family), formulae(formulae), dtmc_builder(*quotient) {
+        uint64_t num_holes = family.numHoles();
+        member_option_index = std::vector<uint64_t>(num_holes,0);
+        member_option_ascending = std::vector<bool>(num_holes,true);
+        member_index = 0;
+        hole_stride = std::vector<uint64_t>(num_holes,1);
+        for(uint64_t hole = num_holes; hole-- > 1;) {
+            hole_stride[hole-1] = hole_stride[hole]*family.holeNumOptions(hole);
+        }
+
+        uint64_t num_states = quotient->getNumberOfStates();
+        hole_to_states.resize(num_holes);
+        auto const& state_to_holes = coloring.getStateToHoles();
+        for(uint64_t state = 0; state < num_states; ++state) {
+            for(uint64_t hole: state_to_holes[state]) {
+                hole_to_states[hole].push_back(state);
+            }
+        }
+        state_to_choice.resize(num_states);
+        for(uint64_t state = 0; state < num_states; ++state) {
+            selectChoice(state);
+        }
+        formula_state_values = std::vector<std::vector<ValueType>>(
+            formulae.size(), std::vector<ValueType>(num_states,storm::utility::zero<ValueType>())
+        );
+    }
+
+    template<typename ValueType>
+    void GrayCodeMemberChecker<ValueType>::selectChoice(uint64_t state) {
+        auto const& row_groups = quotient->getTransitionMatrix().getRowGroupIndices();
+        auto const& choice_to_assignment = coloring.getChoiceToAssignment();
+        for(uint64_t choice = row_groups[state]; choice < row_groups[state+1]; ++choice) {
+            bool compatible = true;
+            for(auto const& [hole,option]: choice_to_assignment[choice]) {
+                if(family.holeOptions(hole)[member_option_index[hole]] != option) {
+                    compatible = false;
+                    break;
+                }
+            }
+            if(compatible) {
+                state_to_choice[state] = choice;
+                return;
+            }
+        }
+        STORM_LOG_THROW(false, storm::exceptions::UnexpectedException, "no choice of a state is compatible with the member.");
+    }
+
+    template<typename ValueType>
+    void GrayCodeMemberChecker<ValueType>::nextMember() {
+        // find the fastest changing hole that can move in its direction, reflect the directions of faster holes
+        for(uint64_t hole = family.numHoles(); hole-- > 0;) {
+            uint64_t num_options = family.holeNumOptions(hole);
+            uint64_t& option_index = member_option_index[hole];
+            if(member_option_ascending[hole] and option_index+1 < num_options) {
+                option_index++;
+                member_index += hole_stride[hole];
+            } else if(not member_option_ascending[hole] and option_index > 0) {
+                option_index--;
+                member_index -= hole_stride[hole];
+            } else {
+                member_option_ascending[hole] = not member_option_ascending[hole];
+                continue;
+            }
+            for(uint64_t state: hole_to_states[hole]) {
+                selectChoice(state);
+            }
+            return;
+        }
+        all_members_checked = true;
+    }
+
+    template<typename ValueType>
+    std::tuple<std::vector<ValueType>,std::vector<uint64_t>,std::vector<uint64_t>>
+    GrayCodeMemberChecker<ValueType>::checkNextMembers(storm::Environment const& env, uint64_t num_members) {
+        std::vector<ValueType> values;
+        std::vector<uint64_t> member_indices;
+        std::vector<uint64_t> member_states;
+        while(not all_members_checked and member_indices.size() < num_members) {
+            storm::models::sparse::Dtmc<ValueType> dtmc = dtmc_builder.build(state_to_choice);
+            auto const& states = dtmc_builder.getStates();
+            uint64_t initial_state = *dtmc.getInitialStates().begin();
+            storm::modelchecker::SparseDtmcPrctlModelChecker<storm::models::sparse::Dtmc<ValueType>> modelchecker(dtmc);
+            for(uint64_t formula_index = 0; formula_index < formulae.size(); ++formula_index) {
+                // values of all states are needed to initialize model checking of the next member
+                storm::modelchecker::CheckTask<storm::logic::Formula, ValueType> task(*formulae[formula_index], false);
+                auto& state_values = formula_state_values[formula_index];
+                if(state_values_computed) {
+                    // states that were not reachable for the previous members keep their last value (or zero)
+                    std::vector<ValueType> hint_values(states.size());
+                    for(uint64_t dtmc_state = 0; dtmc_state < states.size(); ++dtmc_state) {
+                        hint_values[dtmc_state] = state_values[states[dtmc_state]];
+                    }
+                    auto hint = std::make_shared<storm::modelchecker::ExplicitModelCheckerHint<ValueType>>();
+                    hint->setResultHint(std::move(hint_values));
+                    task.setHint(hint);
+                }
+                auto result = modelchecker.check(env, task);
+                auto const& result_values = result->template asExplicitQuantitativeCheckResult<ValueType>().getValueVector();
+                values.push_back(result_values[initial_state]);
+                for(uint64_t dtmc_state = 0; dtmc_state < states.size(); ++dtmc_state) {
+                    // infinite values are not a valid starting point for the next member
+                    ValueType value = result_values[dtmc_state];
+                    if(value == storm::utility::infinity<ValueType>()) {
+                        value = storm::utility::zero<ValueType>();
+                    }
+                    state_values[states[dtmc_state]] = value;
+                }
+            }
+            member_indices.push_back(member_index);
+            member_states.push_back(dtmc.getNumberOfStates());
+            state_values_computed = true;
+            nextMember();
+        }
+        return std::make_tuple(values,member_indices,member_states);
+    }
+
+    template<typename ValueType>
+    bool GrayCodeMemberChecker<ValueType>::finished() const {
+        return all_members_checked;
+    }
+
+    template class GrayCodeMemberChecker<double>;
+}
@@ -0,0 +1,142 @@
+#pragma once
+
+#include "src/synthesis/quotient/Family.h"
+#include "src/synthesis/quotient/Coloring.h"
+
+#include "storm/environment/Environment.h"
+#include "storm/models/sparse/Mdp.h"
+#include "storm/models/sparse/Dtmc.h"
+#include "storm/logic/Formula.h"
+
+#include <cstdint>
+#include <memory>
+#include <tuple>
+#include <vector>
+
+namespace synthesis {
+
+    /**
+     * Builder of DTMCs induced by selecting a single choice in each state of the quotient. The DTMC contains only
+     * states reachable from the initial states. Buffers used for the exploration are kept across the builds, so
+     * that enumerating many members does not re-allocate them.
+     */
+    template<typename ValueType>
+    class InducedDtmcBuilder {
+    public:
+
+        InducedDtmcBuilder(storm::models::sparse::Mdp<ValueType> const& quotient);
+
+        /**
+         * Build the DTMC induced by the given choices.
+         * @param state_to_choice for each state of the quotient, its selected choice; the choices of unreachable
+         *  states are ignored
+         */
+        storm::models::sparse::Dtmc<ValueType> build(std::vector<uint64_t> const& state_to_choice);
+
+        /** States of the quotient contained in the last built DTMC, in the order of the states of the DTMC. */
+        std::vector<uint64_t> const& getStates() const;
+
+    protected:
+
+        storm::models::sparse::Mdp<ValueType> const& quotient;
+        /** States of the quotient reachable in the last built DTMC. */
+        BitVector reachable_states;
+        /** Reachable states of the quotient, sorted. */
+        std::vector<uint64_t> states;
+        /** For each reachable state of the quotient, the corresponding state of the DTMC. */
+        std::vector<uint64_t> state_to_dtmc_state;
+        /** Stack of states to explore. */
+        std::vector<uint64_t> state_stack;
+    };
+
+    /**
+     * Model check DTMCs induced by a batch of members of the family. Members are enumerated in the lexicographic
+     * order of hole options, where the last hole changes fastest.
+     * @param quotient the quotient MDP
+     * @param coloring coloring of the quotient
+     * @param family family to enumerate, members are its assignments
+     * @param formulae formulae to check, for each formula the value in the initial state is computed
+     * @param first_member index of the first member of the batch
+     * @param num_members number of members in the batch
+     * @return (1) a list of values, for each member the values of all formulae, (2) for each member, the number of
+     *  states of the induced DTMC
+     * @note the DTMC of each member is built anew, only the buffers used to build it are reused
+     */
+    template<typename ValueType>
+    std::pair<std::vector<ValueType>,std::vector<uint64_t>> verifyFamilyMembers(
+        storm::Environment const& env,
+        std::shared_ptr<storm::models::sparse::Mdp<ValueType>> const& quotient,
+        Coloring const& coloring,
+        Family const& family,
+        std::vector<std::shared_ptr<storm::logic::Formula>> const& formulae,
+        uint64_t first_member,
+        uint64_t num_members
+    );
+
+
+    /**
+     * Enumerator of family members in the reflected mixed-radix Gray-code order: two consecutive members differ in
+     * exactly one hole. The choice selected in each state of the quotient is maintained across the members, so when
+     * moving to the next member, only the choices of states colored by the changed hole are re-selected. The DTMC
+     * induced by the selected choices is then built anew (rows of a sparse matrix cannot be replaced in place when
+     * their lengths differ), and model checking of each formula is initialized with the state values obtained for the
+     * previous member.
+     */
+    template<typename ValueType>
+    class GrayCodeMemberChecker {
+    public:
+
+        GrayCodeMemberChecker(
+            std::shared_ptr<storm::models::sparse::Mdp<ValueType>> const& quotient,
+            Coloring const& coloring,
+            Family const& family,
+            std::vector<std::shared_ptr<storm::logic::Formula>> const& formulae
+        );
+
+        /**
+         * Model check the next batch of members.
+         * @return (1) a list of values, for each member the values of all formulae, (2) for each member, its index
+         *  in the lexicographic order of hole options (where the last hole changes fastest), (3) for each member, the
+         *  number of states of the induced DTMC
+         */
+        std::tuple<std::vector<ValueType>,std::vector<uint64_t>,std::vector<uint64_t>> checkNextMembers(
+            storm::Environment const& env, uint64_t num_members
+        );
+
+        /** Whether all members have been model checked. */
+        bool finished() const;
+
+    protected:
+
+        std::shared_ptr<storm::models::sparse::Mdp<ValueType>> quotient;
+        Coloring const& coloring;
+        Family family;
+        std::vector<std::shared_ptr<storm::logic::Formula>> formulae;
+
+        /** For each hole, the index of the current option in the list of options of this hole. */
+        std::vector<uint64_t> member_option_index;
+        /** For each hole, the direction in which the index of its option currently moves. */
+        std::vector<bool> member_option_ascending;
+        /** Index of the current member in the lexicographic order. */
+        uint64_t member_index;
+        /** For each hole, the difference of lexicographic indices of members that differ by one option of this hole. */
+        std::vector<uint64_t> hole_stride;
+        bool all_members_checked = false;
+
+        /** For each hole, states having choices colored by this hole. */
+        std::vector<std::vector<uint64_t>> hole_to_states;
+        /** For each state, its choice selected by the current member. */
+        std::vector<uint64_t> state_to_choice;
+        /** For each formula and for each state of the quotient, the last computed value of this state. */
+        std::vector<std::vector<ValueType>> formula_state_values;
+        /** Whether some member has been model checked, i.e. whether state values can be used as a hint. */
+        bool state_values_computed = false;
+        InducedDtmcBuilder<ValueType> dtmc_builder;
+
+        /** Select the choice of the state compatible with the current member. */
+        void selectChoice(uint64_t state);
+        /** Move to the next member in the Gray-code order. */
+        void nextMember();
+    };
+
+}
@@ -1,7 +1,23 @@
 #include "MdpModelChecker.h"
 
 #include "storm/modelchecker/prctl/SparseMdpPrctlModelChecker.h"
+#include "storm/modelchecker/prctl/helper/SparseMdpPrctlHelper.h"
+#include "storm/modelchecker/hints/ExplicitModelCheckerHint.h"
+#include "storm/modelchecker/results/ExplicitQualitativeCheckResult.h"
+#include "storm/modelchecker/results/ExplicitQuantitativeCheckResult.h"
+#include "storm/logic/FragmentSpecification.h"
+#include "storm/storage/StronglyConnectedComponentDecomposition.h"
+#include "storm/utility/constants.h"
+#include "storm/utility/graph.h"
+#include "storm/utility/macros.h"
+#include "storm/utility/vector.h"
+#include "storm/environment/solver/SolverEnvironment.h"
+#include "storm/environment/solver/MinMaxSolverEnvironment.h"
+#include "storm/solver/SolveGoal.h"
+#include "storm/solver/SolverSelectionOptions.h"
+#include "storm/solver/OptimizationDirection.h"
 #include "storm/exceptions/NotSupportedException.h"
+#include "storm/exceptions/InvalidArgumentException.h"
 
 namespace synthesis {
 
@@ -10,18 +26,331 @@ namespace synthesis {
         storm::Environment const& env,
         std::shared_ptr<storm::models::sparse::Mdp<ValueType>> const& mdp,
         storm::logic::Formula const& formula,
-        bool produce_schedulers
+        bool produce_schedulers,
+        std::vector<ValueType> const& result_hint
     ) {
         storm::modelchecker::CheckTask<storm::logic::Formula, ValueType> task(formula);
         task.setProduceSchedulers(produce_schedulers);
+        if(not result_hint.empty()) {
+            // initialize the solver with the given state values
+            auto hint = std::make_shared<storm::modelchecker::ExplicitModelCheckerHint<ValueType>>();
+            hint->setResultHint(result_hint);
+            task.setHint(hint);
+        }
         storm::modelchecker::SparseMdpPrctlModelChecker<storm::models::sparse::Mdp<ValueType>> modelchecker(*mdp);
         return modelchecker.check(env, task);
     }
 
+    template<typename ValueType>
+    MdpModelChecker<ValueType>::MdpModelChecker(std::shared_ptr<storm::models::sparse::Mdp<ValueType>> const& mdp)
+        : mdp(mdp) {}
+
+    template<typename ValueType>
+    storm::storage::SparseMatrix<ValueType> const& MdpModelChecker<ValueType>::getBackwardTransitions() {
+        if(not this->backward_transitions) {
+            this->backward_transitions = std::make_unique<storm::storage::SparseMatrix<ValueType>>(
+                this->mdp->getBackwardTransitions()
+            );
+        }
+        return *this->backward_transitions;
+    }
+
+    template<typename ValueType>
+    storm::storage::BitVector const& MdpModelChecker<ValueType>::getFormulaStates(
+        storm::Environment const& env, storm::logic::Formula const& formula
+    ) {
+        std::string key = formula.toString();
+        auto it = this->formula_states.find(key);
+        if(it == this->formula_states.end()) {
+            storm::modelchecker::SparseMdpPrctlModelChecker<storm::models::sparse::Mdp<ValueType>> modelchecker(*this->mdp);
+            auto result = modelchecker.check(env, formula);
+            it = this->formula_states.emplace(
+                key, result->asExplicitQualitativeCheckResult().getTruthValuesVector()
+            ).first;
+        }
+        return it->second;
+    }
+
+    template<typename ValueType>
+    void MdpModelChecker<ValueType>::setQuotientChecker(
+        std::shared_ptr<MdpModelChecker<ValueType>> const& quotient_checker,
+        std::vector<uint64_t> const& state_to_quotient_state
+    ) {
+        STORM_LOG_THROW(state_to_quotient_state.size() == this->mdp->getNumberOfStates(),
+            storm::exceptions::InvalidArgumentException, "state mapping does not match the number of states");
+        this->quotient_checker = quotient_checker;
+        this->state_to_quotient_state = state_to_quotient_state;
+        this->quotient_nontrivial_scc_states = this->projectQuotientStates(quotient_checker->getNontrivialSccStates());
+    }
+
+    template<typename ValueType>
+    std::pair<storm::storage::BitVector,storm::storage::BitVector> const& MdpModelChecker<ValueType>::getQualitativeStates(
+        storm::Environment const& env,
+        storm::logic::Formula const* phi_formula,
+        storm::logic::Formula const& psi_formula,
+        bool minimize
+    ) {
+        std::string key = (phi_formula != nullptr ? phi_formula->toString() : "true") + " U " + psi_formula.toString();
+        key += minimize ? " min" : " max";
+        auto it = this->qualitative_states.find(key);
+        if(it == this->qualitative_states.end()) {
+            storm::storage::BitVector phi_states(this->mdp->getNumberOfStates(), true);
+            if(phi_formula != nullptr) {
+                phi_states = this->getFormulaStates(env, *phi_formula);
+            }
+            storm::storage::BitVector const& psi_states = this->getFormulaStates(env, psi_formula);
+            auto const& transition_matrix = this->mdp->getTransitionMatrix();
+            auto const& row_groups = transition_matrix.getRowGroupIndices();
+            auto const& backward_transitions = this->getBackwardTransitions();
+            auto states = minimize
+                ? storm::utility::graph::performProb01Min(transition_matrix, row_groups, backward_transitions, phi_states, psi_states)
+                : storm::utility::graph::performProb01Max(transition_matrix, row_groups, backward_transitions, phi_states, psi_states);
+            it = this->qualitative_states.emplace(key, std::move(states)).first;
+        }
+        return it->second;
+    }
+
+    template<typename ValueType>
+    storm::storage::BitVector const& MdpModelChecker<ValueType>::getNontrivialSccStates() {
+        if(not this->nontrivial_scc_states) {
+            storm::storage::StronglyConnectedComponentDecomposition<ValueType> sccs(
+                this->mdp->getTransitionMatrix(), storm::storage::StronglyConnectedComponentDecompositionOptions().dropNaiveSccs()
+            );
+            this->nontrivial_scc_states = std::make_unique<storm::storage::BitVector>(this->mdp->getNumberOfStates(), false);
+            for(auto const& scc: sccs) {
+                for(auto state: scc) {
+                    this->nontrivial_scc_states->set(state, true);
+                }
+            }
+        }
+        return *this->nontrivial_scc_states;
+    }
+
+    template<typename ValueType>
+    storm::storage::BitVector MdpModelChecker<ValueType>::projectQuotientStates(
+        storm::storage::BitVector const& quotient_states
+    ) const {
+        storm::storage::BitVector states(this->mdp->getNumberOfStates(), false);
+        for(uint64_t state = 0; state < states.size(); ++state) {
+            if(quotient_states[this->state_to_quotient_state[state]]) {
+                states.set(state, true);
+            }
+        }
+        return states;
+    }
+
+    template<typename ValueType>
+    std::pair<storm::storage::BitVector,storm::storage::BitVector> MdpModelChecker<ValueType>::deriveQualitativeStates(
+        storm::Environment const& env,
+        storm::logic::Formula const* phi_formula,
+        storm::logic::Formula const& psi_formula,
+        storm::storage::BitVector const& phi_states,
+        storm::storage::BitVector const& psi_states,
+        bool minimize
+    ) {
+        auto const& [quotient_prob0, quotient_prob1] = this->quotient_checker->getQualitativeStates(
+            env, phi_formula, psi_formula, minimize
+        );
+        storm::storage::BitVector prob0 = this->projectQuotientStates(quotient_prob0);
+        storm::storage::BitVector prob1 = this->projectQuotientStates(quotient_prob1);
+        auto const& transition_matrix = this->mdp->getTransitionMatrix();
+        auto const& row_groups = transition_matrix.getRowGroupIndices();
+        auto const& backward_transitions = this->getBackwardTransitions();
+        if(minimize) {
+            // states outside of quotient prob0E reach psi-states with positive probability under every scheduler
+            storm::storage::BitVector states0 = storm::utility::graph::performProb0E(
+                transition_matrix, row_groups, backward_transitions, phi_states, psi_states | ~prob0
+            );
+            // states of quotient prob1A reach psi-states almost surely under every scheduler
+            storm::storage::BitVector states1 = storm::utility::graph::performProb1A(
+                transition_matrix, row_groups, backward_transitions, phi_states, psi_states | prob1
+            );
+            return std::make_pair(std::move(states0), std::move(states1));
+        }
+        // states of quotient prob0A cannot reach psi-states
+        storm::storage::BitVector states0 = storm::utility::graph::performProb0A(
+            backward_transitions, phi_states & ~prob0, psi_states
+        );
+        // states outside of quotient prob1E are never visited by a scheduler reaching psi-states almost surely
+        storm::storage::BitVector states1 = storm::utility::graph::performProb1E(
+            transition_matrix, row_groups, backward_transitions, phi_states & (prob1 | psi_states), psi_states
+        );
+        return std::make_pair(std::move(states0), std::move(states1));
+    }
+
+    template<typename ValueType>
+    bool MdpModelChecker<ValueType>::isSupported(storm::logic::Formula const& formula) {
+        if(not formula.isOperatorFormula() or not formula.asOperatorFormula().hasOptimalityType()) {
+            return false;
+        }
+        storm::logic::Formula const& subformula = formula.asOperatorFormula().getSubformula();
+        bool is_reachability_probability = formula.isProbabilityOperatorFormula() and
+            (subformula.isUntilFormula() or subformula.isEventuallyFormula());
+        bool is_reachability_reward = formula.isRewardOperatorFormula() and subformula.isReachabilityRewardFormula();
+        return is_reachability_probability or is_reachability_reward;
+    }
+
+    template<typename ValueType>
+    std::shared_ptr<storm::modelchecker::CheckResult> MdpModelChecker<ValueType>::check(
+        storm::Environment const& env,
+        storm::logic::Formula const& formula,
+        bool produce_scheduler,
+        std::vector<ValueType> const& result_hint
+    ) {
+        if(not this->isSupported(formula)) {
+            return verifyMdp<ValueType>(env, this->mdp, formula, produce_scheduler, result_hint);
+        }
+        storm::solver::SolveGoal<ValueType> goal(formula.asOperatorFormula().getOptimalityType());
+        return this->checkWithGoal(env, formula, std::move(goal), produce_scheduler, result_hint);
+    }
+
+    template<typename ValueType>
+    std::pair<std::shared_ptr<storm::modelchecker::CheckResult>,bool> MdpModelChecker<ValueType>::checkWithBound(
+        storm::Environment const& env,
+        storm::logic::Formula const& formula,
+        storm::logic::ComparisonType comparison_type,
+        ValueType threshold,
+        bool produce_scheduler,
+        std::vector<ValueType> const& result_hint
+    ) {
+        std::shared_ptr<storm::modelchecker::CheckResult> result;
+        if(not this->isSupported(formula)) {
+            result = verifyMdp<ValueType>(env, this->mdp, formula, produce_scheduler, result_hint);
+        } else {
+            // only the value in the initial state is relevant: the solver may stop once it meets the bound
+            bool minimize = storm::solver::minimize(formula.asOperatorFormula().getOptimalityType());
+            storm::solver::SolveGoal<ValueType> goal(minimize, comparison_type, threshold, this->mdp->getInitialStates());
+            result = this->checkWithGoal(env, formula, std::move(goal), produce_scheduler, result_hint);
+        }
+        // the returned value is only an approximation, possibly obtained after an early termination: the bound is
+        // guaranteed to hold only if the solver is sound and the value meets the bound with a margin of the precision
+        if(not isSoundEnvironment(env)) {
+            return std::make_pair(result, false);
+        }
+        uint64_t initial_state = *this->mdp->getInitialStates().begin();
+        ValueType value = result->template asExplicitQuantitativeCheckResult<ValueType>()[initial_state];
+        ValueType margin = storm::utility::convertNumber<ValueType>(env.solver().minMax().getPrecision());
+        if(env.solver().minMax().getRelativeTerminationCriterion()) {
+            margin *= storm::utility::abs(value);
+        }
+        bool meets_bound;
+        switch(comparison_type) {
+            case storm::logic::ComparisonType::Less: meets_bound = value + margin < threshold; break;
+            case storm::logic::ComparisonType::LessEqual: meets_bound = value + margin <= threshold; break;
+            case storm::logic::ComparisonType::Greater: meets_bound = value - margin > threshold; break;
+            default: meets_bound = value - margin >= threshold; break;
+        }
+        return std::make_pair(result, meets_bound);
+    }
+
+    template<typename ValueType>
+    bool MdpModelChecker<ValueType>::isSoundEnvironment(storm::Environment const& env) {
+        if(env.solver().isForceSoundness()) {
+            return true;
+        }
+        switch(env.solver().minMax().getMethod()) {
+            case storm::solver::MinMaxMethod::IntervalIteration:
+            case storm::solver::MinMaxMethod::SoundValueIteration:
+            case storm::solver::MinMaxMethod::OptimisticValueIteration:
+                return true;
+            default:
+                return false;
+        }
+    }
+
+    template<typename ValueType>
+    std::shared_ptr<storm::modelchecker::CheckResult> MdpModelChecker<ValueType>::checkWithGoal(
+        storm::Environment const& env,
+        storm::logic::Formula const& formula,
+        storm::solver::SolveGoal<ValueType>&& goal,
+        bool produce_scheduler,
+        std::vector<ValueType> const& result_hint
+    ) {
+        storm::logic::Formula const& subformula = formula.asOperatorFormula().getSubformula();
+        bool is_reachability_probability = formula.isProbabilityOperatorFormula();
+        std::unique_ptr<storm::modelchecker::ModelCheckerHint> hint = std::make_unique<storm::modelchecker::ModelCheckerHint>();
+        if(not result_hint.empty()) {
+            auto explicit_hint = std::make_unique<storm::modelchecker::ExplicitModelCheckerHint<ValueType>>();
+            explicit_hint->setResultHint(result_hint);
+            hint = std::move(explicit_hint);
+        }
+        auto const& transition_matrix = this->mdp->getTransitionMatrix();
+        auto const& backward_transitions = this->getBackwardTransitions();
+        bool qualitative = false;
+
+        auto helper_result = [&]() {
+            if(is_reachability_probability) {
+                storm::storage::BitVector phi_states(this->mdp->getNumberOfStates(), true);
+                storm::logic::Formula const* phi_formula = nullptr;
+                storm::logic::Formula const* target_formula;
+                if(subformula.isUntilFormula()) {
+                    phi_formula = &subformula.asUntilFormula().getLeftSubformula();
+                    phi_states = this->getFormulaStates(env, *phi_formula);
+                    target_formula = &subformula.asUntilFormula().getRightSubformula();
+                } else {
+                    target_formula = &subformula.asEventuallyFormula().getSubformula();
+                }
+                storm::storage::BitVector const& psi_states = this->getFormulaStates(env, *target_formula);
+                // states satisfying non-propositional subformulae may differ from the quotient
+                bool propositional = target_formula->isInFragment(storm::logic::propositional()) and
+                    (phi_formula == nullptr or phi_formula->isInFragment(storm::logic::propositional()));
+                // the derived state sets are exact also for cyclic models; end components of the maybe states are
+                // then handled by the helper unless the quotient shows there are none
+                bool use_quotient_analysis = this->quotient_checker and propositional;
+                if(use_quotient_analysis) {
+                    auto [prob0_states, prob1_states] = this->deriveQualitativeStates(
+                        env, phi_formula, *target_formula, phi_states, psi_states, goal.minimize()
+                    );
+                    storm::storage::BitVector maybe_states = ~(prob0_states | prob1_states);
+                    // end components of this MDP are contained in non-trivial SCCs of the quotient
+                    bool no_end_components = (maybe_states & this->quotient_nontrivial_scc_states).empty();
+                    // the values of non-maybe states are passed via the result hint, maybe states start from the
+                    // given values or from zero (a lower bound, as in the helper without a hint)
+                    std::vector<ValueType> values = result_hint;
+                    values.resize(this->mdp->getNumberOfStates(), storm::utility::zero<ValueType>());
+                    storm::utility::vector::setVectorValues(values, prob0_states, storm::utility::zero<ValueType>());
+                    storm::utility::vector::setVectorValues(values, prob1_states, storm::utility::one<ValueType>());
+                    auto qualitative_hint = std::make_unique<storm::modelchecker::ExplicitModelCheckerHint<ValueType>>();
+                    qualitative_hint->setResultHint(std::move(values));
+                    qualitative_hint->setComputeOnlyMaybeStates(true);
+                    qualitative_hint->setMaybeStates(std::move(maybe_states));
+                    qualitative_hint->setNoEndComponentsInMaybeStates(no_end_components);
+                    hint = std::move(qualitative_hint);
+                }
+                return storm::modelchecker::helper::SparseMdpPrctlHelper<ValueType>::computeUntilProbabilities(
+                    env, std::move(goal), transition_matrix, backward_transitions, phi_states, psi_states,
+                    qualitative, produce_scheduler, *hint
+                );
+            }
+            storm::logic::RewardOperatorFormula const& reward_formula = formula.asRewardOperatorFormula();
+            auto const& reward_model = reward_formula.hasRewardModelName()
+                ? this->mdp->getRewardModel(reward_formula.getRewardModelName())
+                : this->mdp->getUniqueRewardModel();
+            storm::storage::BitVector const& target_states = this->getFormulaStates(
+                env, subformula.asEventuallyFormula().getSubformula()
+            );
+            return storm::modelchecker::helper::SparseMdpPrctlHelper<ValueType>::computeReachabilityRewards(
+                env, std::move(goal), transition_matrix, backward_transitions, reward_model, target_states,
+                qualitative, produce_scheduler, *hint
+            );
+        }();
+
+        auto result = std::make_shared<storm::modelchecker::ExplicitQuantitativeCheckResult<ValueType>>(
+            std::move(helper_result.values)
+        );
+        if(produce_scheduler and helper_result.scheduler) {
+            result->setScheduler(std::move(helper_result.scheduler));
+        }
+        return result;
+    }
+
+    template class MdpModelChecker<double>;
+
     template std::shared_ptr<storm::modelchecker::CheckResult> verifyMdp<double>(
         storm::Environment const& env,
         std::shared_ptr<storm::models::sparse::Mdp<double>> const& mdp,
         storm::logic::Formula const& formula,
-        bool produce_schedulers
+        bool produce_schedulers,
+        std::vector<double> const& result_hint
     );
 }
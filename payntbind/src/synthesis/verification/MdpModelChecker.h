@@ -4,6 +4,12 @@
 #include "storm/models/sparse/Mdp.h"
 #include "storm/modelchecker/CheckTask.h"
 #include "storm/modelchecker/results/CheckResult.h"
+#include "storm/storage/BitVector.h"
+#include "storm/storage/SparseMatrix.h"
+#include "storm/logic/ComparisonType.h"
+#include "storm/solver/SolveGoal.h"
+
+#include <unordered_map>
 
 namespace synthesis {
 
@@ -12,7 +18,129 @@ namespace synthesis {
         storm::Environment const& env,
         std::shared_ptr<storm::models::sparse::Mdp<ValueType>> const& mdp,
         storm::logic::Formula const& formula,
-        bool produce_schedulers
+        bool produce_schedulers,
+        std::vector<ValueType> const& result_hint = {}
     );
 
+    /**
+     * Model checker of a single MDP that shares preprocessing among several calls: the backward transition matrix
+     * and the state sets of state subformulae are computed once and are reused for all properties and for both
+     * optimization directions. Reachability probabilities (until/eventually) and reachability rewards are computed
+     * directly via the MDP helper, other formulae are passed to the standard model checker.
+     *
+     * If the MDP is a choice-restriction of a quotient MDP, the qualitative analysis (prob0/prob1 state sets) of
+     * reachability probabilities can be derived from the one of the quotient, see setQuotientChecker().
+     */
+    template<typename ValueType>
+    class MdpModelChecker {
+    public:
+
+        MdpModelChecker(std::shared_ptr<storm::models::sparse::Mdp<ValueType>> const& mdp);
+
+        /**
+         * Model check an operator formula.
+         * @param produce_scheduler if true, an optimal scheduler will be extracted
+         * @param result_hint if not empty, state values used to initialize the solver
+         */
+        std::shared_ptr<storm::modelchecker::CheckResult> check(
+            storm::Environment const& env,
+            storm::logic::Formula const& formula,
+            bool produce_scheduler,
+            std::vector<ValueType> const& result_hint = {}
+        );
+
+        /**
+         * Model check an operator formula with a solver that may terminate as soon as the value in the initial state
+         * meets the given bound. Values in other states and the scheduler might therefore be imprecise.
+         * @param comparison_type comparison type of the bound
+         * @param threshold threshold of the bound
+         * @return a pair (result,flag), where flag is true only if the bound is guaranteed to hold: the environment
+         *  uses a sound solver and the value in the initial state meets the bound with a margin of the solver
+         *  precision; if the flag is false, nothing is known about the bound beyond the (approximate) value
+         */
+        std::pair<std::shared_ptr<storm::modelchecker::CheckResult>,bool> checkWithBound(
+            storm::Environment const& env,
+            storm::logic::Formula const& formula,
+            storm::logic::ComparisonType comparison_type,
+            ValueType threshold,
+            bool produce_scheduler,
+            std::vector<ValueType> const& result_hint = {}
+        );
+
+        /**
+         * Derive the qualitative analysis of reachability probabilities from the one of the quotient MDP, of which
+         * this MDP is a choice-restriction.
+         * @param quotient_checker model checker of the quotient MDP, shared among all its sub-MDPs
+         * @param state_to_quotient_state for each state of this MDP, the corresponding state of the quotient
+         */
+        void setQuotientChecker(
+            std::shared_ptr<MdpModelChecker<ValueType>> const& quotient_checker,
+            std::vector<uint64_t> const& state_to_quotient_state
+        );
+
+        /**
+         * Compute (and cache) the states having the optimal probability of phi-until-psi equal to 0 and 1,
+         * respectively, i.e. (prob0E,prob1A) for minimization and (prob0A,prob1E) for maximization.
+         * @param phi_formula left subformula of the until formula, nullptr for eventually formulae
+         */
+        std::pair<storm::storage::BitVector,storm::storage::BitVector> const& getQualitativeStates(
+            storm::Environment const& env,
+            storm::logic::Formula const* phi_formula,
+            storm::logic::Formula const& psi_formula,
+            bool minimize
+        );
+
+        /** States contained in non-trivial SCCs, i.e. states that might be a part of some end component. */
+        storm::storage::BitVector const& getNontrivialSccStates();
+
+    protected:
+
+        std::shared_ptr<storm::models::sparse::Mdp<ValueType>> mdp;
+        // backward transitions of the MDP, computed upon first use
+        std::unique_ptr<storm::storage::SparseMatrix<ValueType>> backward_transitions;
+        // for each state subformula (identified by its string representation), states satisfying it
+        std::unordered_map<std::string,storm::storage::BitVector> formula_states;
+        // for each until formula and optimization direction, the states with probability 0 and 1
+        std::unordered_map<std::string,std::pair<storm::storage::BitVector,storm::storage::BitVector>> qualitative_states;
+        // states of non-trivial SCCs, computed upon first use
+        std::unique_ptr<storm::storage::BitVector> nontrivial_scc_states;
+
+        // model checker of the quotient this MDP is a choice-restriction of, or nullptr
+        std::shared_ptr<MdpModelChecker<ValueType>> quotient_checker;
+        std::vector<uint64_t> state_to_quotient_state;
+        // states whose quotient state belongs to a non-trivial SCC of the quotient
+        storm::storage::BitVector quotient_nontrivial_scc_states;
+
+        storm::storage::SparseMatrix<ValueType> const& getBackwardTransitions();
+        /** @return true if the min-max solver of the environment provides sound bounds on the values */
+        static bool isSoundEnvironment(storm::Environment const& env);
+        /** @return true if the formula can be checked via the MDP helper */
+        bool isSupported(storm::logic::Formula const& formula);
+        /** Check a supported formula wrt. the given goal. */
+        std::shared_ptr<storm::modelchecker::CheckResult> checkWithGoal(
+            storm::Environment const& env,
+            storm::logic::Formula const& formula,
+            storm::solver::SolveGoal<ValueType>&& goal,
+            bool produce_scheduler,
+            std::vector<ValueType> const& result_hint
+        );
+        storm::storage::BitVector const& getFormulaStates(storm::Environment const& env, storm::logic::Formula const& formula);
+        /**
+         * Compute the states with probability 0 and 1 from the ones of the quotient. Restricting choices can only
+         * shrink prob0E and prob1E and extend prob0A and prob1A, hence the quotient sets (projected onto this MDP)
+         * are used to shrink phi-states or to extend psi-states, which does not change the resulting sets. This holds
+         * for cyclic MDPs as well.
+         */
+        std::pair<storm::storage::BitVector,storm::storage::BitVector> deriveQualitativeStates(
+            storm::Environment const& env,
+            storm::logic::Formula const* phi_formula,
+            storm::logic::Formula const& psi_formula,
+            storm::storage::BitVector const& phi_states,
+            storm::storage::BitVector const& psi_states,
+            bool minimize
+        );
+        /** @return the states of this MDP whose quotient state satisfies the quotient state set */
+        storm::storage::BitVector projectQuotientStates(storm::storage::BitVector const& quotient_states) const;
+    };
+
 }
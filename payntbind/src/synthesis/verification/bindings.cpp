@@ -0,0 +1,87 @@
+#include "../synthesis.h"
+
+#include "MdpModelChecker.h"
+#include "FamilyMembers.h"
+
+#include <pybind11/numpy.h>
+
+void bindings_verification(py::module& m) {
+
+    m.def("verify_mdp", &synthesis::verifyMdp<double>,
+        "Model check an MDP, optionally initializing the solver with the given state values.",
+        py::arg("env"), py::arg("mdp"), py::arg("formula"), py::arg("produce_schedulers"), py::arg("result_hint")
+    );
+
+    py::class_<synthesis::MdpModelChecker<double>, std::shared_ptr<synthesis::MdpModelChecker<double>>>(m, "MdpModelChecker",
+            "Model checker of an MDP sharing preprocessing among properties and optimization directions.")
+        .def(py::init<std::shared_ptr<storm::models::sparse::Mdp<double>> const&>(), py::arg("mdp"))
+        .def("check", &synthesis::MdpModelChecker<double>::check,
+            py::arg("env"), py::arg("formula"), py::arg("produce_scheduler"), py::arg("result_hint")
+        )
+        .def("check_with_bound", &synthesis::MdpModelChecker<double>::checkWithBound,
+            "Model check the formula and stop as soon as the value in the initial state meets the bound. Returns a "
+            "pair (result,flag), where flag is True only if a sound solver guarantees that the bound is met.",
+            py::arg("env"), py::arg("formula"), py::arg("comparison_type"), py::arg("threshold"),
+            py::arg("produce_scheduler"), py::arg("result_hint")
+        )
+        .def("set_quotient_checker", &synthesis::MdpModelChecker<double>::setQuotientChecker,
+            "Derive the qualitative analysis of reachability probabilities from the model checker of the quotient, "
+            "of which this MDP is a choice-restriction.",
+            py::arg("quotient_checker"), py::arg("state_to_quotient_state")
+        )
+        ;
+
+    m.def("verify_family_members", [](
+            storm::Environment const& env,
+            std::shared_ptr<storm::models::sparse::Mdp<double>> const& quotient,
+            synthesis::Coloring const& coloring,
+            synthesis::Family const& family,
+            std::vector<std::shared_ptr<storm::logic::Formula>> const& formulae,
+            uint64_t first_member,
+            uint64_t num_members
+        ) {
+            auto [values,member_states] = synthesis::verifyFamilyMembers<double>(
+                env, quotient, coloring, family, formulae, first_member, num_members
+            );
+            py::array_t<double> values_array({num_members, (uint64_t)formulae.size()});
+            std::copy(values.begin(), values.end(), values_array.mutable_data());
+            py::array_t<uint64_t> states_array(num_members);
+            std::copy(member_states.begin(), member_states.end(), states_array.mutable_data());
+            return std::make_pair(values_array,states_array);
+        },
+        "Model check DTMCs induced by a batch of family members. Returns a (members x formulae) array of values and "
+        "an array of DTMC sizes.",
+        py::arg("env"), py::arg("quotient"), py::arg("coloring"), py::arg("family"), py::arg("formulae"),
+        py::arg("first_member"), py::arg("num_members")
+    );
+
+    py::class_<synthesis::GrayCodeMemberChecker<double>>(m, "GrayCodeMemberChecker")
+        .def(py::init<
+                std::shared_ptr<storm::models::sparse::Mdp<double>> const&, synthesis::Coloring const&,
+                synthesis::Family const&, std::vector<std::shared_ptr<storm::logic::Formula>> const&
+            >(),
+            py::arg("quotient"), py::arg("coloring"), py::arg("family"), py::arg("formulae"),
+            // the checker keeps a reference to the coloring
+            py::keep_alive<1,3>()
+        )
+        .def("check_next_members", [](
+                synthesis::GrayCodeMemberChecker<double>& checker, storm::Environment const& env, uint64_t num_members
+            ) {
+                auto [values,member_indices,member_states] = checker.checkNextMembers(env, num_members);
+                uint64_t num_checked = member_indices.size();
+                uint64_t num_formulae = num_checked > 0 ? values.size() / num_checked : 0;
+                py::array_t<double> values_array({num_checked, num_formulae});
+                std::copy(values.begin(), values.end(), values_array.mutable_data());
+                py::array_t<uint64_t> indices_array(num_checked);
+                std::copy(member_indices.begin(), member_indices.end(), indices_array.mutable_data());
+                py::array_t<uint64_t> states_array(num_checked);
+                std::copy(member_states.begin(), member_states.end(), states_array.mutable_data());
+                return std::make_tuple(values_array,indices_array,states_array);
+            },
+            "Model check the next batch of members. Returns a (members x formulae) array of values, an array of "
+            "lexicographic indices of the members and an array of the numbers of states of their DTMCs.",
+            py::arg("env"), py::arg("num_members")
+        )
+        .def_property_readonly("finished", &synthesis::GrayCodeMemberChecker<double>::finished)
+        ;
+}
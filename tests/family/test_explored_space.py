@@ -0,0 +1,94 @@
+import paynt.parser.sketch as sketch
+import paynt.family.explored_space
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+ExploredSpace = paynt.family.explored_space.ExploredSpace
+
+def load_family():
+    sketch_path, props_path = get_sketch_paths("dtmc/coin")
+    return sketch.Sketch.load_sketch(sketch_path, props_path).family
+
+def first_assignment(family):
+    return family.construct_assignment(next(family.all_combinations()))
+
+class TestExploredSpace:
+
+    def test_overlapping_conflicts_are_counted_once(self):
+        # setup
+        family = load_family()
+        explored_space = ExploredSpace(family)
+        assignment = first_assignment(family)
+
+        # test
+        pruned_0 = explored_space.explore_conflicts(family, assignment, [[0]], pruning_estimate=0)
+        pruned_01 = explored_space.explore_conflicts(family, assignment, [[0,1]], pruning_estimate=0)
+        pruned_1 = explored_space.explore_conflicts(family, assignment, [[1]], pruning_estimate=0)
+
+        # assert
+        assert explored_space.exact
+        assert pruned_0 == family.size // family.hole_num_options(0)
+        assert pruned_01 == 0
+        assert pruned_1 == family.size // family.hole_num_options(1) - pruned_0 // family.hole_num_options(1)
+
+    def test_estimate_is_used_if_there_are_too_many_boxes(self, monkeypatch):
+        # setup
+        monkeypatch.setattr(ExploredSpace, "max_boxes", 1)
+        family = load_family()
+        explored_space = ExploredSpace(family)
+        assignment = first_assignment(family)
+        explored_space.explore_conflicts(family, assignment, [[0]], pruning_estimate=0)
+
+        # test
+        pruned = explored_space.explore_conflicts(family, assignment, [[1]], pruning_estimate=7)
+
+        # assert
+        assert not explored_space.exact
+        assert pruned == 7
+
+    def test_conflicts_counted_before_abandoning_are_not_counted_twice(self, monkeypatch):
+        # setup
+        monkeypatch.setattr(ExploredSpace, "max_boxes", 1)
+        family = load_family()
+        explored_space = ExploredSpace(family)
+        assignment = first_assignment(family)
+        pruned_0 = family.size // family.hole_num_options(0)
+
+        # test
+        pruned = explored_space.explore_conflicts(family, assignment, [[0],[1]], pruning_estimate=pruned_0+3)
+
+        # assert
+        assert not explored_space.exact
+        assert pruned == pruned_0+3
+        assert explored_space.explored == pruned_0+3
+
+    def test_underestimate_does_not_undo_exact_counting(self, monkeypatch):
+        # setup
+        monkeypatch.setattr(ExploredSpace, "max_boxes", 1)
+        family = load_family()
+        explored_space = ExploredSpace(family)
+        assignment = first_assignment(family)
+
+        # test
+        pruned = explored_space.explore_conflicts(family, assignment, [[0],[1]], pruning_estimate=1)
+
+        # assert
+        assert not explored_space.exact
+        assert pruned == family.size // family.hole_num_options(0)
+
+    def test_families_are_capped_once_exact_counting_is_abandoned(self, monkeypatch):
+        # setup
+        monkeypatch.setattr(ExploredSpace, "max_boxes", 1)
+        family = load_family()
+        explored_space = ExploredSpace(family)
+        assignment = first_assignment(family)
+        explored_space.explore_conflicts(family, assignment, [[0],[1]], pruning_estimate=family.size-1)
+
+        # test
+        pruned = explored_space.explore_family(family)
+
+        # assert
+        assert pruned == 1
+        assert explored_space.explored == family.size
@@ -0,0 +1,136 @@
+import paynt.family.frontier as frontier
+import paynt.parser.sketch as sketch
+import paynt.synthesizer.synthesizer_ar
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+def analyzed_subfamilies():
+    ''' :return the quotient family analyzed by AR and its subfamilies '''
+    sketch_path, props_path = get_sketch_paths("dtmc/maze/concise")
+    quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+    synthesizer = paynt.synthesizer.synthesizer_ar.SynthesizerAR(quotient)
+    family = quotient.family
+    quotient.build(family)
+    synthesizer.check_specification(family)
+    return family, synthesizer.split(family)
+
+class TestFrontier:
+
+    @pytest.mark.parametrize("exploration_order,frontier_type", [
+        ("dfs", frontier.FrontierDfs), ("bfs", frontier.FrontierBfs), ("best-first", frontier.FrontierBestFirst)
+    ])
+    def test_choose_frontier(self, exploration_order, frontier_type):
+        # test
+        families = frontier.Frontier.choose_frontier(exploration_order)
+
+        # assert
+        assert type(families) is frontier_type
+        assert len(families) == 0
+
+    def test_invalid_exploration_order_is_rejected(self):
+        with pytest.raises(ValueError):
+            frontier.Frontier.choose_frontier("random")
+
+    def test_dfs_explores_most_recent_family_first(self):
+        # setup
+        families = frontier.FrontierDfs()
+
+        # test
+        families.push("a")
+        families.push_subfamilies(None, ["b1", "b2"])
+
+        # assert
+        assert families.families() == ["a", "b1", "b2"]
+        assert [families.pop() for _ in range(len(families))] == ["b2", "b1", "a"]
+
+    def test_bfs_explores_least_recent_family_first(self):
+        # setup
+        families = frontier.FrontierBfs()
+
+        # test
+        families.push("a")
+        families.push_subfamilies(None, ["b1", "b2"])
+
+        # assert
+        assert families.families() == ["a", "b1", "b2"]
+        assert [families.pop() for _ in range(len(families))] == ["a", "b1", "b2"]
+
+    def test_best_first_priority_follows_parent_bound(self):
+        # setup
+        family, subfamilies = analyzed_subfamilies()
+        result = family.analysis_result.undecided_result()
+        assert result.prop.minimizing
+
+        # test
+        priority = frontier.FrontierBestFirst.family_priority(family)
+
+        # assert
+        assert priority == result.primary.value
+        assert frontier.FrontierBestFirst.family_priority(None) == 0
+        assert frontier.FrontierBestFirst.family_priority(subfamilies[0]) == 0
+
+    def test_best_first_explores_subfamilies_of_best_parent_first(self):
+        # setup
+        family, subfamilies = analyzed_subfamilies()
+        families = frontier.FrontierBestFirst()
+        worse_priority = frontier.FrontierBestFirst.family_priority(family) + 1
+
+        # test
+        families.push_subfamilies_with_priority(worse_priority, ["worse"])
+        families.push_subfamilies(family, subfamilies)
+
+        # assert
+        popped = [families.pop() for _ in range(len(families))]
+        assert popped == list(reversed(subfamilies)) + ["worse"]
+
+    def test_best_first_orders_subfamilies_by_priority(self):
+        # setup
+        families = frontier.FrontierBestFirst()
+
+        # test
+        families.push_subfamilies_with_priority(2, ["a1", "a2"])
+        families.push_subfamilies_with_priority(1, ["b1", "b2"])
+        families.push_subfamilies_with_priority(3, ["c1"])
+
+        # assert
+        assert [families.pop() for _ in range(len(families))] == ["b2", "b1", "a2", "a1", "c1"]
+
+    def test_dfs_ignores_priority(self):
+        # setup
+        families = frontier.FrontierDfs()
+
+        # test
+        families.push_subfamilies_with_priority(2, ["a1", "a2"])
+        families.push_subfamilies_with_priority(1, ["b1"])
+
+        # assert
+        assert [families.pop() for _ in range(len(families))] == ["b1", "a2", "a1"]
+
+    def test_spilling_provides_spilled_families_in_chunks(self):
+        # setup
+        sketch_path, props_path = get_sketch_paths("dtmc/maze/concise")
+        family = sketch.Sketch.load_sketch(sketch_path, props_path).family
+        subfamilies = [family]
+        for hole in [hole for hole in range(family.num_holes) if family.hole_num_options(hole) > 1][:3]:
+            subfamilies = [
+                subsubfamily for subfamily in subfamilies
+                for subsubfamily in subfamily.split(hole, [[option] for option in subfamily.hole_options(hole)])
+            ]
+        default_limit = frontier.FrontierSpilling.max_families_in_memory
+        frontier.FrontierSpilling.max_families_in_memory = 2
+        try:
+            families = frontier.FrontierSpilling(family)
+
+            # test
+            for subfamily in subfamilies:
+                families.push(subfamily)
+            chunks = list(families.family_chunks())
+        finally:
+            frontier.FrontierSpilling.max_families_in_memory = default_limit
+
+        # assert
+        assert len(chunks) > 1
+        assert all(isinstance(data, bytes) for chunk in chunks[:-1] for data in chunk)
+        assert sum(len(chunk) for chunk in chunks) == len(families) == len(subfamilies)
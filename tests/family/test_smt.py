@@ -0,0 +1,146 @@
+import paynt.parser.sketch as sketch
+import paynt.family.smt
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+SmtSolver = paynt.family.smt.SmtSolver
+
+@pytest.fixture
+def solver_name():
+    default_solver_name = SmtSolver.solver_name
+    yield
+    SmtSolver.solver_name = default_solver_name
+
+def enumerate_members(solver_name, conflicts):
+    '''
+    Exclude the conflicts and then enumerate the remaining members, each picked member is excluded afterwards.
+    :param conflicts a list of pairs (member index in all_combinations(), holes of the conflict)
+    :return a list of picked members
+    '''
+    sketch_path, props_path = get_sketch_paths("dtmc/coin")
+    family = sketch.Sketch.load_sketch(sketch_path, props_path).family
+    SmtSolver.solver_name = solver_name
+    solver = SmtSolver(family)
+    family.encode(solver)
+    combinations = list(family.all_combinations())
+    for member,holes in conflicts:
+        assignment = family.construct_assignment(combinations[member])
+        solver.exclude_conflict(family, assignment, holes)
+
+    members = []
+    while True:
+        assignment = solver.pick_assignment(family)
+        if assignment is None:
+            break
+        members.append(str(assignment))
+        solver.exclude_conflict(family, assignment, range(family.num_holes))
+    return members
+
+def create_solver(solver_name):
+    if solver_name == "z3":
+        pytest.importorskip("z3")
+    sketch_path, props_path = get_sketch_paths("dtmc/coin")
+    family = sketch.Sketch.load_sketch(sketch_path, props_path).family
+    SmtSolver.solver_name = solver_name
+    solver = SmtSolver(family)
+    family.encode(solver)
+    return family, solver
+
+def remaining_members(solver, family):
+    ''' Enumerate the members of the family that were not excluded, each picked member is excluded afterwards. '''
+    members = []
+    while True:
+        assignment = solver.pick_assignment(family)
+        if assignment is None:
+            return members
+        members.append(str(assignment))
+        solver.exclude_conflict(family, assignment, range(family.num_holes))
+
+def conflict_members(family, assignment, conflict):
+    ''' :return members of the family that agree with the assignment on the holes of the conflict '''
+    hole_options = [
+        assignment.hole_options(hole) if hole in conflict else family.hole_options(hole)
+        for hole in range(family.num_holes)
+    ]
+    return family.assume_options_copy(hole_options).size
+
+class TestSmtSolver:
+
+    CONFLICTS = [(0, [0,1]), (17, [2]), (100, [3,4,5]), (431, [0,2,4]), (899, [5])]
+
+    def test_native_enumerator_matches_z3(self, solver_name):
+        # setup
+        pytest.importorskip("z3")
+        expected_members = enumerate_members("z3", TestSmtSolver.CONFLICTS)
+
+        # test
+        members = enumerate_members("native", TestSmtSolver.CONFLICTS)
+
+        # assert
+        assert len(members) == len(set(members))
+        assert sorted(members) == sorted(expected_members)
+
+    def test_native_enumerator_excludes_everything(self, solver_name):
+        # test
+        members = enumerate_members("native", [(0, [])])
+
+        # assert
+        assert members == []
+
+    def test_z3_is_default(self):
+        assert SmtSolver.solver_name == "z3"
+
+    @pytest.mark.parametrize("name", ["native", "z3"])
+    def test_global_conflict_survives_pop(self, solver_name, name):
+        # setup
+        family, solver = create_solver(name)
+        assignment = family.construct_assignment(next(family.all_combinations()))
+        conflict = [0,1]
+        solver.level(1)
+        solver.exclude_conflict(family, assignment, conflict)
+
+        # test
+        # pop the scope in which the conflict was excluded
+        solver.level(1)
+        members = remaining_members(solver, family)
+
+        # assert
+        assert len(members) == family.size - conflict_members(family, assignment, conflict)
+
+    @pytest.mark.parametrize("name", ["native", "z3"])
+    def test_restricted_conflict_is_popped(self, solver_name, name):
+        # setup
+        family, solver = create_solver(name)
+        hole = next(hole for hole in range(family.num_holes) if family.hole_num_options(hole) > 1)
+        subfamily = family.assume_hole_options_copy(hole, family.hole_options(hole)[:1])
+        subfamily.encode(solver)
+        assignment = subfamily.construct_assignment(next(subfamily.all_combinations()))
+        solver.level(1)
+        solver.exclude_conflict(subfamily, assignment, [(hole+1) % family.num_holes])
+
+        # test
+        solver.level(1)
+        members = remaining_members(solver, family)
+
+        # assert
+        assert solver.global_conflicts == set()
+        assert len(members) == family.size
+
+    @pytest.mark.parametrize("name", ["native", "z3"])
+    def test_duplicate_global_conflict_is_not_counted(self, solver_name, name):
+        # setup
+        family, solver = create_solver(name)
+        assignment = family.construct_assignment(next(family.all_combinations()))
+
+        # test
+        pruned = solver.exclude_conflict(family, assignment, [0,1])
+        solver.level(1)
+        pruned_again = solver.exclude_conflict(family, assignment, [1,0])
+
+        # assert
+        assert pruned == conflict_members(family, assignment, [0,1])
+        assert pruned_again == 0
+        assert len(solver.global_conflicts) == 1
+        assert solver.persistent_conflicts == []
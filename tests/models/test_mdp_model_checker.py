@@ -0,0 +1,29 @@
+import paynt.parser.sketch as sketch
+
+import stormpy
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+class TestMdpModelChecker:
+
+    @pytest.mark.parametrize("project_path", ["dtmc/coin", "dtmc/grid/safety"])
+    def test_shared_checker_matches_standard_model_checking(self, project_path):
+        # setup
+        sketch_path, props_path = get_sketch_paths(project_path)
+        quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+        family = quotient.family.copy()
+        quotient.build(family)
+        mdp = family.mdp
+
+        for prop in quotient.specification.all_properties():
+            for alt in [False, True]:
+                # test
+                # both directions of all properties are checked by the same checker, sharing its preprocessing
+                result = mdp.model_check_property(prop, alt=alt)
+                formula = prop.formula if not alt else prop.formula_alt
+                expected = stormpy.model_checking(mdp.model, formula)
+
+                # assert
+                assert result.value == pytest.approx(expected.at(mdp.initial_state), rel=1e-3)
+        assert mdp.model_checker is not None
@@ -0,0 +1,85 @@
+import paynt.parser.sketch as sketch
+import paynt.verification.result_cache
+
+import itertools
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+def load_quotient():
+    sketch_path, props_path = get_sketch_paths("dtmc/coin")
+    return sketch.Sketch.load_sketch(sketch_path, props_path)
+
+def check_fresh(quotient, assignment):
+    dtmc = quotient.build_assignment(assignment)
+    return dtmc.check_specification(quotient.specification)
+
+def property_values(spec_result):
+    values = [result.value for result in spec_result.constraints_result.results]
+    return values + [spec_result.optimality_result.value]
+
+class TestAssignmentResultCache:
+
+    def test_cached_result_matches_fresh_check(self):
+        # setup
+        quotient = load_quotient()
+        cache = quotient.assignment_result_cache
+        assignment = quotient.family.pick_any()
+
+        # test
+        first_result,first_dtmc = quotient.check_assignment(assignment)
+        second_result,second_dtmc = quotient.check_assignment(assignment.copy())
+
+        # assert
+        assert first_dtmc is not None
+        assert second_dtmc is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        expected_values = property_values(check_fresh(quotient, assignment))
+        assert property_values(first_result) == pytest.approx(expected_values)
+        assert property_values(second_result) == pytest.approx(expected_values)
+
+    def test_verdicts_follow_the_optimum(self):
+        # setup
+        quotient = load_quotient()
+        optimality = quotient.specification.optimality
+        assignment = quotient.family.pick_any()
+        result,_ = quotient.check_assignment(assignment)
+        assert result.optimality_result.improves_optimum
+
+        # test
+        optimality.update_optimum(result.optimality_result.value)
+        result,dtmc = quotient.check_assignment(assignment)
+
+        # assert
+        assert dtmc is None
+        assert not result.optimality_result.improves_optimum
+
+    def test_least_recently_used_assignment_is_evicted(self, monkeypatch):
+        # setup
+        monkeypatch.setattr(paynt.verification.result_cache.AssignmentResultCache, "capacity", 2)
+        quotient = load_quotient()
+        combinations = itertools.islice(quotient.family.all_combinations(), 3)
+        first,second,third = [quotient.family.construct_assignment(combination) for combination in combinations]
+
+        # test
+        for assignment in [first, second, first, third]:
+            quotient.check_assignment(assignment)
+        _,first_dtmc = quotient.check_assignment(first)
+        _,second_dtmc = quotient.check_assignment(second)
+
+        # assert
+        assert first_dtmc is None
+        assert second_dtmc is not None
+
+    def test_cache_is_cleared_when_the_specification_changes(self):
+        # setup
+        quotient = load_quotient()
+        assignment = quotient.family.pick_any()
+        quotient.check_assignment(assignment)
+
+        # test
+        quotient.specification = quotient.specification.copy()
+        _,dtmc = quotient.check_assignment(assignment)
+
+        # assert
+        assert dtmc is not None
@@ -0,0 +1,85 @@
+import paynt.parser.sketch as sketch
+import paynt.quotient.quotient
+import paynt.verification.property
+
+import math
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+Quotient = paynt.quotient.quotient.Quotient
+
+def make_vector_defined(vector):
+    ''' Replace infinite values by the sum of finite values divided by the number of all values. '''
+    vector_noinf = [value if value != math.inf else 0 for value in vector]
+    default_value = sum(vector_noinf) / len(vector)
+    return [value if value != math.inf else default_value for value in vector]
+
+def reference_choice_values(mdp, prop, state_values):
+    ''' Choice values computed in Python, as before the native implementation. '''
+    choice_values = [
+        sum([entry.value() * state_values[entry.column] for entry in mdp.transition_matrix.get_row(choice)])
+        for choice in range(mdp.nr_choices)
+    ]
+    choice_values = make_vector_defined(choice_values)
+    if prop.reward:
+        choice_rewards = list(mdp.reward_models.get(prop.formula.reward_name).state_action_rewards)
+        choice_values = [value + reward for value,reward in zip(choice_values,choice_rewards)]
+    return choice_values
+
+def reference_expected_visits(quotient, mdp, prop, choices):
+    ''' Expected visits computed via the induced DTMC, as before the native implementation. '''
+    sub_mdp,state_map,_ = quotient.restrict_mdp(mdp, choices)
+    dtmc = Quotient.mdp_to_dtmc(sub_mdp)
+    dtmc_visits = paynt.verification.property.Property.compute_expected_visits(dtmc)
+    if prop.minimizing:
+        dtmc_visits = make_vector_defined(dtmc_visits)
+    else:
+        dtmc_visits = [value if value != math.inf else 0 for value in dtmc_visits]
+    expected_visits = [0] * mdp.nr_states
+    for state,visits in enumerate(dtmc_visits):
+        expected_visits[state_map[state]] = visits
+    return expected_visits
+
+def analyze_family(project_path):
+    sketch_path, props_path = get_sketch_paths(project_path)
+    quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+    family = quotient.family.copy()
+    quotient.build(family)
+    return quotient, family.mdp
+
+PROJECT_PATHS = ["dtmc/maze/concise", "dtmc/coin", "mdp/simple"]
+
+class TestChoiceValues:
+
+    @pytest.mark.parametrize("project_path", PROJECT_PATHS)
+    @pytest.mark.parametrize("alt", [False, True])
+    def test_choice_values_match_python(self, project_path, alt):
+        # setup
+        quotient, mdp = analyze_family(project_path)
+        for prop in quotient.specification.all_properties():
+            state_values = list(mdp.model_check_property(prop, alt).result.get_values())
+            expected = reference_choice_values(mdp.model, prop, state_values)
+
+            # test
+            choice_values = quotient.choice_values(mdp.model, prop, state_values)
+
+            # assert
+            assert list(choice_values) == pytest.approx(expected)
+
+    @pytest.mark.parametrize("project_path", PROJECT_PATHS)
+    def test_expected_visits_match_python(self, project_path):
+        # setup
+        quotient, mdp = analyze_family(project_path)
+        for prop in quotient.specification.all_properties():
+            scheduler = mdp.model_check_property(prop).result.scheduler
+            choices = scheduler.compute_action_support(mdp.model.nondeterministic_choice_indices)
+            expected = reference_expected_visits(quotient, mdp.model, prop, choices)
+
+            # test
+            expected_visits = quotient.compute_expected_visits(mdp.model, prop, choices)
+
+            # assert
+            assert list(expected_visits) == pytest.approx(expected)
+            # states unreachable in the induced DTMC are not visited
+            assert [visits == 0 for visits in expected_visits] == [visits == 0 for visits in expected]
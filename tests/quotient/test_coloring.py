@@ -0,0 +1,48 @@
+import paynt.parser.sketch as sketch
+import paynt.family.family
+
+from helpers.helper import get_sketch_paths
+
+class TestColoring:
+
+    def test_select_compatible_choices_of_split_hole(self):
+        # setup
+        sketch_path, props_path = get_sketch_paths("dtmc/maze/concise")
+        quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+        family = quotient.family.copy()
+        quotient.build(family)
+        splitter = [hole for hole in range(family.num_holes) if family.hole_num_options(hole) > 1][0]
+        parent_info = paynt.family.family.ParentInfo()
+        parent_info.selected_choices = family.selected_choices
+        parent_info.refinement_depth = 0
+        parent_info.splitter = splitter
+
+        # test
+        suboptions = [[option] for option in family.hole_options(splitter)]
+        for subfamily in family.split(splitter, suboptions):
+            subfamily.add_parent_info(parent_info)
+            choices = quotient.select_compatible_choices(subfamily)
+
+            # assert
+            expected = quotient.coloring.selectCompatibleChoices(subfamily.family)
+            assert list(choices) == list(expected)
+            assert list(choices) == list(quotient.coloring.selectCompatibleChoices(
+                subfamily.family, family.selected_choices))
+
+    def test_select_compatible_choices_after_refining_every_hole(self):
+        # setup
+        sketch_path, props_path = get_sketch_paths("dtmc/maze/concise")
+        quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+        family = quotient.family.copy()
+        base_choices = quotient.coloring.selectCompatibleChoices(family.family)
+
+        # test
+        # masks of refined holes are cached and evicted, the selection must not depend on the cache contents
+        for _ in range(2):
+            for hole in range(family.num_holes):
+                options = family.hole_options(hole)
+                subfamily = family.assume_hole_options_copy(hole, options[-1:])
+                choices = quotient.coloring.selectCompatibleChoices(subfamily.family, base_choices, [hole])
+
+                # assert
+                assert list(choices) == list(quotient.coloring.selectCompatibleChoices(subfamily.family))
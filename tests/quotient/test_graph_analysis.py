@@ -0,0 +1,90 @@
+import paynt.parser.sketch as sketch
+import paynt.models.models
+import paynt.quotient.quotient
+import paynt.synthesizer.synthesizer_ar
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+@pytest.fixture
+def share_graph_analysis(monkeypatch):
+    monkeypatch.setattr(paynt.quotient.quotient.Quotient, "share_graph_analysis", True)
+
+def load_quotient(project_path):
+    sketch_path, props_path = get_sketch_paths(project_path)
+    return sketch.Sketch.load_sketch(sketch_path, props_path)
+
+def synthesize(project_path, share_graph_analysis):
+    Quotient = paynt.quotient.quotient.Quotient
+    default_share_graph_analysis = Quotient.share_graph_analysis
+    Quotient.share_graph_analysis = share_graph_analysis
+    try:
+        quotient = load_quotient(project_path)
+        synthesizer = paynt.synthesizer.synthesizer_ar.SynthesizerAR(quotient)
+        return synthesizer.synthesize(print_stats=False)
+    finally:
+        Quotient.share_graph_analysis = default_share_graph_analysis
+
+def check_with_and_without_sharing(quotient, family, prop, alt):
+    ''' :return state values of the sub-MDP of the family with and without the analysis derived from the quotient '''
+    quotient.build(family)
+    assert family.mdp.quotient_model_checker is not None
+    result = family.mdp.model_check_property(prop, alt=alt)
+    expected = paynt.models.models.Mdp(family.mdp.model).model_check_property(prop, alt=alt)
+    return list(result.result.get_values()), list(expected.result.get_values())
+
+class TestQuotientGraphAnalysis:
+
+    def test_disabled_by_default(self):
+        # setup
+        quotient = load_quotient("dtmc/grid/safety")
+        family = quotient.family.copy()
+
+        # test
+        quotient.build(family)
+
+        # assert
+        assert family.mdp.quotient_model_checker is None
+
+    # the grid models are cyclic: the counter saturates and target states are absorbing
+    @pytest.mark.parametrize("project_path", ["dtmc/grid/liveness", "dtmc/grid/safety"])
+    @pytest.mark.parametrize("alt", [False, True])
+    def test_values_match_analysis_of_the_sub_mdp(self, share_graph_analysis, project_path, alt):
+        # setup
+        quotient = load_quotient(project_path)
+        prop = quotient.specification.constraints[0]
+        family = quotient.family.copy()
+        hole = [hole for hole in range(family.num_holes) if family.hole_num_options(hole) > 1][0]
+        subfamily = family.assume_hole_options_copy(hole, family.hole_options(hole)[:1])
+
+        # test
+        values, expected_values = check_with_and_without_sharing(quotient, subfamily, prop, alt)
+
+        # assert
+        assert values == pytest.approx(expected_values, abs=1e-4)
+
+    # in this MDP, a self-loop in a maybe state forms an end component that is not reaching the target
+    @pytest.mark.parametrize("alt", [False, True])
+    def test_values_match_analysis_of_mdp_with_end_components(self, share_graph_analysis, alt):
+        # setup
+        quotient = load_quotient("mdp/simple")
+        prop = quotient.specification.optimality
+        family = quotient.family.copy()
+
+        # test
+        values, expected_values = check_with_and_without_sharing(quotient, family, prop, alt)
+
+        # assert
+        assert values == pytest.approx(expected_values, abs=1e-4)
+
+    @pytest.mark.parametrize("project_path", ["dtmc/grid/liveness", "dtmc/grid/safety"])
+    def test_synthesis_matches_analysis_of_sub_mdps(self, project_path):
+        # setup
+        expected = synthesize(project_path, share_graph_analysis=False)
+
+        # test
+        assignment = synthesize(project_path, share_graph_analysis=True)
+
+        # assert
+        assert (assignment is None) == (expected is None)
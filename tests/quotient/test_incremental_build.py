@@ -0,0 +1,54 @@
+import paynt.parser.sketch as sketch
+import paynt.quotient.quotient
+import paynt.synthesizer.synthesizer_ar
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+Quotient = paynt.quotient.quotient.Quotient
+
+@pytest.fixture
+def build_incrementally(monkeypatch):
+    monkeypatch.setattr(Quotient, "build_incrementally", True)
+
+def assert_same_mdp(mdp, expected_mdp, prop):
+    assert list(mdp.quotient_state_map) == list(expected_mdp.quotient_state_map)
+    assert list(mdp.quotient_choice_map) == list(expected_mdp.quotient_choice_map)
+    assert mdp.model.nr_states == expected_mdp.model.nr_states
+    assert mdp.model.nr_transitions == expected_mdp.model.nr_transitions
+    assert mdp.model_check_property(prop).value == pytest.approx(expected_mdp.model_check_property(prop).value)
+
+class TestIncrementalBuild:
+
+    @pytest.mark.parametrize("project_path", ["dtmc/maze/concise", "dtmc/coin"])
+    def test_sub_mdp_built_from_parent_matches_quotient_restriction(self, project_path, build_incrementally):
+        # setup
+        sketch_path, props_path = get_sketch_paths(project_path)
+        quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+        synthesizer = paynt.synthesizer.synthesizer_ar.SynthesizerAR(quotient)
+        prop = quotient.specification.all_properties()[-1]
+        family = quotient.family
+        quotient.build(family)
+        synthesizer.check_specification(family)
+        families = synthesizer.split(family)
+
+        # test
+        # explore a few levels of the refinement depth-first, building each sub-MDP from the sub-MDP of its parent
+        num_compared = 0
+        while families and num_compared < 10:
+            family = families.pop()
+            assert family.parent_info.mdp is not None
+            quotient.build(family)
+            expected_choices = quotient.coloring.selectCompatibleChoices(family.family)
+            expected_mdp = quotient.build_from_choice_mask(expected_choices)
+
+            # assert
+            assert list(family.selected_choices) == list(expected_choices)
+            assert_same_mdp(family.mdp, expected_mdp, prop)
+            num_compared += 1
+
+            synthesizer.check_specification(family)
+            if family.analysis_result.can_improve is not False and not family.mdp.is_deterministic:
+                families += synthesizer.split(family)
+        assert num_compared > 0
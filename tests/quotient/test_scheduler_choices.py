@@ -0,0 +1,56 @@
+import paynt.parser.sketch as sketch
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+def quotient_with_scheduler():
+    sketch_path, props_path = get_sketch_paths("dtmc/maze/concise")
+    quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+    family = quotient.family.copy()
+    quotient.build(family)
+    result = family.mdp.model_check_property(quotient.specification.optimality)
+    return quotient, family.mdp, result.result.scheduler
+
+class TestSchedulerChoices:
+
+    @pytest.mark.parametrize("discard_unreachable_choices", [False, True])
+    def test_state_to_choice_matches_choices(self, discard_unreachable_choices):
+        # setup
+        quotient, mdp, scheduler = quotient_with_scheduler()
+
+        # test
+        state_to_choice = quotient.scheduler_to_state_to_choice(mdp, scheduler, discard_unreachable_choices)
+        choices = quotient.scheduler_to_choices(mdp, scheduler, discard_unreachable_choices)
+
+        # assert
+        assert len(state_to_choice) == quotient.quotient_mdp.nr_states
+        assert list(quotient.state_to_choice_to_choices(state_to_choice)) == list(choices)
+        nci = quotient.quotient_mdp.nondeterministic_choice_indices
+        for state,choice in enumerate(state_to_choice):
+            assert choice is None or nci[state] <= choice < nci[state+1]
+
+    def test_discarding_keeps_reachable_choices(self):
+        # setup
+        quotient, mdp, scheduler = quotient_with_scheduler()
+        state_to_choice = quotient.scheduler_to_state_to_choice(mdp, scheduler, discard_unreachable_choices=False)
+
+        # test
+        state_to_choice_reachable = quotient.discard_unreachable_choices(state_to_choice)
+
+        # assert
+        initial_state = quotient.quotient_mdp.initial_states[0]
+        assert state_to_choice_reachable[initial_state] == state_to_choice[initial_state]
+        for state,choice in enumerate(state_to_choice_reachable):
+            assert choice is None or choice == state_to_choice[state]
+
+    def test_choice_of_another_state_is_rejected(self):
+        # setup
+        quotient, mdp, scheduler = quotient_with_scheduler()
+        state_to_choice = quotient.scheduler_to_state_to_choice(mdp, scheduler, discard_unreachable_choices=False)
+        initial_state = quotient.quotient_mdp.initial_states[0]
+        state_to_choice[initial_state] = quotient.quotient_mdp.nr_choices
+
+        # test & assert
+        with pytest.raises(Exception):
+            quotient.discard_unreachable_choices(state_to_choice)
@@ -0,0 +1,32 @@
+import paynt.parser.sketch as sketch
+import paynt.synthesizer.synthesizer_ar
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+def synthesize_optimum(project_path, bounded_model_checking):
+    SynthesizerAR = paynt.synthesizer.synthesizer_ar.SynthesizerAR
+    default_bounded_model_checking = SynthesizerAR.bounded_model_checking
+    SynthesizerAR.bounded_model_checking = bounded_model_checking
+    try:
+        sketch_path, props_path = get_sketch_paths(project_path)
+        quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+        assignment = SynthesizerAR(quotient).synthesize(keep_optimum=True, print_stats=False)
+    finally:
+        SynthesizerAR.bounded_model_checking = default_bounded_model_checking
+    return assignment, quotient.specification.optimality.optimum
+
+class TestBoundedModelChecking:
+
+    @pytest.mark.parametrize("project_path", ["dtmc/maze/concise", "dtmc/coin", "dtmc/kydie"])
+    def test_optimum_matches_unbounded_ar(self, project_path):
+        # setup
+        _, expected_optimum = synthesize_optimum(project_path, bounded_model_checking=False)
+
+        # test
+        assignment, optimum = synthesize_optimum(project_path, bounded_model_checking=True)
+
+        # assert
+        assert assignment is not None
+        assert optimum == pytest.approx(expected_optimum)
@@ -0,0 +1,64 @@
+import paynt.parser.sketch as sketch
+import paynt.family.smt
+import paynt.synthesizer.synthesizer_cegis
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+SynthesizerCEGIS = paynt.synthesizer.synthesizer_cegis.SynthesizerCEGIS
+
+@pytest.fixture
+def native_smt_solver(monkeypatch):
+    monkeypatch.setattr(paynt.family.smt.SmtSolver, "solver_name", "native")
+
+def synthesize(num_processes):
+    sketch_path, props_path = get_sketch_paths("dtmc/coin")
+    quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+    default_num_processes = SynthesizerCEGIS.num_processes
+    SynthesizerCEGIS.num_processes = num_processes
+    try:
+        synthesizer = SynthesizerCEGIS(quotient)
+        assignment = synthesizer.synthesize(keep_optimum=True, print_stats=False)
+    finally:
+        SynthesizerCEGIS.num_processes = default_num_processes
+    return quotient, assignment
+
+class TestSynthesizerCEGIS:
+
+    def test_pipelined_optimum_matches_sequential(self, native_smt_solver):
+        # setup
+        sequential_quotient, _ = synthesize(1)
+        expected_optimum = sequential_quotient.specification.optimality.optimum
+
+        # test
+        quotient, assignment = synthesize(3)
+
+        # assert
+        optimum = quotient.specification.optimality.optimum
+        assert optimum == pytest.approx(expected_optimum)
+        # the assignment reported as the best one achieves the optimum
+        result,_ = quotient.check_assignment(assignment)
+        assert result.constraints_result.sat
+        assert result.optimality_result.value == pytest.approx(optimum)
+
+    def test_feasibility_stops_at_first_accepting_assignment(self, monkeypatch):
+        # setup
+        sketch_path, props_path = get_sketch_paths("dtmc/grid/liveness")
+        quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+        assert not quotient.specification.has_optimality
+        analyzed = []
+        analyze = SynthesizerCEGIS.analyze_family_assignment_cegis
+        def analyze_and_record(synthesizer, family, assignment):
+            conflicts, accepting_assignment = analyze(synthesizer, family, assignment)
+            analyzed.append(accepting_assignment is not None)
+            return conflicts, accepting_assignment
+        monkeypatch.setattr(SynthesizerCEGIS, "analyze_family_assignment_cegis", analyze_and_record)
+
+        # test
+        assignment = SynthesizerCEGIS(quotient).synthesize(print_stats=False)
+
+        # assert
+        assert assignment is not None
+        assert analyzed.count(True) == 1
+        assert analyzed[-1]
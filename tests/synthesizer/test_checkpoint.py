@@ -0,0 +1,158 @@
+import paynt.parser.sketch as sketch
+import paynt.family.explored_space
+import paynt.family.frontier
+import paynt.synthesizer.checkpoint
+import paynt.synthesizer.synthesizer_ar
+import paynt.synthesizer.synthesizer_onebyone
+import paynt.synthesizer.statistic
+
+import os
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+Checkpoint = paynt.synthesizer.checkpoint.Checkpoint
+
+@pytest.fixture
+def checkpoint_options(tmp_path):
+    Checkpoint.filename = str(tmp_path / "synthesis.checkpoint")
+    Checkpoint.period_seconds = 0
+    yield
+    Checkpoint.filename = None
+    Checkpoint.period_seconds = 300
+    Checkpoint.resume_filename = None
+
+def load_quotient():
+    sketch_path, props_path = get_sketch_paths("dtmc/maze/concise")
+    return sketch.Sketch.load_sketch(sketch_path, props_path)
+
+def create_checkpoint(quotient):
+    synthesizer = paynt.synthesizer.synthesizer_ar.SynthesizerAR(quotient)
+    synthesizer.explored = 0
+    synthesizer.stat = paynt.synthesizer.statistic.Statistic(synthesizer)
+    return Checkpoint(synthesizer)
+
+def split_family(family):
+    hole = next(hole for hole in range(family.num_holes) if family.hole_num_options(hole) > 1)
+    return [family.assume_hole_options_copy(hole, [option]) for option in family.hole_options(hole)]
+
+def record_kinds(filename):
+    return [kind for _,(kind,_) in Checkpoint.read_records(filename)]
+
+def resumed_families(quotient):
+    Checkpoint.resume_filename = Checkpoint.filename
+    checkpoint = create_checkpoint(quotient)
+    checkpoint.resume(quotient.family)
+    return checkpoint, [(family.options_to_bytes(),priority) for family,priority in checkpoint.resumed_families]
+
+def synthesize_optimum(synthesizer):
+    synthesizer.synthesize(keep_optimum=True, print_stats=False)
+    return synthesizer.quotient.specification.optimality.optimum
+
+class TestCheckpoint:
+
+    def test_resume_is_used_once(self, checkpoint_options):
+        # setup
+        expected_optimum = synthesize_optimum(paynt.synthesizer.synthesizer_ar.SynthesizerAR(load_quotient()))
+        assert os.path.exists(Checkpoint.filename)
+        Checkpoint.resume_filename = Checkpoint.filename
+
+        # test
+        synthesizer = paynt.synthesizer.synthesizer_ar.SynthesizerAR(load_quotient())
+        optimum = synthesize_optimum(synthesizer)
+
+        # assert
+        assert optimum == pytest.approx(expected_optimum)
+        assert Checkpoint.resume_filename is None
+
+    def test_unsupported_method_ignores_checkpoint(self, checkpoint_options):
+        # setup
+        Checkpoint.resume_filename = Checkpoint.filename + ".missing"
+
+        # test
+        synthesizer = paynt.synthesizer.synthesizer_onebyone.SynthesizerOneByOne(load_quotient())
+        synthesizer.synthesize(print_stats=False)
+
+        # assert
+        assert Checkpoint.resume_filename is None
+        assert Checkpoint.filename is None
+
+    def test_only_frontier_delta_is_appended(self, checkpoint_options):
+        # setup
+        quotient = load_quotient()
+        checkpoint = create_checkpoint(quotient)
+        families = paynt.family.frontier.FrontierDfs()
+        subfamilies = split_family(quotient.family)
+        for subfamily in subfamilies:
+            families.push(subfamily)
+
+        # test
+        checkpoint.write(families.family_priority_chunks())
+        families.pop()
+        checkpoint.write(families.family_priority_chunks())
+
+        # assert
+        assert record_kinds(Checkpoint.filename) == ["push", "state", "pop", "state"]
+        _, restored = resumed_families(load_quotient())
+        assert [data for data,_ in restored] == [family.options_to_bytes() for family in subfamilies[:-1]]
+
+    def test_long_log_is_compacted(self, checkpoint_options, monkeypatch):
+        # setup
+        monkeypatch.setattr(Checkpoint, "compaction_factor", 0)
+        quotient = load_quotient()
+        checkpoint = create_checkpoint(quotient)
+        families = paynt.family.frontier.FrontierDfs()
+        for subfamily in split_family(quotient.family):
+            families.push(subfamily)
+
+        # test
+        checkpoint.write(families.family_priority_chunks())
+        families.pop()
+        checkpoint.write(families.family_priority_chunks())
+
+        # assert
+        assert record_kinds(Checkpoint.filename) == ["push", "state"]
+        _, restored = resumed_families(load_quotient())
+        assert len(restored) == len(families)
+
+    def test_priorities_and_explored_space_are_restored(self, checkpoint_options):
+        # setup
+        quotient = load_quotient()
+        checkpoint = create_checkpoint(quotient)
+        subfamilies = split_family(quotient.family)
+        explored_space = paynt.family.explored_space.ExploredSpace(quotient.family)
+        explored_space.explore_family(subfamilies[0])
+        checkpoint.synthesizer.explored_space = explored_space
+        families = paynt.family.frontier.FrontierBestFirst()
+        for index,subfamily in enumerate(subfamilies[1:]):
+            families.push_with_priority(subfamily, -index)
+
+        # test
+        checkpoint.write(families.family_priority_chunks())
+        resumed_checkpoint, restored = resumed_families(load_quotient())
+
+        # assert
+        expected = [(subfamily.options_to_bytes(),-index) for index,subfamily in enumerate(subfamilies[1:])]
+        assert restored == expected
+        assert resumed_checkpoint.resumed_explored_space.explored == explored_space.explored
+
+    def test_truncated_checkpoint_is_ignored(self, checkpoint_options):
+        # setup
+        quotient = load_quotient()
+        checkpoint = create_checkpoint(quotient)
+        families = paynt.family.frontier.FrontierDfs()
+        subfamilies = split_family(quotient.family)
+        for subfamily in subfamilies:
+            families.push(subfamily)
+        checkpoint.write(families.family_priority_chunks())
+        families.pop()
+        checkpoint.write(families.family_priority_chunks())
+
+        # test
+        # simulate a checkpoint interrupted while writing its state record
+        size = os.path.getsize(Checkpoint.filename)
+        os.truncate(Checkpoint.filename, size-1)
+        _, restored = resumed_families(load_quotient())
+
+        # assert
+        assert [data for data,_ in restored] == [family.options_to_bytes() for family in subfamilies]
@@ -0,0 +1,40 @@
+import paynt.parser.sketch as sketch
+import paynt.synthesizer.synthesizer_ar
+import paynt.verification.property
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+def synthesize_optimum(project_path, coarse_precision):
+    Property = paynt.verification.property.Property
+    default_coarse_precision = Property.coarse_model_checking_precision
+    Property.coarse_model_checking_precision = coarse_precision
+    try:
+        sketch_path, props_path = get_sketch_paths(project_path)
+        quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+        synthesizer = paynt.synthesizer.synthesizer_ar.SynthesizerAR(quotient)
+        assignment = synthesizer.synthesize(keep_optimum=True, print_stats=False)
+    finally:
+        Property.coarse_model_checking_precision = default_coarse_precision
+    return assignment, quotient.specification.optimality.optimum
+
+class TestCoarsePrecision:
+
+    @pytest.mark.parametrize("bounded_model_checking", [False, True])
+    @pytest.mark.parametrize("project_path", ["dtmc/maze/concise", "dtmc/coin"])
+    def test_optimum_matches_default_precision(self, project_path, bounded_model_checking):
+        # setup
+        SynthesizerAR = paynt.synthesizer.synthesizer_ar.SynthesizerAR
+        default_bounded_model_checking = SynthesizerAR.bounded_model_checking
+        SynthesizerAR.bounded_model_checking = bounded_model_checking
+        try:
+            # test
+            _, expected_optimum = synthesize_optimum(project_path, coarse_precision=None)
+            assignment, optimum = synthesize_optimum(project_path, coarse_precision=1e-2)
+        finally:
+            SynthesizerAR.bounded_model_checking = default_bounded_model_checking
+
+        # assert
+        assert assignment is not None
+        assert optimum == pytest.approx(expected_optimum)
@@ -0,0 +1,50 @@
+import paynt.parser.sketch as sketch
+import paynt.synthesizer.conflict_generator.dtmc
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+ConflictGeneratorDtmc = paynt.synthesizer.conflict_generator.dtmc.ConflictGeneratorDtmc
+
+def violating_assignment(quotient, index):
+    ''' :return the first member of the design space that violates the constraint with the given index '''
+    family = quotient.family
+    for combination in family.all_combinations():
+        assignment = family.construct_assignment(combination)
+        result,_ = quotient.check_assignment(assignment)
+        if not result.constraints_result.results[index].sat:
+            return assignment
+
+class TestConflictGeneratorDtmc:
+
+    def test_several_conflicts_per_property(self, monkeypatch):
+        # setup
+        monkeypatch.setattr(ConflictGeneratorDtmc, "conflicts_per_property", 3)
+        sketch_path, props_path = get_sketch_paths("dtmc/coin")
+        quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+        family = quotient.family
+        quotient.build(family)
+        index = 0
+        prop = quotient.specification.constraints[index]
+        assignment = violating_assignment(quotient, index)
+        assert assignment is not None
+        generator = ConflictGeneratorDtmc(quotient)
+        generator.initialize()
+        generator.prepare_model(quotient.build_assignment(assignment))
+
+        # test
+        conflicts = generator.construct_property_conflicts(index, prop.threshold, None, family.mdp.quotient_state_map)
+
+        # assert
+        assert 1 <= len(conflicts) <= ConflictGeneratorDtmc.conflicts_per_property
+        assert len(set([frozenset(conflict) for conflict in conflicts])) == len(conflicts)
+        for conflict in conflicts:
+            # every member agreeing with the assignment on the holes of the conflict violates the property
+            subfamily = family.assume_options_copy([
+                assignment.hole_options(hole) if hole in conflict else family.hole_options(hole)
+                for hole in range(family.num_holes)
+            ])
+            quotient.build(subfamily)
+            result = subfamily.mdp.model_check_property(prop)
+            assert not result.sat
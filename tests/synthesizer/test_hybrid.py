@@ -0,0 +1,151 @@
+import paynt.parser.sketch as sketch
+import paynt.family.frontier
+import paynt.synthesizer.synthesizer_ar
+import paynt.synthesizer.synthesizer_hybrid
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+StageControlBandit = paynt.synthesizer.synthesizer_hybrid.StageControlBandit
+
+def load_family():
+    sketch_path, props_path = get_sketch_paths("dtmc/coin")
+    return sketch.Sketch.load_sketch(sketch_path, props_path).family
+
+class TestStageControlBandit:
+
+    def test_context_distinguishes_family_sizes(self):
+        # setup
+        family = load_family()
+        hole = next(hole for hole in range(family.num_holes) if family.hole_num_options(hole) > 1)
+        subfamily = family.assume_hole_options_copy(hole, family.hole_options(hole)[:1])
+        subfamily.refinement_depth = family.refinement_depth
+        control = StageControlBandit(family.size)
+
+        # test
+        control.start_family(family)
+        context = control.context
+        control.start_family(subfamily)
+
+        # assert
+        assert context == (0, family.size.bit_length())
+        assert control.context != context
+
+    def test_cegis_ratio_is_one_until_cegis_is_tried(self):
+        # setup
+        control = StageControlBandit(100)
+        control.context = 0
+        control.add_reward(0, "ar", 0.5, 1)
+
+        # test
+        ratio = control.estimate_cegis_ratio()
+
+        # assert
+        assert ratio == 1
+
+    def test_cegis_ratio_follows_pruning_rates(self, monkeypatch):
+        # setup
+        monkeypatch.setattr(StageControlBandit, "exploration", 0)
+        control = StageControlBandit(100)
+        control.context = 0
+        for _ in range(StageControlBandit.min_context_rewards):
+            control.add_reward(0, "ar", 0.1, 1)
+            control.add_reward(0, "cegis", 0.3, 1)
+
+        # test
+        ratio = control.estimate_cegis_ratio()
+
+        # assert
+        assert ratio == pytest.approx(3)
+
+    def test_cegis_ratio_is_bounded(self):
+        # setup
+        control = StageControlBandit(100)
+        control.context = 0
+        control.add_reward(0, "ar", 0.5, 1)
+        control.add_reward(0, "cegis", 0, 1)
+        low_ratio = control.estimate_cegis_ratio()
+        control = StageControlBandit(100)
+        control.context = 0
+        control.add_reward(0, "ar", 0, 1)
+        control.add_reward(0, "cegis", 0.5, 1)
+
+        # test
+        high_ratio = control.estimate_cegis_ratio()
+
+        # assert
+        assert low_ratio == StageControlBandit.min_ratio
+        assert high_ratio == StageControlBandit.max_ratio
+
+    def test_rewards_fall_back_to_all_contexts(self):
+        # setup
+        control = StageControlBandit(100)
+        control.add_reward(0, "ar", 0.1, 1)
+        control.add_reward(0, "cegis", 0.2, 1)
+        control.add_reward(1, "ar", 0.3, 1)
+        control.add_reward(1, "cegis", 0.4, 1)
+        control.context = 1
+
+        # test
+        rewards = control.rewards()
+
+        # assert
+        assert rewards["ar"] == pytest.approx([0.4, 2, 2])
+        assert rewards["cegis"] == pytest.approx([0.6, 2, 2])
+
+    def test_rewards_of_context_are_used_if_there_are_enough(self):
+        # setup
+        control = StageControlBandit(100)
+        control.add_reward(0, "ar", 0.1, 1)
+        control.add_reward(0, "cegis", 0.2, 1)
+        # rewards are discounted, one more reward is needed to reach the minimum
+        for _ in range(StageControlBandit.min_context_rewards+1):
+            control.add_reward(1, "ar", 0.3, 1)
+            control.add_reward(1, "cegis", 0.4, 1)
+        control.context = 1
+
+        # test
+        rewards = control.rewards()
+
+        # assert
+        assert rewards == control.context_rewards[1]
+
+    def test_unused_cegis_time_is_carried_over(self):
+        # setup
+        family = load_family()
+        control = StageControlBandit(family.size)
+        control.start_family(family)
+        control.cegis_ratio = 1
+        control.timer_ar.time += 2
+        control.timer_cegis.time += 0.5
+
+        # test
+        control.finish_family()
+        credit = control.cegis_credit
+        control.start_family(family)
+        control.cegis_ratio = 1
+        control.timer_ar.time += 1
+        control.timer_cegis.time += 2
+        control.finish_family()
+
+        # assert
+        assert credit == pytest.approx(1.5)
+        assert control.cegis_credit == pytest.approx(1.5 * StageControlBandit.discount - 1)
+        assert control.context is None
+
+
+class TestSynthesizerHybrid:
+
+    def test_non_dfs_exploration_falls_back_to_dfs(self, monkeypatch):
+        # setup
+        monkeypatch.setattr(paynt.synthesizer.synthesizer_ar.SynthesizerAR, "exploration_order", "bfs")
+        sketch_path, props_path = get_sketch_paths("dtmc/coin")
+        quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+        synthesizer = paynt.synthesizer.synthesizer_hybrid.SynthesizerHybrid(quotient)
+
+        # test
+        families = synthesizer.choose_frontier(quotient.family)
+
+        # assert
+        assert isinstance(families, paynt.family.frontier.FrontierDfs)
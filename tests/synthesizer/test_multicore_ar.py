@@ -0,0 +1,32 @@
+import paynt.parser.sketch as sketch
+import paynt.synthesizer.synthesizer_ar
+import paynt.synthesizer.synthesizer_multicore_ar
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+def synthesize_optimum(synthesizer_class):
+    sketch_path, props_path = get_sketch_paths("dtmc/maze/concise")
+    quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+    synthesizer = synthesizer_class(quotient)
+    assignment = synthesizer.synthesize(keep_optimum=True, print_stats=False)
+    return assignment, quotient.specification.optimality.optimum
+
+class TestSynthesizerMultiCoreAR:
+
+    @pytest.mark.parametrize("exploration_order", ["dfs", "bfs", "best-first"])
+    def test_optimum_matches_sequential_ar(self, exploration_order):
+        # setup
+        default_exploration_order = paynt.synthesizer.synthesizer_ar.SynthesizerAR.exploration_order
+        paynt.synthesizer.synthesizer_ar.SynthesizerAR.exploration_order = exploration_order
+        try:
+            # test
+            _, expected_optimum = synthesize_optimum(paynt.synthesizer.synthesizer_ar.SynthesizerAR)
+            assignment, optimum = synthesize_optimum(paynt.synthesizer.synthesizer_multicore_ar.SynthesizerMultiCoreAR)
+        finally:
+            paynt.synthesizer.synthesizer_ar.SynthesizerAR.exploration_order = default_exploration_order
+
+        # assert
+        assert assignment is not None
+        assert optimum == pytest.approx(expected_optimum)
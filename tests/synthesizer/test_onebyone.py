@@ -0,0 +1,87 @@
+import paynt.parser.sketch as sketch
+import paynt.synthesizer.synthesizer_onebyone
+import paynt.verification.property
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+SynthesizerOneByOne = paynt.synthesizer.synthesizer_onebyone.SynthesizerOneByOne
+
+def load_quotient():
+    sketch_path, props_path = get_sketch_paths("dtmc/kydie")
+    return sketch.Sketch.load_sketch(sketch_path, props_path)
+
+def synthesize():
+    quotient = load_quotient()
+    synthesizer = SynthesizerOneByOne(quotient)
+    assignment = synthesizer.synthesize(keep_optimum=True, print_stats=False)
+    return assignment, quotient.specification.optimality.optimum
+
+def evaluate():
+    quotient = load_quotient()
+    prop = quotient.specification.constraints[0]
+    return SynthesizerOneByOne(quotient).evaluate(prop=prop, print_stats=False)
+
+class TestSynthesizerOneByOne:
+
+    def test_member_combination_follows_all_combinations(self):
+        # setup
+        family = load_quotient().family
+
+        # test
+        combinations = [list(SynthesizerOneByOne.member_combination(family, member)) for member in range(family.size)]
+
+        # assert
+        assert combinations == [list(combination) for combination in family.all_combinations()]
+
+    @pytest.fixture(params=[False, True], ids=["lexicographic", "gray-code"])
+    def enumeration_order(self, request, monkeypatch):
+        monkeypatch.setattr(SynthesizerOneByOne, "gray_code_order", request.param)
+
+    def test_native_synthesis_matches_python(self, enumeration_order):
+        # setup
+        native_assignment, native_optimum = synthesize()
+
+        # test
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(SynthesizerOneByOne, "native_enumeration_supported", lambda self: False)
+            assignment, optimum = synthesize()
+
+        # assert
+        assert native_assignment is not None and assignment is not None
+        assert native_optimum == pytest.approx(optimum)
+
+    def test_native_evaluation_matches_python(self, enumeration_order):
+        # setup
+        native_evaluations = evaluate()
+
+        # test
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(SynthesizerOneByOne, "native_enumeration_supported", lambda self: False)
+            evaluations = evaluate()
+
+        # assert
+        assert native_evaluations == pytest.approx(evaluations)
+
+    def test_native_synthesis_stops_once_optimum_cannot_be_improved(self, monkeypatch):
+        # setup
+        monkeypatch.setattr(SynthesizerOneByOne, "native_batch_size", 1)
+        monkeypatch.setattr(
+            paynt.verification.property.Specification, "can_be_improved", property(lambda self: False)
+        )
+        quotient = load_quotient()
+        synthesizer = SynthesizerOneByOne(quotient)
+
+        # test
+        assignment = synthesizer.synthesize(print_stats=False)
+        with pytest.MonkeyPatch.context() as python_monkeypatch:
+            python_monkeypatch.setattr(SynthesizerOneByOne, "native_enumeration_supported", lambda self: False)
+            python_synthesizer = SynthesizerOneByOne(load_quotient())
+            python_assignment = python_synthesizer.synthesize(print_stats=False)
+
+        # assert
+        assert assignment is not None and python_assignment is not None
+        # both enumerations stop at the first accepting member
+        assert synthesizer.explored < quotient.family.size
+        assert synthesizer.explored == python_synthesizer.explored
@@ -0,0 +1,39 @@
+import paynt.parser.sketch as sketch
+import paynt.synthesizer.policy_tree
+
+from helpers.helper import get_sketch_paths
+
+SynthesizerPolicyTree = paynt.synthesizer.policy_tree.SynthesizerPolicyTree
+
+def evaluate(num_processes):
+    sketch_path, props_path = get_sketch_paths("archive/atva24-policy-trees/obstacles-demo")
+    quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+    default_num_processes = SynthesizerPolicyTree.num_processes
+    SynthesizerPolicyTree.num_processes = num_processes
+    try:
+        synthesizer = SynthesizerPolicyTree(quotient)
+        evaluations = synthesizer.evaluate(print_stats=False)
+    finally:
+        SynthesizerPolicyTree.num_processes = default_num_processes
+    return synthesizer, evaluations
+
+class TestSynthesizerPolicyTree:
+
+    def test_parallel_expansion_matches_sequential(self):
+        # setup
+        sequential, sequential_evaluations = evaluate(1)
+
+        # test
+        parallel, parallel_evaluations = evaluate(2)
+
+        # assert
+        assert parallel.stat.num_mdps_sat == sequential.stat.num_mdps_sat
+        assert parallel.stat.num_nodes == sequential.stat.num_nodes
+        assert parallel.stat.num_policies == sequential.stat.num_policies
+        # post-processing was applied to the tree expanded in parallel
+        assert parallel.stat.num_nodes_merged == sequential.stat.num_nodes_merged
+        assert parallel.stat.num_policies_merged == sequential.stat.num_policies_merged
+        assert [str(evaluation.family) for evaluation in parallel_evaluations] == \
+            [str(evaluation.family) for evaluation in sequential_evaluations]
+        assert [evaluation.sat for evaluation in parallel_evaluations] == \
+            [evaluation.sat for evaluation in sequential_evaluations]
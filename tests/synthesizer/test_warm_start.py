@@ -0,0 +1,69 @@
+import paynt.parser.sketch as sketch
+import paynt.synthesizer.synthesizer_ar
+
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+SynthesizerAR = paynt.synthesizer.synthesizer_ar.SynthesizerAR
+
+@pytest.fixture
+def warm_start():
+    SynthesizerAR.warm_start = True
+    yield
+    SynthesizerAR.warm_start = False
+
+def load_quotient(project_path):
+    sketch_path, props_path = get_sketch_paths(project_path)
+    return sketch.Sketch.load_sketch(sketch_path, props_path)
+
+def synthesize_optimum(project_path):
+    quotient = load_quotient(project_path)
+    synthesizer = SynthesizerAR(quotient)
+    synthesizer.synthesize(keep_optimum=True, print_stats=False)
+    return quotient.specification.optimality.optimum
+
+class TestWarmStart:
+
+    @pytest.mark.parametrize("project_path", ["dtmc/maze/concise", "dtmc/coin"])
+    def test_warm_started_values_match_cold_values(self, project_path, warm_start):
+        # setup
+        quotient = load_quotient(project_path)
+        synthesizer = SynthesizerAR(quotient)
+        family = quotient.family
+        quotient.build(family)
+        synthesizer.check_specification(family)
+        subfamilies = synthesizer.split(family)
+        properties = quotient.specification.all_properties()
+
+        # test
+        warm_directions = 0
+        for subfamily in subfamilies:
+            quotient.build(subfamily)
+            for index,prop in enumerate(properties):
+                for alt in [False, True]:
+                    initial_values = synthesizer.parent_state_values(subfamily, index, alt)
+                    if initial_values is None:
+                        continue
+                    warm_directions += 1
+                    warm = subfamily.mdp.model_check_property(prop, alt, initial_values=initial_values)
+                    cold = subfamily.mdp.model_check_property(prop, alt)
+
+                    # assert
+                    assert prop.minimizing != alt
+                    assert warm.value == pytest.approx(cold.value, rel=1e-3, abs=1e-6)
+        assert warm_directions > 0
+
+    @pytest.mark.parametrize("project_path", ["dtmc/maze/concise", "dtmc/coin"])
+    def test_warm_start_preserves_optimum(self, project_path):
+        # setup
+        expected_optimum = synthesize_optimum(project_path)
+        SynthesizerAR.warm_start = True
+        try:
+            # test
+            optimum = synthesize_optimum(project_path)
+        finally:
+            SynthesizerAR.warm_start = False
+
+        # assert
+        assert optimum == pytest.approx(expected_optimum)
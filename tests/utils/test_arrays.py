@@ -0,0 +1,62 @@
+import paynt.parser.sketch as sketch
+import paynt.utils.arrays
+
+import math
+import pytest
+
+from helpers.helper import get_sketch_paths
+
+@pytest.fixture
+def without_numpy(monkeypatch):
+    monkeypatch.setattr(paynt.utils.arrays, "numpy", None)
+
+def check_result():
+    sketch_path, props_path = get_sketch_paths("dtmc/maze/concise")
+    quotient = sketch.Sketch.load_sketch(sketch_path, props_path)
+    family = quotient.family.copy()
+    quotient.build(family)
+    return family.mdp.model_check_property(quotient.specification.optimality).result
+
+class TestArrays:
+
+    def test_check_result_values_fall_back_to_list(self, without_numpy):
+        # setup
+        result = check_result()
+
+        # test
+        values = paynt.utils.arrays.check_result_values(result)
+
+        # assert
+        assert isinstance(values, list)
+        assert values == list(result.get_values())
+
+    def test_compose_falls_back_to_list(self, without_numpy):
+        # test
+        composed = paynt.utils.arrays.compose([10,11,12,13], [3,0,2])
+
+        # assert
+        assert composed == [13,10,12]
+
+    def test_remap_values_falls_back_to_list(self, without_numpy):
+        # test
+        values = paynt.utils.arrays.remap_values([0.5,1.5,2.5], [4,1,2], [2,4], size=5)
+        undefined = paynt.utils.arrays.remap_values([0.5,1.5,2.5], [4,1,2], [0,4], size=5)
+        infinite = paynt.utils.arrays.remap_values([0.5,math.inf,2.5], [4,1,2], [1,4], size=5)
+
+        # assert
+        assert values == [2.5,0.5]
+        assert undefined is None
+        assert infinite is None
+
+    def test_remap_values_matches_numpy(self):
+        # setup
+        numpy = pytest.importorskip("numpy")
+        values = numpy.array([0.5,1.5,2.5,3.5])
+        source_map = [4,1,2,0]
+        target_map = [2,0,4]
+
+        # test
+        remapped = paynt.utils.arrays.remap_values(values, source_map, target_map, size=5)
+
+        # assert
+        assert list(remapped) == paynt.utils.arrays.remap_values(list(values), source_map, target_map, size=5)